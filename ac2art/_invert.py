@@ -24,29 +24,39 @@ import sys
 
 import numpy as np
 
-from ac2art.external.abkhazia import copy_feats, read_ark_file
+from ac2art.external.abkhazia import build_ark_writer, read_ark_file
+from ac2art.internal.data_utils import build_context_windows
 from ac2art.networks import NeuralNetwork, load_dumped_model
 from ac2art.utils import check_type_validity
 
 
 def run_inversion(
-        source, inverter, destination, keep_channels=None
+        source, inverter, destination, keep_channels=None, context_window=0,
+        zero_padding=True
     ):
     """Run acoustic-to-articulatory inversion of a set of features.
 
     Requires pre-computed acoustic features and a pre-trained
     acoustic-to-articulatory inverter neural network.
 
-    source        : path to the **normalized** input features, which may
-                    be stored as a single ark, scp or ark-like txt file,
-                    or as npy files in a given folder
-    inverter      : NeuralNetwork-inheriting instance, or path to
-                    a .npy file recording a dumped model of such kind
-    destination   : path where to output the inverted features, which
-                    may be written as .npy files in a given folder or
-                    compiled in a .ark, .scp or ark-like .txt file
-    keep_channels : optional list of indexes of channel of inverted
-                    features to keep (default None, implying all)
+    source         : path to the **normalized** input features, which may
+                     be stored as a single ark, scp or ark-like txt file,
+                     or as npy files in a given folder
+    inverter       : NeuralNetwork-inheriting instance, or path to
+                     a .npy file recording a dumped model of such kind
+    destination    : path where to output the inverted features, which
+                     may be written as .npy files in a given folder or
+                     compiled in a .ark, .scp or ark-like .txt file
+    keep_channels  : optional list of indexes of channel of inverted
+                     features to keep (default None, implying all)
+    context_window : optional half-size of context windows of frames to
+                     build out of the input features before feeding them
+                     to the inverter (int, default 0, implying none)
+    zero_padding   : whether to zero-pad the input features when building
+                     context windows (bool, default True)
+
+    Context windows are built as read-only strided views over the input
+    features, so that they do not require more memory than the latter.
     """
     check_type_validity(source, str, 'source')
     check_type_validity(inverter, (NeuralNetwork, str), 'inverter')
@@ -60,17 +70,16 @@ def run_inversion(
         inverter = load_dumped_model(inverter)
     # Iteratively invert features and dump them to disk.
     for i, (utterance, input_data) in enumerate(input_features, 1):
+        if context_window:
+            input_data = build_context_windows(
+                input_data, context_window, zero_padding, as_view=True
+            )
         inverted_features = inverter.predict(input_data)
         if keep_channels:
             inverted_features = inverted_features[..., keep_channels]
         handle_output(utterance, inverted_features)
         print('Done inverting %s utterances.' % i)
         sys.stdout.write('\033[F')
-    # When relevant, convert the output txt file to ark/scp files.
-    if destination[-4:] in ('.ark', '.scp'):
-        txt_file = destination[:-3] + 'txt'
-        copy_feats(txt_file, destination)
-        os.remove(txt_file)
     print('Done with the acoustic-to-articulatory inversion task.')
 
 
@@ -105,8 +114,10 @@ def _setup_output_handler(destination):
         return __setup_npy_writer(destination)
     # Handle the case when storing results to a single ark(-related) file.
     extension = destination.rsplit('.', 1)[1]
-    if extension in ('ark', 'scp', 'txt'):
-        return __setup_ark_txt_writer(destination[:-3] + 'txt')
+    if extension in ('ark', 'scp'):
+        return build_ark_writer(destination)
+    if extension == 'txt':
+        return __setup_ark_txt_writer(destination)
     # Raise exception if the argument points to an unsupported format.
     raise TypeError(
         'Invalid destination file extension: should be ark, txt or scp.'
@@ -51,6 +51,7 @@ use of functions contstructor implemented in the `prototype` submodule:
 
 `ac2art.corpora.<corpus>.raw`
     get_utterances_list
+    get_raw_files
     load_wav
     load_phone_labels
     load_ema
@@ -61,6 +62,7 @@ use of functions contstructor implemented in the `prototype` submodule:
     extract_utterances_data
     compute_moments
     normalize_files
+    pack_files
     split_corpus
     (all built using `prototype.preprocess` functions)
 
@@ -73,6 +75,8 @@ use of functions contstructor implemented in the `prototype` submodule:
     load_ema
     load_utterance
     load_dataset
+    iterate_dataset
+    get_bucketed_batches
     (all built using `prototype.load.build_loading_functions`)
 
 `ac2art.corpora.<corpus>.abx`
@@ -95,6 +99,9 @@ Note that for the mocha and mspka corpora, adding support to
 data from additional recording sessions / speakers should be
 straight-forward, requiring only to edit the list of speakers
 in `ac2art.corpora.<corpus>.raw._loaders.py` (SPEAKERS) constant.
+Extracting the data of the added utterances then only requires
+calling `extract_utterances_data` again, which skips utterances
+whose features are up-to-date with their raw files and settings.
 
 
 Also note that for these same two corpora, enhanced versions of
@@ -20,6 +20,6 @@
 """Set of functions to pre-process mngu0 data."""
 
 from ._preprocess import (
-    extract_utterances_data, compute_moments, normalize_files,
+    extract_utterances_data, compute_moments, normalize_files, pack_files,
     split_corpus, adjust_provided_filesets
 )
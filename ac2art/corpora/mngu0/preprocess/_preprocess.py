@@ -24,7 +24,7 @@ import os
 
 from ac2art.corpora.prototype.preprocess import (
     build_features_extraction_functions, build_normalization_functions,
-    build_corpus_splitting_function, store_filesets
+    build_corpus_splitting_function, build_packing_function, store_filesets
 )
 from ac2art.corpora.mngu0.raw import get_utterances_list
 from ac2art.utils import CONSTANTS
@@ -57,6 +57,8 @@ extract_utterances_data = (
 
 compute_moments, normalize_files = build_normalization_functions('mngu0')
 
+pack_files = build_packing_function('mngu0')
+
 split_corpus = build_corpus_splitting_function(
     corpus='mngu0', lowest_limit=9, same_speaker_data=False
 )
@@ -20,5 +20,6 @@
 """Set of functions to load raw data from mngu0."""
 
 from ._loaders import (
-    get_utterances_list, load_ema, load_phone_labels, load_voicing, load_wav
+    get_raw_files, get_utterances_list, load_ema, load_phone_labels,
+    load_voicing, load_wav
 )
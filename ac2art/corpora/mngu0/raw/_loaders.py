@@ -21,6 +21,7 @@
 
 import os
 
+import numpy as np
 
 from ac2art.corpora.prototype.raw import build_ema_loaders
 from ac2art.internal.data_loaders import EstTrack, Wav
@@ -40,6 +41,15 @@ def get_utterances_list(speaker=None):
     ])
 
 
+def get_raw_files(filename):
+    """Return the paths to the raw files of a mngu0 utterance."""
+    return [
+        os.path.join(RAW_FOLDER, 'wav_16kHz', filename + '.wav'),
+        os.path.join(RAW_FOLDER, 'ema_basic_data', filename + '.ema'),
+        os.path.join(RAW_FOLDER, 'phone_labels', filename + '.lab')
+    ]
+
+
 def load_wav(filename, frame_time=25, hop_time=10):
     """Load data from a mngu0 waveform (.wav) file.
 
@@ -57,13 +67,18 @@ def load_wav(filename, frame_time=25, hop_time=10):
 
 
 def load_ema_base(filename, columns_to_keep=None):
-    """Load data from a mngu0 EMA (.ema) file."""
-    # Unused argument kept for API compliance; pylint: disable=unused-argument
+    """Load data from a mngu0 EMA (.ema) file.
+
+    The file is memory-mapped, so that only the columns to keep
+    (if specified) are copied into memory.
+    """
     path = os.path.join(RAW_FOLDER, 'ema_basic_data/', filename + '.ema')
-    track = EstTrack(path)
-    ema_data = track.data
+    track = EstTrack(path, mmap_mode='r')
     column_names = list(track.column_names.values())
-    return ema_data, column_names
+    if columns_to_keep is None:
+        return np.array(track.data), column_names
+    cols_index = [column_names.index(col) for col in columns_to_keep]
+    return np.asarray(track.data[:, cols_index]), list(columns_to_keep)
 
 
 def load_phone_labels(filename):
@@ -21,8 +21,7 @@
 
 import os
 
-from sphfile import SPHFile
-
+from ac2art.internal.data_loaders import SphereFile
 from ac2art.corpora.mocha.raw._loaders import SPEAKERS
 from ac2art.corpora.prototype.utils import read_transcript
 from ac2art.utils import CONSTANTS
@@ -37,7 +36,7 @@ def copy_wavs(dest_folder):
             [name for name in os.listdir(folder) if name.endswith('.wav')]
         )
         for filename in spk_utterances:
-            SPHFile(os.path.join(folder, filename)).write_wav(
+            SphereFile(os.path.join(folder, filename)).write_wav(
                 os.path.join(dest_folder, filename)
             )
         utterances.extend(spk_utterances)
@@ -21,5 +21,6 @@
 
 from ._load import (
     change_loading_setup, get_loading_setup, get_norm_parameters,
-    get_utterances, load_acoustic, load_ema, load_utterance, load_dataset
+    get_utterances, load_acoustic, load_ema, load_utterance, load_dataset,
+    iterate_dataset, get_bucketed_batches
 )
@@ -25,5 +25,6 @@ from ac2art.corpora.prototype.load import build_loading_functions
 # Define functions through a generic wrapper; pylint: disable=invalid-name
 (
     change_loading_setup, get_loading_setup, get_norm_parameters,
-    get_utterances, load_acoustic, load_ema, load_utterance, load_dataset
+    get_utterances, load_acoustic, load_ema, load_utterance, load_dataset,
+    iterate_dataset, get_bucketed_batches
 ) = build_loading_functions('mocha', default_byspeaker=True)
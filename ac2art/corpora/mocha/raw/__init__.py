@@ -20,5 +20,6 @@
 """Functions and classes to load raw data from the mocha corpus."""
 
 from ._loaders import (
-    get_utterances_list, load_ema, load_phone_labels, load_voicing, load_wav
+    get_raw_files, get_utterances_list, load_ema, load_phone_labels,
+    load_voicing, load_wav
 )
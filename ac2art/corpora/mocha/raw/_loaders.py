@@ -22,7 +22,6 @@
 import os
 
 import numpy as np
-from sphfile import SPHFile
 
 from ac2art.internal.data_loaders import EstTrack, Wav
 from ac2art.internal.data_utils import lowpass_filter
@@ -44,15 +43,13 @@ def get_speaker_utterances(speaker):
     ])
 
 
-def load_sphfile(path, sampling_rate, frame_time, hop_time):
-    """Return a Wav instance based on the data stored in a Sphere file."""
-    # Build a temporary copy of the file, converted to actual waveform format.
-    tmp_path = './' + os.path.basename(path[:-4]) + '_tmp.wav'
-    SPHFile(path).write_wav(tmp_path)
-    # Load data from the waveform file, and then remove the latter.
-    wav = Wav(tmp_path, sampling_rate, frame_time, hop_time)
-    os.remove(tmp_path)
-    return wav
+def get_raw_files(filename):
+    """Return the paths to the raw files of a mocha-timit utterance."""
+    speaker = filename.split('_')[0]
+    return [
+        os.path.join(RAW_FOLDER, speaker, filename + extension)
+        for extension in ('.wav', '.lar', '.ema', '.lab')
+    ]
 
 
 def load_wav(filename, frame_time=25, hop_time=10):
@@ -71,7 +68,7 @@ def load_wav(filename, frame_time=25, hop_time=10):
     # Load phone labels and compute frames index so as to trim silences.
     speaker = filename.split('_')[0]
     path = os.path.join(RAW_FOLDER, speaker, filename + '.wav')
-    return load_sphfile(path, 16000, frame_time, hop_time)
+    return Wav(path, 16000, frame_time, hop_time)
 
 
 def load_larynx(filename):
@@ -84,7 +81,7 @@ def load_larynx(filename):
     """
     speaker = filename.split('_')[0]
     path = os.path.join(RAW_FOLDER, speaker, filename + '.lar')
-    return load_sphfile(path, 16000, 200, 2).get_rms_energy()
+    return Wav(path, 16000, 200, 2).get_rms_energy()
 
 
 def load_ema_base(filename, columns_to_keep=None):
@@ -92,7 +89,7 @@ def load_ema_base(filename, columns_to_keep=None):
     # Import data from file.
     speaker = filename.split('_')[0]
     path = os.path.join(RAW_FOLDER, speaker, filename + '.ema')
-    track = EstTrack(path)
+    track = EstTrack(path, mmap_mode='r')
     ema_data = track.data / 1000
     column_names = list(track.column_names.values())
     # Optionally add laryngograph data.
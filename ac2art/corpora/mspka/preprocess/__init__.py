@@ -20,5 +20,6 @@
 """Set of functions to pre-process mspka data."""
 
 from ._preprocess import (
-    extract_utterances_data, compute_moments, normalize_files, split_corpus
+    extract_utterances_data, compute_moments, normalize_files, pack_files,
+    split_corpus
 )
@@ -22,7 +22,8 @@
 
 from ac2art.corpora.prototype.preprocess import (
     build_features_extraction_functions,
-    build_normalization_functions, build_corpus_splitting_function
+    build_normalization_functions, build_corpus_splitting_function,
+    build_packing_function
 )
 
 
@@ -52,6 +53,8 @@ extract_utterances_data = (
 
 compute_moments, normalize_files = build_normalization_functions('mspka')
 
+pack_files = build_packing_function('mspka')
+
 split_corpus = build_corpus_splitting_function(
     corpus='mspka', lowest_limit=9, same_speaker_data=False
 )
@@ -42,6 +42,16 @@ def get_speaker_utterances(speaker):
     ])
 
 
+def get_raw_files(filename):
+    """Return the paths to the raw files of a mspka utterance."""
+    speaker = filename.split('_')[0]
+    folder = os.path.join(RAW_FOLDER, speaker + '_1.0.0')
+    return [
+        os.path.join(folder, kind + '_1.0.0', filename + '.' + kind)
+        for kind in ('wav', 'ema', 'lab')
+    ]
+
+
 def load_wav(filename, frame_time=25, hop_time=10):
     """Load data from a mspka waveform (.wav) file.
 
@@ -74,7 +74,8 @@ def build_h5features_extractor(corpus):
                 0 if inverter is None or inverter.input_shape[-1] % 11 else 5
             )
             load_audio = functools.partial(
-                load_acoustic, audio_type=audio_features, context_window=window
+                load_acoustic, audio_type=audio_features,
+                context_window=window, strided_windows=True
             )
             # Optionally build and return an inverter-based features loader.
             if inverter is not None:
@@ -19,23 +19,27 @@
 
 """Wrapper defining a set of corpus-specific modular data loading functions."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import os
 
 import numpy as np
 
 from ac2art.corpora.prototype.utils import (
-    _get_normfile_path, load_articulators_list
+    _get_normfile_path, get_articulators_index, get_packed_store,
+    get_utterances_lengths, load_norm_parameters
 )
 from ac2art.internal.data_utils import (
-    add_dynamic_features, build_context_windows
+    add_dynamic_features, bucket_by_length, build_context_windows
 )
-from ac2art.utils import import_from_string, CONSTANTS
+from ac2art.utils import check_positive_int, import_from_string, CONSTANTS
 
 
 def build_loading_functions(corpus, default_byspeaker):
     """Define and return data loading functions for a given corpus.
 
-    Return eight functions, in the following order:
+    Return ten functions, in the following order:
       - change_loading_setup
       - get_loading_setup
       - get_norm_parameters
@@ -44,6 +48,8 @@ def build_loading_functions(corpus, default_byspeaker):
       - load_ema
       - load_utterance
       - load_dataset
+      - iterate_dataset
+      - get_bucketed_batches
     """
     # Use auxiliary functions to build the basic loading functions.
     change_loading_setup, get_loading_setup = (
@@ -52,6 +58,7 @@ def build_loading_functions(corpus, default_byspeaker):
     get_norm_parameters, get_utterances, load_acoustic, load_ema = (
         build_file_loaders(corpus)
     )
+    data_folder = CONSTANTS['%s_processed_folder' % corpus]
     # Define the major loading functions.
 
     def load_utterance(name, **kwargs):
@@ -69,7 +76,7 @@ def build_loading_functions(corpus, default_byspeaker):
         args.update(kwargs)
         acoustic = load_acoustic(
             name, args['audio_type'], args['context_window'],
-            args['zero_padding']
+            args['zero_padding'], args['strided_windows']
         )
         ema = load_ema(
             name, args['ema_norm'], args['dynamic_ema'], args['articulators']
@@ -78,38 +85,227 @@ def build_loading_functions(corpus, default_byspeaker):
             ema = ema[args['context_window']:-args['context_window']]
         return acoustic, ema
 
-    def load_dataset(set_name, concatenate=False, **kwargs):
+    def load_utterances(utterances, n_threads, queue_size, **kwargs):
+        """Yield the data of a list of utterances, optionally prefetched."""
+        nonlocal load_utterance
+        if not n_threads:
+            return (load_utterance(name, **kwargs) for name in utterances)
+        return _iterate_prefetched(
+            load_utterance, utterances, n_threads, queue_size, **kwargs
+        )
+
+    def load_dataset(
+            set_name, concatenate=False, n_threads=0, queue_size=None,
+            **kwargs
+        ):
         """Load the acoustic and articulatory data of an entire {0} fileset.
 
         set_name    : name of the fileset, e.g. 'train', 'validation' or 'test'
         concatenate : whether to concatenate the utterances into a single
                       numpy.ndarray (bool, default False)
+        n_threads   : number of background threads to use so as to load
+                      utterances concurrently (int, default 0, implying
+                      that utterances are loaded on the calling thread)
+        queue_size  : maximum number of utterances loaded in advance
+                      when using threads (int, default 2 * n_threads)
 
         Any keyword argument of functions `load_acoustic` and `load_ema`
         may be passed ; otherwise, current setup values will be used.
         The latter can be seen and changed using `get_loading_setup`
         and `change_loading_setup`, all from the `data.{0}.load` module.
         """
-        nonlocal get_utterances, load_utterance
-        dataset = np.array([
-            load_utterance(name, **kwargs) for name in get_utterances(set_name)
-        ])
-        acoustic = np.array([utterance[0] for utterance in dataset])
-        ema = np.array([utterance[1] for utterance in dataset])
+        nonlocal get_utterances, load_utterances
+        acoustic = []
+        ema = []
+        utterances = load_utterances(
+            get_utterances(set_name), n_threads, queue_size, **kwargs
+        )
+        for utterance in utterances:
+            acoustic.append(utterance[0])
+            ema.append(utterance[1])
         if concatenate:
             return np.concatenate(acoustic), np.concatenate(ema)
-        return acoustic, ema
+        return np.array(acoustic), np.array(ema)
+
+    def iterate_dataset(
+            set_name, batch_size=None, concatenate=False, n_threads=0,
+            queue_size=None, max_padding=None, seed=None, **kwargs
+        ):
+        """Lazily yield the acoustic and articulatory data of a {0} fileset.
+
+        set_name    : name of the fileset, e.g. 'train', 'validation' or 'test'
+        batch_size  : optional number of utterances to yield at once
+                      (positive int, default None, yielding utterances
+                      one at a time)
+        concatenate : whether to concatenate the utterances of each batch
+                      into single numpy.ndarray objects instead of yielding
+                      lists of arrays (bool, default False)
+        n_threads   : number of background threads to use so as to load
+                      utterances in advance (int, default 0, implying
+                      that utterances are loaded on the calling thread)
+        queue_size  : maximum number of utterances loaded in advance
+                      when using threads (int, default 2 * n_threads)
+        max_padding : optional maximum share of padding frames in batches,
+                      which are then made of utterances of similar lengths
+                      and yielded in random order (float in [0, 1[,
+                      default None ; see `get_bucketed_batches`) ;
+                      may only be set along with `batch_size`
+        seed        : optional random seed used when bucketing (int)
+
+        Yield tuples of acoustic and articulatory data, either of
+        single utterances or of batches of `batch_size` utterances
+        (the last of which may be smaller). Utterances are loaded
+        only when the batch they belong to is requested, so that
+        memory usage is bounded by the size of a single batch.
+
+        When using threads, the next utterances are read and processed
+        in the background while the yielded ones are being used, e.g.
+        while running a training step of a `NeuralNetwork` on them:
+        >>> for batch in iterate_dataset('train', 32, n_threads=2):
+        ...     model.run_training_function(*batch)
+
+        Any keyword argument of functions `load_acoustic` and `load_ema`
+        may be passed ; otherwise, current setup values will be used.
+        The latter can be seen and changed using `get_loading_setup`
+        and `change_loading_setup`, all from the `data.{0}.load` module.
+        """
+        # Arguments serve modularity; pylint: disable=too-many-arguments
+        nonlocal get_bucketed_batches, get_utterances, load_utterances
+        if batch_size is None and max_padding is not None:
+            raise ValueError("'max_padding' requires 'batch_size' to be set.")
+        # Optionally group utterances of similar lengths into batches.
+        if max_padding is not None:
+            batches, _ = get_bucketed_batches(
+                set_name, batch_size, max_padding, seed=seed,
+                audio_type=kwargs.get('audio_type')
+            )
+            names = [name for batch in batches for name in batch]
+            batch_sizes = iter([len(batch) for batch in batches])
+        else:
+            names = get_utterances(set_name)
+            batch_sizes = itertools.repeat(batch_size)
+        utterances = load_utterances(names, n_threads, queue_size, **kwargs)
+        # Optionally yield utterances one at a time.
+        if batch_size is None:
+            yield from utterances
+            return
+        # Otherwise, yield batches of utterances.
+        check_positive_int(batch_size, 'batch_size')
+        yield from _iterate_batches(utterances, batch_sizes, concatenate)
+
+    def get_bucketed_batches(
+            set_name, batch_size, max_padding=.2, shuffle=True, seed=None,
+            audio_type=None
+        ):
+        """Group the utterances of a {0} fileset into length-based batches.
+
+        set_name    : name of the fileset, e.g. 'train', 'validation' or 'test'
+        batch_size  : maximum number of utterances per batch (positive int)
+        max_padding : maximum share of padding frames in any batch, once
+                      its utterances are zero-padded to the longest one
+                      (float in [0, 1[, default .2)
+        shuffle     : whether to randomize the batches' composition among
+                      utterances of same length, and their order
+                      (bool, default True)
+        seed        : optional random seed to use when shuffling (int)
+        audio_type  : name of the audio features whose lengths to use
+                      (str, default that of the current loading setup)
+
+        Utterances' lengths are read from the packed store of the audio
+        features, if any, or from the headers of their .npy files.
+
+        Return a list of lists of utterances' names, and the share
+        of padding frames which batching them will require (float).
+        The batched utterances may be loaded using `load_utterance`,
+        and their data passed as is to the `get_feed_dict` method
+        of a `NeuralNetwork` taking batches of sequences as input.
+        """
+        nonlocal data_folder, get_loading_setup, get_utterances
+        if audio_type is None:
+            audio_type = get_loading_setup()['audio_type']
+        audio_type, norm_type = (audio_type + '_').split('_', 1)
+        folder = (
+            audio_type + '_norm_' + norm_type.strip('_')
+            if norm_type else audio_type
+        )
+        # Normalization on the fly leaves the lengths unaltered.
+        if not _is_materialized(data_folder, folder):
+            folder = audio_type
+        utterances = get_utterances(set_name)
+        lengths = get_utterances_lengths(data_folder, folder, utterances)
+        batches, padding_ratio = bucket_by_length(
+            lengths, batch_size, max_padding, shuffle, seed
+        )
+        batches = [[utterances[i] for i in batch] for batch in batches]
+        return batches, padding_ratio
 
-    # Adjust the latter two functions' docstrings.
+    # Adjust the latter four functions' docstrings.
     load_utterance.__doc__ = load_utterance.__doc__.format(corpus)
     load_dataset.__doc__ = load_dataset.__doc__.format(corpus)
+    iterate_dataset.__doc__ = iterate_dataset.__doc__.format(corpus)
+    get_bucketed_batches.__doc__ = get_bucketed_batches.__doc__.format(corpus)
     # Return the all set of loading functions.
     return (
         change_loading_setup, get_loading_setup, get_norm_parameters,
-        get_utterances, load_acoustic, load_ema, load_utterance, load_dataset
+        get_utterances, load_acoustic, load_ema, load_utterance, load_dataset,
+        iterate_dataset, get_bucketed_batches
     )
 
 
+def _iterate_batches(utterances, batch_sizes, concatenate):
+    """Yield batches of successive utterances' data.
+
+    utterances  : iterator of (acoustic, ema) tuples of utterances' data
+    batch_sizes : iterable of the successive batches' sizes
+    concatenate : whether to concatenate each batch's arrays (bool)
+
+    Stop once the utterances are exhausted, the last batch
+    being possibly smaller than its planned size.
+    """
+    for size in batch_sizes:
+        batch = list(itertools.islice(utterances, size))
+        if not batch:
+            return
+        acoustic = [utterance[0] for utterance in batch]
+        ema = [utterance[1] for utterance in batch]
+        if concatenate:
+            yield np.concatenate(acoustic), np.concatenate(ema)
+        else:
+            yield acoustic, ema
+
+
+def _iterate_prefetched(function, arguments, n_threads, queue_size, **kwargs):
+    """Yield the outputs of a function applied to arguments, using threads.
+
+    function   : function to apply to each argument
+    arguments  : iterable of (single) arguments to pass to the function
+    n_threads  : number of threads used to run the function (positive int)
+    queue_size : maximum number of outputs computed in advance (positive
+                 int, or None to use twice the number of threads)
+
+    Any additional keyword arguments are passed to `function`.
+
+    Outputs are yielded in the order of the arguments. At most
+    `queue_size` calls are pending or done but not yet yielded
+    at any time, which bounds the memory used by prefetching.
+    """
+    check_positive_int(n_threads, 'n_threads')
+    if queue_size is None:
+        queue_size = 2 * n_threads
+    check_positive_int(queue_size, 'queue_size')
+    arguments = iter(arguments)
+    with ThreadPoolExecutor(n_threads) as executor:
+        pending = deque(
+            executor.submit(function, argument, **kwargs)
+            for argument in itertools.islice(arguments, queue_size)
+        )
+        while pending:
+            output = pending.popleft().result()
+            for argument in itertools.islice(arguments, 1):
+                pending.append(executor.submit(function, argument, **kwargs))
+            yield output
+
+
 def build_setup_functions(corpus, default_byspeaker):
     """Build functions to view and alter a dict of loading arguments."""
     # Declare the loading setup dict.
@@ -120,13 +316,15 @@ def build_setup_functions(corpus, default_byspeaker):
         'context_window': 5,
         'dynamic_ema': True,
         'ema_norm': 'mean' + extension,
+        'strided_windows': False,
         'zero_padding': True
     }
     # Define functions to manipulate the former dict.
 
     def change_loading_setup(
             audio_type=None, articulators=None, context_window=None,
-            dynamic_ema=None, ema_norm=None, zero_padding=None
+            dynamic_ema=None, ema_norm=None, strided_windows=None,
+            zero_padding=None
         ):
         """Update the default arguments used when importing {0} data.
 
@@ -134,22 +332,26 @@ def build_setup_functions(corpus, default_byspeaker):
         by functions `load_utterance`, and `load_dataset` functions of the
         `data.{0}.load` module.
 
-        audio_type     : name of the audio features to use,
-                         including normalization indications (str)
-        articulators   : list of names of articulators to load
-        context_window : half-size of the context window of acoustic inputs
-                         (set to zero to use single audio frames as input)
-        dynamic_ema    : whether to use dynamic articulatory features
-        ema_norm       : optional type of normalization of the EMA data
-                         (set to '' to use raw EMA data)
-        zero_padding   : whether to use zero-padding when building context
-                         windows, or use edge frames as context only
+        audio_type      : name of the audio features to use,
+                          including normalization indications (str)
+        articulators    : list of names of articulators to load
+        context_window  : half-size of the context window of acoustic inputs
+                          (set to zero to use single audio frames as input)
+        dynamic_ema     : whether to use dynamic articulatory features
+        ema_norm        : optional type of normalization of the EMA data
+                          (set to '' to use raw EMA data)
+        strided_windows : whether to return context windows as read-only
+                          strided views over the frames instead of arrays
+                          `2 * context_window + 1` times larger
+        zero_padding    : whether to use zero-padding when building context
+                          windows, or use edge frames as context only
 
         Any number of the previous parameters may be passed to this function.
         All arguments left to their default value of `None` will go unchanged.
 
         To see the current value of the parameters, use `get_loading_setup`.
         """
+        # Arguments serve modularity; pylint: disable=too-many-arguments
         # Broadly catch all arguments; pylint: disable=unused-argument
         kwargs = locals()
         nonlocal loading_setup
@@ -178,6 +380,26 @@ def build_file_loaders(corpus):
     get_utterances_list = import_from_string(
         'ac2art.corpora.%s.raw._loaders' % corpus, 'get_utterances_list'
     )
+
+    def load_normalized_file(file_type, norm_name, name):
+        """Load an utterance's normalized data of a given type.
+
+        If normalized files were materialized (as a features folder
+        or a packed store), load them. Otherwise, load the raw data
+        and normalize it on the fly, using the cached corpus-wide or
+        speaker-wise moments, or the utterance's own moments in the
+        case of file-wise normalization.
+        """
+        nonlocal data_folder
+        folder = file_type + '_norm_' + norm_name
+        if _is_materialized(data_folder, folder):
+            return _load_features_file(data_folder, folder, name, file_type)
+        data = _load_features_file(data_folder, file_type, name, file_type)
+        means, norm = _get_normalization_moments(
+            data_folder, data, file_type, norm_name, name
+        )
+        return (data - means) / norm
+
     # Define the four loading functions.
 
     def get_norm_parameters(file_type, speaker=None):
@@ -186,10 +408,12 @@ def build_file_loaders(corpus):
         file_type : type of features whose parameters to return (str)
         speaker   : optional speaker whose parameters to return (str)
                     (otherwise, corpus-wide parameters are returned)
+
+        Parameters are read from disk once, then kept in memory
+        until they are re-computed.
         """
         nonlocal data_folder
-        path = _get_normfile_path(data_folder, file_type, speaker)
-        return np.load(path).tolist()
+        return load_norm_parameters(data_folder, file_type, speaker)
 
     def get_utterances(set_name=None):
         """Get the list of utterances from a given set.
@@ -205,29 +429,40 @@ def build_file_loaders(corpus):
         return utterances
 
     def load_acoustic(
-            name, audio_type='mfcc_stds', context_window=0, zero_padding=True
+            name, audio_type='mfcc_stds', context_window=0, zero_padding=True,
+            strided_windows=False
         ):
         """Load the acoustic data associated with an utterance from {0}.
 
-        name           : name of the utterance whose data to load (str)
-        audio_type     : name of the audio features to use, including
-                         normalization indications (str, default 'mfcc_stds')
-        context_window : half-size of the context window of frames to return
-                         (default 0, returning single audio frames)
-        zero_padding   : whether to zero-pad the data when building context
-                         frames (bool, default True)
+        name            : name of the utterance whose data to load (str)
+        audio_type      : name of the audio features to use, including
+                          normalization indications (str, default 'mfcc_stds')
+        context_window  : half-size of the context window of frames to return
+                          (default 0, returning single audio frames)
+        zero_padding    : whether to zero-pad the data when building context
+                          frames (bool, default True)
+        strided_windows : whether to return context windows as a read-only
+                          strided view over the (padded) frames, instead of
+                          a `2 * context_window + 1` times wider array
+                          (bool, default False)
+
+        Normalized features which were not written to disk using
+        `normalize_files` are normalized on the fly, based on the
+        raw features and their (cached) pre-computed moments.
         """
-        nonlocal data_folder
+        nonlocal data_folder, load_normalized_file
         audio_type, norm_type = (audio_type + '_').split('_', 1)
-        folder = (
-            audio_type + '_norm_' + norm_type.strip('_')
-            if norm_type else audio_type
-        )
-        path = os.path.join(data_folder, folder, name + '_%s.npy' % audio_type)
-        acoustic = np.load(path)
+        if norm_type:
+            acoustic = load_normalized_file(
+                audio_type, norm_type.strip('_'), name
+            )
+        else:
+            acoustic = _load_features_file(
+                data_folder, audio_type, name, audio_type
+            )
         if context_window:
-            acoustic = (
-                build_context_windows(acoustic, context_window, zero_padding)
+            acoustic = build_context_windows(
+                acoustic, context_window, zero_padding, strided_windows
             )
         return acoustic
 
@@ -240,17 +475,23 @@ def build_file_loaders(corpus):
         norm_type    : optional type of normalization to use (str)
         use_dynamic  : whether to return dynamic features (bool, default True)
         articulators : optional list of articulators to load
+
+        Normalized data which was not written to disk using
+        `normalize_files` is normalized on the fly, based on the
+        raw data and its (cached) pre-computed moments.
         """
-        nonlocal corpus, data_folder, get_norm_parameters
+        nonlocal corpus, data_folder, get_norm_parameters, load_normalized_file
         # Load the EMA data with proper normalization.
-        ema_folder = (
-            'ema' if norm_type in ('', 'mean', 'mean_byspeaker')
-            else 'ema_norm_' + norm_type
+        folder_norm = (
+            '' if norm_type in ('', 'mean', 'mean_byspeaker') else norm_type
         )
-        ema = np.load(os.path.join(data_folder, ema_folder, name + '_ema.npy'))
+        if folder_norm:
+            ema = load_normalized_file('ema', folder_norm, name)
+        else:
+            ema = _load_features_file(data_folder, 'ema', name, 'ema')
         if norm_type.startswith('mean'):
             speaker = None if norm_type == 'mean' else name.split('_', 1)[0]
-            ema -= get_norm_parameters('ema', speaker)['global_means']
+            ema = ema - get_norm_parameters('ema', speaker)['global_means']
         # Optionally select articulatory data to keep.
         add_voicing = True
         if isinstance(articulators, list):
@@ -258,24 +499,17 @@ def build_file_loaders(corpus):
                 articulators = [e for e in articulators if e != 'voicing']
             else:
                 add_voicing = False
-            articulators_list = load_articulators_list(corpus, norm_type)
-            invalid = [
-                name for name in articulators if name not in articulators_list
-            ]
-            if invalid:
-                raise KeyError(
-                    'Invalid articulator(s): %s.\nValid articulators are %s.'
-                    % (invalid, articulators_list)
-                )
-            cols_index = [articulators_list.index(key) for key in articulators]
+            cols_index = get_articulators_index(
+                corpus, folder_norm, articulators
+            )
             ema = ema[:, cols_index]
         # Optionally add dynamic features.
         if use_dynamic:
             ema = add_dynamic_features(ema)
         # Optionally add binary voicing data.
         if add_voicing:
-            voicing = np.load(
-                os.path.join(data_folder, 'voicing', name + '_voicing.npy')
+            voicing = _load_features_file(
+                data_folder, 'voicing', name, 'voicing'
             )
             if use_dynamic:
                 n_static = ema.shape[1] // 3
@@ -292,3 +526,71 @@ def build_file_loaders(corpus):
     for function in functions:
         function.__doc__ = function.__doc__.format(corpus)
     return functions
+
+
+def _load_features_file(data_folder, folder, name, file_type):
+    """Load an utterance's data from a features folder.
+
+    If the folder was packed, return a read-only view of the
+    data from the memory-mapped store instead of reading the
+    utterance's own .npy file.
+    """
+    store = get_packed_store(data_folder, folder)
+    if store is not None and name in store:
+        return store[name]
+    path = os.path.join(data_folder, folder, name + '_%s.npy' % file_type)
+    return np.load(path)
+
+
+def _get_normalization_moments(data_folder, data, file_type, norm_name, name):
+    """Return the means and divisor to normalize an utterance's data with.
+
+    data_folder : path to the corpus' processed data folder
+    data        : raw data of the utterance (numpy.ndarray)
+    file_type   : type of the features, e.g. 'mfcc' or 'ema' (str)
+    norm_name   : name of the normalization, e.g. 'stds_byspeaker' (str)
+    name        : name of the utterance (str)
+
+    File-wise moments are computed from the data, while corpus-wide
+    and speaker-wise ones are read from the cached parameters.
+    """
+    divisor, scope = (norm_name + '_').split('_', 1)
+    scope = scope.strip('_')
+    if divisor not in ('stds', 'spread'):
+        raise ValueError(
+            "Invalid normalization '%s': divisor should be one of "
+            "{'stds', 'spread'}." % norm_name
+        )
+    if scope == 'byfile':
+        means = data.mean(axis=0)
+        norm = (
+            data.std(axis=0) if divisor == 'stds'
+            else data.max(axis=0) - data.min(axis=0)
+        )
+    elif scope in ('', 'byspeaker'):
+        speaker = name.split('_', 1)[0] if scope else None
+        path = _get_normfile_path(data_folder, file_type, speaker)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(
+                "Cannot normalize '%s' features on the fly: their "
+                "normalization parameters were not computed. Please "
+                "run `compute_moments('%s')` first."
+                % (file_type, file_type)
+            )
+        moments = load_norm_parameters(data_folder, file_type, speaker)
+        means = moments['global_means']
+        norm = moments['global_' + divisor]
+    else:
+        raise ValueError(
+            "Invalid normalization '%s': scope should be one of "
+            "{'', 'byspeaker', 'byfile'}." % norm_name
+        )
+    return means, norm
+
+
+def _is_materialized(data_folder, folder):
+    """Return whether a features folder exists, either as is or packed."""
+    return (
+        get_packed_store(data_folder, folder) is not None
+        or os.path.isdir(os.path.join(data_folder, folder))
+    )
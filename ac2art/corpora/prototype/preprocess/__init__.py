@@ -21,4 +21,5 @@
 
 from ._extract import build_features_extraction_functions
 from ._normalize import build_normalization_functions
+from ._pack import build_packing_function
 from ._split import build_corpus_splitting_function, store_filesets
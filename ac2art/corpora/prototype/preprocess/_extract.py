@@ -19,17 +19,24 @@
 
 """Wrapper building cropus-specific data extraction functions."""
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
 import os
+import shutil
 import sys
 import time
 
 import numpy as np
-import scipy.signal
 
 from ac2art.external.abkhazia import (
     ark_to_npy, compute_mfcc, prepare_abkhazia_corpus
 )
-from ac2art.internal.data_utils import interpolate_missing_values
+from ac2art.corpora.prototype.utils import (
+    _get_normfile_path, drop_cached_values, drop_packed_store
+)
+from ac2art.internal.data_utils import (
+    interpolate_missing_values, resample_signal
+)
 from ac2art.utils import (
     check_positive_int, check_type_validity, import_from_string, CONSTANTS
 )
@@ -52,14 +59,17 @@ def build_features_extraction_functions(
     # Define auxiliary functions through wrappers.
     control_arguments = build_arguments_checker(corpus, default_articulators)
     extract_data = build_extractor(corpus, initial_sampling_rate)
-    # Import the get_utterances_list dependency function.
-    get_utterances_list = import_from_string(
-        'ac2art.corpora.%s.raw._loaders' % corpus, 'get_utterances_list'
+    main_folder = CONSTANTS['%s_processed_folder' % corpus]
+    # Import the raw files listing dependency functions.
+    get_raw_files, get_utterances_list, speakers = import_from_string(
+        'ac2art.corpora.%s.raw._loaders' % corpus,
+        ['get_raw_files', 'get_utterances_list', 'SPEAKERS']
     )
     # Define a function extracting features from all utterances.
     def extract_utterances_data(
             audio_forms=None, n_coeff=13, articulators_list=None,
-            ema_sampling_rate=100, audio_frames_time=25
+            ema_sampling_rate=100, audio_frames_time=25, n_jobs=1,
+            chunksize=None, force=False, ema_resampling='fft'
         ):
         """Extract acoustic and articulatory data of each {0} utterance.
 
@@ -77,6 +87,16 @@ def build_features_extraction_functions(
         audio_frames_time : duration of the audio frames used to compute
                             acoustic features, in milliseconds
                             (int, default 25)
+        n_jobs            : number of processes to use so as to extract
+                            utterances' data in parallel (int, default 1)
+        chunksize         : number of utterances dispatched at once to each
+                            process (int, default None, implying that it is
+                            adjusted to the number of utterances and jobs)
+        force             : whether to extract all features anew, even those
+                            which are up-to-date (bool, default False)
+        ema_resampling    : method used to resample the EMA data, either
+                            'fft' or 'polyphase' (rational-ratio filtering,
+                            faster on long utterances) (str, default 'fft')
 
         Data extractation includes the following:
           - optional resampling of the EMA data
@@ -95,40 +115,77 @@ def build_features_extraction_functions(
         The file names include the utterance's name, extended with an indicator
         of the kind of features it contains.
 
+        A manifest of the settings used to extract each utterance's
+        features, and of its raw files' modification times, is recorded
+        in the output folder. Features which are up-to-date with regards
+        to both are not extracted again, so that interrupted extractions
+        may be resumed, and additional utterances or audio forms may be
+        extracted without re-extracting the already-available data.
+
+        Normalization parameters and normalized copies of the kinds of
+        features which are re-extracted are removed, as they would
+        otherwise go stale ; they should thus be computed anew.
+
+        Utterances whose extraction fails are skipped, and a summary of
+        these failures is printed out at the end. A dict associating the
+        names of those utterances to their error message is returned.
+
         {1}
         """
+        # Arguments serve modularity; pylint: disable=too-many-arguments
         nonlocal corpus, control_arguments, extract_data, get_utterances_list
+        nonlocal get_raw_files, initial_sampling_rate, main_folder, speakers
+        check_positive_int(n_jobs, 'n_jobs')
+        if ema_resampling not in ('fft', 'polyphase'):
+            raise ValueError(
+                "Unknown EMA resampling method: '%s'." % ema_resampling
+            )
         # Check arguments, assign default values and build output folders.
         audio_forms, n_coeff, articulators_list = control_arguments(
             audio_forms, n_coeff, articulators_list,
             ema_sampling_rate, audio_frames_time
         )
-        # Compute mfcc coefficients using abkhazia, if relevant.
-        abkhazia_mfcc = 'mfcc' in audio_forms
-        if abkhazia_mfcc:
-            mfcc_ix = audio_forms.index('mfcc')
-            wav_to_mfcc(
-                corpus, n_coeff=n_coeff[mfcc_ix], pitch=True,
-                frame_time=audio_frames_time,
-                hop_time=(1000 / ema_sampling_rate)
+        # Set up the extraction settings of each kind of features.
+        arguments = (
+            dict(zip(audio_forms, n_coeff)), articulators_list,
+            ema_sampling_rate, audio_frames_time, ema_resampling
+        )
+        settings = _get_extraction_settings(*arguments)
+        # Establish the features to extract for each utterance.
+        manifest = {} if force else _load_manifest(main_folder)
+        tasks = [
+            _plan_extraction(
+                main_folder, utterance, manifest.get(utterance),
+                get_raw_files(utterance), settings
             )
-            del audio_forms[mfcc_ix]
-            del n_coeff[mfcc_ix]
-        # Iterate over all corpus utterances.
-        for utterance in get_utterances_list():
-            extract_data(
-                utterance, audio_forms, n_coeff, abkhazia_mfcc,
-                articulators_list, ema_sampling_rate, audio_frames_time
+            for utterance in get_utterances_list()
+        ]
+        tasks = [task for task in tasks if task[1]]
+        if not tasks:
+            print(
+                'All %s utterances are up-to-date.'
+                % len(get_utterances_list())
             )
-            end_time = time.asctime().split(' ')[-2]
-            print('%s : Done with utterance %s.' % (end_time, utterance))
-            sys.stdout.write('\033[F')
-        # Record the list of articulators.
-        path = os.path.join(
-            CONSTANTS['%s_processed_folder' % corpus], 'ema', 'articulators'
+            return {}
+        # Remove the packed and normalized data which would go stale.
+        _drop_stale_data(main_folder, tasks, audio_forms, speakers)
+        # Compute mfcc coefficients using abkhazia, if relevant.
+        _compute_abkhazia_mfcc(corpus, tasks, settings)
+        # Iterate over utterances to extract, optionally in parallel.
+        if n_jobs == 1:
+            results = _extract_serially(extract_data, tasks, arguments)
+        else:
+            results = _extract_in_parallel(
+                corpus, initial_sampling_rate, tasks, arguments,
+                n_jobs, chunksize
+            )
+        failures = _gather_results(
+            results, len(tasks), main_folder, manifest, settings
         )
-        with open(path, 'w', encoding='utf-8') as file:
-            file.write('\n'.join(articulators_list))
+        # Record the list of articulators.
+        _write_articulators(main_folder, articulators_list)
+        drop_cached_values(main_folder)
+        return failures
 
     # Adjust the function's docstring and return it.
     extract_utterances_data.__doc__ = (
@@ -137,6 +194,324 @@ def build_features_extraction_functions(
     return extract_utterances_data
 
 
+def _get_extraction_settings(
+        n_coeff, articulators, sampling_rate, frames_time, ema_resampling
+    ):
+    """Return a dict of the extraction settings of each kind of features.
+
+    n_coeff        : dict associating audio forms with their number
+                     of static coefficients
+    articulators   : list of raw EMA data columns to keep
+    sampling_rate  : sample rate of the EMA data to use, in Hz
+    frames_time    : duration of the audio frames, in milliseconds
+    ema_resampling : method used to resample the EMA data
+    """
+    settings = {
+        name: {
+            'n_coeff': n_feat, 'ema_sampling_rate': sampling_rate,
+            'audio_frames_time': frames_time
+        }
+        for name, n_feat in n_coeff.items()
+    }
+    settings['ema'] = {
+        'articulators': articulators,
+        'ema_sampling_rate': sampling_rate,
+        'ema_resampling': ema_resampling
+    }
+    return settings
+
+
+def _write_articulators(main_folder, articulators):
+    """Record the list of the extracted EMA data's articulators."""
+    path = os.path.join(main_folder, 'ema', 'articulators')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(articulators))
+
+
+def _drop_stale_data(main_folder, tasks, audio_forms, speakers):
+    """Remove the data which re-extracting some features would make stale.
+
+    main_folder : path to the corpus' processed data folder (str)
+    tasks       : list of extraction tasks, as built by `_plan_extraction`
+    audio_forms : list of audio forms to extract
+    speakers    : list of the corpus' speakers
+
+    Remove any packed copy of the folders which are to be rewritten,
+    the normalized data derived from rewritten features and cached
+    normalization parameters.
+    """
+    for folder in audio_forms + ['ema', 'voicing']:
+        drop_packed_store(main_folder, folder)
+    rewritten = {name for task in tasks for name in task[1]}
+    for file_type in sorted(rewritten):
+        _drop_normalized_data(main_folder, file_type, speakers)
+    drop_cached_values(main_folder)
+
+
+def _compute_abkhazia_mfcc(corpus, tasks, settings):
+    """Compute the 'mfcc' features of the utterances requiring them.
+
+    corpus   : name of the corpus (str)
+    tasks    : list of extraction tasks, as built by `_plan_extraction`
+    settings : dict associating the kinds of features to extract
+               with their extraction settings
+    """
+    mfcc_utterances = [task[0] for task in tasks if 'mfcc' in task[1]]
+    if mfcc_utterances:
+        mfcc_settings = settings['mfcc']
+        wav_to_mfcc(
+            corpus, n_coeff=mfcc_settings['n_coeff'], pitch=True,
+            frame_time=mfcc_settings['audio_frames_time'],
+            hop_time=(1000 / mfcc_settings['ema_sampling_rate']),
+            utterances=mfcc_utterances
+        )
+
+
+def _drop_normalized_data(main_folder, file_type, speakers):
+    """Remove the normalization parameters and normalized copies of
+    a kind of features, e.g. prior to its re-extraction.
+
+    main_folder : path to the corpus' processed data folder (str)
+    file_type   : kind of features whose derived data to remove (str)
+    speakers    : list of the corpus' speakers
+    """
+    for speaker in set([None] + list(speakers)):
+        path = _get_normfile_path(main_folder, file_type, speaker)
+        if os.path.isfile(path):
+            os.remove(path)
+    for folder in os.listdir(main_folder):
+        path = os.path.join(main_folder, folder)
+        if folder.startswith(file_type + '_norm_') and os.path.isdir(path):
+            drop_packed_store(main_folder, folder)
+            shutil.rmtree(path)
+
+
+def _get_sources_state(paths):
+    """Return a dict recording the modification time of raw files."""
+    return {
+        path: os.path.getmtime(path) if os.path.isfile(path) else None
+        for path in paths
+    }
+
+
+def _get_manifest_path(main_folder):
+    """Get the path to the features extraction manifest of a corpus."""
+    return os.path.join(main_folder, 'extraction_manifest.json')
+
+
+def _load_manifest(main_folder):
+    """Load the features extraction manifest of a corpus, if any."""
+    path = _get_manifest_path(main_folder)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _plan_extraction(main_folder, utterance, record, raw_files, settings):
+    """Establish which features of an utterance need extracting.
+
+    main_folder : path to the corpus' processed data folder (str)
+    utterance   : name of the utterance (str)
+    record      : manifest record of the utterance (dict or None)
+    raw_files   : list of paths to the utterance's raw files
+    settings    : dict associating the kinds of features to extract
+                  with their extraction settings
+
+    Features are to be extracted if they were not, or if their raw
+    files or settings have changed since then. When other requested
+    features of the utterance are kept, new ones are trimmed to their
+    length; features which are not requested are disregarded, as they
+    may have been extracted at another sampling rate.
+
+    Return a tuple containing the utterance's name, the list of kinds
+    of features to extract and the optional end frame to trim them at.
+    """
+    if not record or record['sources'] != _get_sources_state(raw_files):
+        record = {'features': {}, 'frames': None}
+
+    def is_up_to_date(name):
+        """Return whether given features of the utterance are up-to-date."""
+        path = os.path.join(main_folder, name, utterance + '_%s.npy' % name)
+        return (
+            record['features'].get(name) == settings[name]
+            and os.path.isfile(path)
+        )
+
+    to_extract = [name for name in settings if not is_up_to_date(name)]
+    kept = [
+        name for name in record['features']
+        if name in settings and name not in to_extract
+    ]
+    end_frame = record['frames'][1] if kept else None
+    return utterance, to_extract, end_frame
+
+
+def _update_manifest(main_folder, manifest, done, settings):
+    """Record newly-extracted features in a corpus' extraction manifest.
+
+    main_folder : path to the corpus' processed data folder (str)
+    manifest    : manifest dict, which is updated in-place
+    done        : dict associating the names of extracted utterances
+                  with a tuple containing their raw files' paths, the
+                  list of extracted features and their trimming frames
+    settings    : dict associating the kinds of features extracted
+                  with their extraction settings
+
+    Features recorded with other trimming frames than the newly-extracted
+    ones are removed from the manifest, as they do not match the latter
+    (e.g. due to a change of sampling rate).
+    """
+    if not done:
+        return
+    for utterance, (raw_files, extracted, frames) in done.items():
+        sources = _get_sources_state(raw_files)
+        record = manifest.get(utterance)
+        if (
+                not record or record['sources'] != sources
+                or record['frames'] != list(frames)
+            ):
+            record = {'sources': sources, 'features': {}}
+        record['frames'] = list(frames)
+        record['features'].update({name: settings[name] for name in extracted})
+        manifest[utterance] = record
+    path = _get_manifest_path(main_folder)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    os.replace(path + '.tmp', path)
+
+
+def _run_extraction(extract_data, tasks, arguments):
+    """Extract the data of some utterances, isolating failures.
+
+    extract_data : utterance-wise extraction function
+    tasks        : list of tuples specifying an utterance's name, the
+                   kinds of features to extract and an optional frame
+                   at which to trim them
+    arguments    : tuple of additional arguments to `extract_data`
+
+    Return two dict, associating respectively the names of extracted
+    utterances with a tuple containing their raw files' paths, the
+    kinds of extracted features and the frames at which these were
+    trimmed, and the names of the utterances whose extraction failed
+    with the associated error message.
+    """
+    done = {}
+    failures = {}
+    for utterance, features, end_frame in tasks:
+        try:
+            done[utterance] = extract_data(
+                utterance, features, *arguments, end_frame=end_frame
+            )
+        except Exception as exception:  # pylint: disable=broad-except
+            failures[utterance] = '%s: %s' % (
+                type(exception).__name__, exception
+            )
+    return done, failures
+
+
+def _extract_serially(extract_data, tasks, arguments):
+    """Extract the data of utterances one at a time, isolating failures.
+
+    Yield the outputs of `_run_extraction` on each task, in order.
+    """
+    for task in tasks:
+        yield _run_extraction(extract_data, [task], arguments)
+
+
+def _gather_results(results, n_tasks, main_folder, manifest, settings):
+    """Gather the outputs of utterances' extraction as they come.
+
+    results     : iterable of outputs of `_run_extraction`
+    n_tasks     : total number of utterances to extract (int)
+    main_folder : path to the corpus' processed data folder (str)
+    manifest    : manifest dict, which is updated in-place
+    settings    : dict associating the kinds of features extracted
+                  with their extraction settings
+
+    The extracted features are recorded in the manifest, even if
+    the extraction is interrupted. A summary of failures is printed.
+
+    Return a dict associating the names of the utterances whose
+    extraction failed with the associated error message.
+    """
+    done, failures = {}, {}
+    try:
+        for chunk_done, chunk_failures in results:
+            done.update(chunk_done)
+            failures.update(chunk_failures)
+            end_time = time.asctime().split(' ')[-2]
+            print('%s : Done with %s out of %s utterances.' % (
+                end_time, len(done) + len(failures), n_tasks
+            ))
+            sys.stdout.write('\033[F')
+    finally:
+        _update_manifest(main_folder, manifest, done, settings)
+    # Report on the failed extractions, if any.
+    print('Extracted data of %s out of %s utterances to process.' % (
+        n_tasks - len(failures), n_tasks
+    ))
+    for utterance, error in sorted(failures.items()):
+        print("Failed to extract utterance '%s': %s" % (utterance, error))
+    return failures
+
+
+# Extractors built in worker processes; pylint: disable=invalid-name
+_worker_extractors = {}
+
+
+def _extract_chunk(corpus, initial_sampling_rate, tasks, arguments):
+    """Extract the data of a chunk of utterances, in a worker process.
+
+    The corpus-specific extraction function is built once per process.
+    """
+    if corpus not in _worker_extractors:
+        _worker_extractors[corpus] = (
+            build_extractor(corpus, initial_sampling_rate)
+        )
+    return _run_extraction(_worker_extractors[corpus], tasks, arguments)
+
+
+def _extract_in_parallel(
+        corpus, initial_sampling_rate, tasks, arguments,
+        n_jobs, chunksize=None
+    ):
+    """Extract the data of utterances using a pool of processes.
+
+    Utterances are dispatched to the processes in chunks, by default
+    of a size leading to about four chunks per process.
+
+    Yield the outputs of `_run_extraction` on each chunk of tasks,
+    in the order in which they are completed.
+    """
+    # Arguments serve modularity; pylint: disable=too-many-arguments
+    if chunksize is None:
+        chunksize = max(1, -(-len(tasks) // (4 * n_jobs)))
+    check_positive_int(chunksize, 'chunksize')
+    chunks = [
+        tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)
+    ]
+    with ProcessPoolExecutor(n_jobs) as executor:
+        futures = {
+            executor.submit(
+                _extract_chunk, corpus, initial_sampling_rate,
+                chunk, arguments
+            ): chunk
+            for chunk in chunks
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as exception:  # pylint: disable=broad-except
+                    error = '%s: %s' % (type(exception).__name__, exception)
+                    results = {}, {task[0]: error for task in futures[future]}
+                yield results
+        finally:
+            for future in futures:
+                future.cancel()
+
+
 def build_arguments_checker(corpus, default_articulators):
     """Define and return a function checking features extraction arguments."""
     new_folder = CONSTANTS['%s_processed_folder' % corpus]
@@ -208,9 +583,14 @@ def build_extractor(corpus, initial_sampling_rate):
     """
     # Load the output path and dependency data loading functions.
     new_folder = CONSTANTS['%s_processed_folder' % corpus]
-    load_ema, load_phone_labels, load_voicing, load_wav = import_from_string(
-        module='ac2art.corpora.%s.raw._loaders' % corpus,
-        elements=['load_ema', 'load_phone_labels', 'load_voicing', 'load_wav']
+    get_raw_files, load_ema, load_phone_labels, load_voicing, load_wav = (
+        import_from_string(
+            module='ac2art.corpora.%s.raw._loaders' % corpus,
+            elements=[
+                'get_raw_files', 'load_ema', 'load_phone_labels',
+                'load_voicing', 'load_wav'
+            ]
+        )
     )
 
     def get_boundaries(utterance, sampling_rate):
@@ -226,20 +606,18 @@ def build_extractor(corpus, initial_sampling_rate):
         return start_frame, end_frame
 
     def extract_ema(
-            utterance, sampling_rate, articulators
+            utterance, sampling_rate, articulators, resampling='fft'
         ):
         """Extract and return the EMA data associated with an utterance."""
         nonlocal initial_sampling_rate, load_ema, new_folder
         # Load EMA data and interpolate NaN values using cubic splines.
         ema, _ = load_ema(utterance, articulators)
-        ema = np.concatenate([
-            interpolate_missing_values(data_column).reshape(-1, 1)
-            for data_column in np.transpose(ema)
-        ], axis=1)
+        ema = interpolate_missing_values(ema)
         # Optionally resample the EMA data.
         if sampling_rate != initial_sampling_rate:
-            ratio = sampling_rate / initial_sampling_rate
-            ema = scipy.signal.resample(ema, num=int(len(ema) * ratio))
+            ema = resample_signal(
+                ema, initial_sampling_rate, sampling_rate, resampling
+            )
         # Return the EMA data.
         return ema
 
@@ -257,55 +635,118 @@ def build_extractor(corpus, initial_sampling_rate):
         }
 
     def extract_data(
-            utterance, audio_forms, n_coeff, abkhazia_mfcc,
-            articulators, sampling_rate, frames_time
+            utterance, features, n_coeff, articulators, sampling_rate,
+            frames_time, ema_resampling='fft', end_frame=None
         ):
-        """Extract acoustic and articulatory data of a given utterance."""
+        """Extract acoustic and articulatory data of a given utterance.
+
+        utterance      : name of the utterance whose data to extract (str)
+        features       : list of kinds of features to extract, among
+                         audio forms and 'ema' (which includes voicing)
+        n_coeff        : dict associating audio forms with their number
+                         of static coefficients
+        articulators   : list of raw EMA data columns to keep
+        sampling_rate  : sample rate of the EMA data to use, in Hz
+        frames_time    : duration of the audio frames, in milliseconds
+        ema_resampling : method used to resample the EMA data, either
+                         'fft' or 'polyphase'
+        end_frame      : optional frame at which to trim the features,
+                         so as to match previously-extracted ones
+
+        Return the list of paths to the utterance's raw files, the
+        list of extracted features and a tuple of the start and end
+        frames at which they were trimmed.
+        """
         # Wrapped function; pylint: disable=too-many-arguments
-        nonlocal load_wav, new_folder
+        nonlocal get_raw_files, load_voicing, new_folder
         nonlocal extract_audio, extract_ema, get_boundaries
         # Generate or load all kinds of features for the utterance.
-        data = extract_audio(
-            utterance, audio_forms, n_coeff, sampling_rate, frames_time
-        )
-        data['ema'] = extract_ema(utterance, sampling_rate, articulators)
-        data['voicing'] = load_voicing(utterance, sampling_rate)
-        if abkhazia_mfcc:
+        audio_forms = [
+            name for name in features if name not in ('ema', 'mfcc')
+        ]
+        data = {}
+        if audio_forms:
+            data = extract_audio(
+                utterance, audio_forms,
+                [n_coeff[name] for name in audio_forms],
+                sampling_rate, frames_time
+            )
+        if 'ema' in features:
+            data['ema'] = extract_ema(
+                utterance, sampling_rate, articulators, ema_resampling
+            )
+            data['voicing'] = load_voicing(utterance, sampling_rate)
+        if 'mfcc' in features:
             path = os.path.join(new_folder, 'mfcc', utterance + '.npy')
             data['mfcc'] = np.load(path)
         # Fit the edge silences trimming values.
-        start_frame, end_frame = get_boundaries(utterance, sampling_rate)
-        original_end = end_frame
-        for name, array in data.items():
-            length = len(array)
-            if length < start_frame:
-                raise ValueError(
-                    "Utterance '%s': '%s' features are shorter than the"
-                    "expected start trimming zone." % (utterance, name)
-                )
-            if length < original_end:
-                print(
-                    "Utterance '%s': '%s' features are shorter than expected"
-                    "(%s vs %s).\nAll features will be trimmed to fit."
-                    % (utterance, name, length, original_end)
-                )
-                if length < end_frame:
-                    end_frame = length
+        start_frame, original_end = get_boundaries(utterance, sampling_rate)
+        end_frame = _fit_end_frame(
+            utterance, data, start_frame, original_end, end_frame
+        )
         # Trim and save all features sets to disk.
         for name, array in data.items():
             path = os.path.join(
                 new_folder, name, utterance + '_' + name + '.npy'
             )
             np.save(path, array[start_frame:end_frame])
+        # Return information on the extraction.
+        return get_raw_files(utterance), features, (start_frame, end_frame)
 
     # Return the previous last function.
     return extract_data
 
 
+def _fit_end_frame(utterance, data, start_frame, end_frame, previous=None):
+    """Fit the frame at which to trim an utterance's features.
+
+    utterance   : name of the utterance whose features to trim (str)
+    data        : dict associating names of features with arrays
+    start_frame : frame at which to start the features (int)
+    end_frame   : frame at which to end the features, fitted
+                  so as to remove the edge silences (int)
+    previous    : optional end frame of previously-extracted
+                  features, which all features should match
+
+    Return the end frame, lowered to fit the shortest features if
+    needed. Raise a ValueError if some features do not cover the
+    start trimming zone or the previously-extracted ones.
+    """
+    if previous is not None:
+        end_frame = previous
+    fitted_end = end_frame
+    for name, array in data.items():
+        length = len(array)
+        if length < start_frame:
+            raise ValueError(
+                "Utterance '%s': '%s' features are shorter than the "
+                "expected start trimming zone." % (utterance, name)
+            )
+        if length < end_frame:
+            if previous is not None:
+                raise ValueError(
+                    "Utterance '%s': '%s' features are shorter than "
+                    "previously-extracted ones (%s vs %s)."
+                    % (utterance, name, length, end_frame)
+                )
+            print(
+                "Utterance '%s': '%s' features are shorter than expected "
+                "(%s vs %s).\nAll features will be trimmed to fit."
+                % (utterance, name, length, end_frame)
+            )
+            fitted_end = min(fitted_end, length)
+    return fitted_end
+
+
 def wav_to_mfcc(
-        corpus, n_coeff=13, pitch=True, frame_time=25, hop_time=10
+        corpus, n_coeff=13, pitch=True, frame_time=25, hop_time=10,
+        utterances=None
     ):
-    """Produce MFCC features using abkhazia for a given corpus."""
+    """Produce MFCC features using abkhazia for a given corpus.
+
+    If a list of `utterances` is provided, restrict the computation
+    to these, leaving other utterances' features untouched.
+    """
     print('Running MFCC computation with abkhazia...')
     # Establish folders to work with.
     main_folder = CONSTANTS['%s_processed_folder' % corpus]
@@ -314,6 +755,8 @@ def wav_to_mfcc(
     output_folder = os.path.join(main_folder, 'mfcc')
     # Build an abkhazia data folder for the corpus.
     prepare_abkhazia_corpus(corpus, data_folder)
+    if utterances is not None:
+        _restrict_abkhazia_data(data_folder, utterances)
     # Compute MFCC features using abkhazia.
     compute_mfcc(
         data_folder, n_coeff, pitch, frame_time, hop_time, mfcc_folder
@@ -321,3 +764,33 @@ def wav_to_mfcc(
     # Extract MFCC features to utterance-wise npy files.
     ark_to_npy(os.path.join(mfcc_folder, 'feats.scp'), output_folder)
     print('Done producing raw MFCC coefficients with abkhazia.')
+
+
+def _restrict_abkhazia_data(data_folder, utterances):
+    """Restrict an abkhazia data folder to a subset of utterances."""
+    utterances = set(utterances)
+    # Filter the utterance-indexed files.
+    for name in ('segments.txt', 'utt2spk.txt', 'text.txt'):
+        path = os.path.join(data_folder, name)
+        with open(path, encoding='utf-8') as file:
+            rows = [
+                row for row in file
+                if row.split(' ', 1)[0].strip('_') in utterances
+            ]
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(''.join(rows))
+    # Filter the speaker-indexed file, dropping speakers left empty.
+    path = os.path.join(data_folder, 'spk2utt.txt')
+    with open(path, encoding='utf-8') as file:
+        rows = [row.strip('\n').split(' ') for row in file if row.strip()]
+    rows = [
+        [row[0]] + [name for name in row[1:] if name.strip('_') in utterances]
+        for row in rows
+    ]
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(''.join(' '.join(row) + '\n' for row in rows if row[1:]))
+    # Remove the audio files of the discarded utterances.
+    wav_folder = os.path.join(data_folder, 'wavs')
+    for name in os.listdir(wav_folder):
+        if name[:-len('.wav')] not in utterances:
+            os.remove(os.path.join(wav_folder, name))
@@ -19,13 +19,18 @@
 
 """Wrapper to build corpus-specific data normalization functions."""
 
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import os
 import shutil
 
 import numpy as np
 
-from ac2art.corpora.prototype.utils import _get_normfile_path
-from ac2art.utils import import_from_string, CONSTANTS
+from ac2art.corpora.prototype.utils import (
+    _get_normfile_path, drop_cached_values, drop_packed_store,
+    load_norm_parameters
+)
+from ac2art.utils import check_positive_int, import_from_string, CONSTANTS
 
 
 def build_normalization_functions(corpus):
@@ -43,21 +48,37 @@ def build_normalization_functions(corpus):
     )
 
     # Wrap the normalization parameters computing function.
-    def compute_moments(file_type, by_speaker=False, store=True):
-        """Compute files moments."""
-        nonlocal speakers
-        # Optionally compute speaker-wise normalization parameters.
-        if by_speaker:
-            return {
-                speaker: _compute_moments(
-                    file_type, speaker, store, main_folder, get_utterances_list
-                )
-                for speaker in speakers
-            }
-        # Otherwise, compute corpus-wide parameters.
-        return _compute_moments(
-            file_type, None, store, main_folder, get_utterances_list
+    def compute_moments(file_type, by_speaker=False, store=True, n_jobs=1):
+        """Compute file-wise and global mean, deviation and spread of data.
+
+        The dataset must have been produced through extracting operations
+        on the initial .ema and .wav files of the {0} dataset.
+
+        file_type  : one of {{'ema', 'energy', 'lsf', 'lpc', 'mfcc'}}
+        by_speaker : whether to return speaker-wise normalization parameters
+                     instead of corpus-wide ones (bool, default False)
+        store      : whether to store the computed values (bool, default True)
+        n_jobs     : number of processes to use so as to read files and
+                     compute their moments in parallel (int, default 1)
+
+        Files are read one at a time, in a single pass over the corpus,
+        and their moments are merged into both speaker-wise and corpus-wide
+        ones, so that the dataset is never loaded as a whole. All of these
+        are stored, whatever the value of `by_speaker`.
+
+        Return a dict containing the computed values (or, if `by_speaker`
+        is True, a dict associating such dicts to speakers' names).
+        Optionally write them to dedicated .npy files.
+        """
+        nonlocal get_utterances_list, main_folder, speakers
+        check_positive_int(n_jobs, 'n_jobs')
+        moments = _compute_moments(
+            file_type, speakers, store, main_folder,
+            get_utterances_list, n_jobs
         )
+        if by_speaker:
+            return {speaker: moments[speaker] for speaker in speakers}
+        return moments[None]
 
     # Wrap the files normalization functon.
     def normalize_files(file_type, norm_type, scope='corpus'):
@@ -75,7 +96,14 @@ def build_normalization_functions(corpus):
                      for speaker-wise and 'file' for file-wise)
 
         Normalized utterances are stored as .npy files in a
-        properly-named folder.
+        properly-named folder. Doing so is optional: absent such
+        a folder, the `load` functions normalize the raw data on
+        the fly, which only requires `compute_moments` to be run
+        for corpus-wide or speaker-wise normalization.
+
+        Corpus-wide or speaker-wise parameters which were not computed
+        yet are computed beforehand, all at once, so that the data is
+        read in two passes at most, whatever the number of speakers.
         """
         nonlocal compute_moments, get_utterances_list, main_folder, speakers
         if scope == 'corpus':
@@ -99,56 +127,157 @@ def build_normalization_functions(corpus):
             )
 
     # Adjust the functions' docstrings and return them.
-    compute_moments.__doc__ = _compute_moments.__doc__.format(corpus)
+    compute_moments.__doc__ = compute_moments.__doc__.format(corpus)
     normalize_files.__doc__ = normalize_files.__doc__.format(corpus)
     return compute_moments, normalize_files
 
 
 def _compute_moments(
-        file_type, speaker, store, main_folder, get_utterances_list
+        file_type, speakers, store, main_folder, get_utterances_list, n_jobs=1
     ):
-    """Compute file-wise and global mean, deviation and spread of a dataset.
-
-    The dataset must have been produced through extracting operations
-    on the initial .ema and .wav files of the {0} dataset.
+    """Compute speaker-wise and corpus-wide moments of a dataset at once.
 
-    file_type  : one of {{'ema', 'energy', 'lsf', 'lpc', 'mfcc'}}
-    by_speaker : whether to compute speaker-wise normalization parameters
-                 instead of corpus-wide ones (bool, default False)
-    store      : whether to store the computed values (bool, default True)
-
-    Return a dict containing the computed values.
-    Optionally write it to a dedicated .npy file.
+    Return a dict associating the computed moments with speakers' names,
+    and with None for corpus-wide ones. Optionally write them to disk.
     """
+    # Arguments serve modularity; pylint: disable=too-many-arguments
     folder = os.path.join(main_folder, file_type)
-    # Compute file-wise means and standard deviations.
-    dataset = np.array([
-        np.load(os.path.join(folder, name + '_%s.npy' % file_type))
-        for name in get_utterances_list(speaker)
-    ])
-    moments = {
-        'file_means': np.array([data.mean(axis=0) for data in dataset]),
-        'file_stds': np.array([data.std(axis=0) for data in dataset]),
-        'file_spread': np.array([
-            data.max(axis=0) - data.min(axis=0) for data in dataset
-        ])
+    utterances = {
+        speaker: get_utterances_list(speaker) for speaker in speakers
     }
-    # Compute corpus-wide means, standard deviations and spread.
-    dataset = np.concatenate(dataset)
-    moments.update({
-        'global_means': dataset.mean(axis=0),
-        'global_stds': dataset.std(axis=0),
-        'global_spread': dataset.max(axis=0) - dataset.min(axis=0)
-    })
+    paths = [
+        os.path.join(folder, name + '_%s.npy' % file_type)
+        for speaker in speakers for name in utterances[speaker]
+    ]
+    # Compute file-wise moments, optionally using a pool of processes.
+    files_moments = _get_files_moments(paths, n_jobs)
+    # Derive speaker-wise and corpus-wide means, deviations and spreads.
+    moments = {None: _summarize_moments(files_moments)}
+    start = 0
+    for speaker in speakers:
+        end = start + len(utterances[speaker])
+        if speaker is not None:
+            moments[speaker] = _summarize_moments(files_moments[start:end])
+        start = end
     # Optionally store the computed values to disk.
     if store:
+        _store_moments(moments, main_folder, file_type)
+    # Return the dicts of computed values.
+    return moments
+
+
+def _get_files_moments(paths, n_jobs=1):
+    """Return the running moments of features files, in order.
+
+    If `n_jobs` is more than 1, files are read and their moments
+    computed in parallel, using a pool of processes.
+    """
+    if n_jobs == 1:
+        return [_get_file_moments(path) for path in paths]
+    chunksize = max(1, -(-len(paths) // (4 * n_jobs)))
+    with ProcessPoolExecutor(n_jobs) as executor:
+        return list(
+            executor.map(_get_file_moments, paths, chunksize=chunksize)
+        )
+
+
+def _store_moments(moments, main_folder, file_type):
+    """Write speaker-wise and corpus-wide moments to dedicated .npy files."""
+    for speaker, values in moments.items():
         path = _get_normfile_path(main_folder, file_type, speaker)
         folder = os.path.dirname(path)
         if not os.path.isdir(folder):
             os.makedirs(folder)
-        np.save(path, moments)
-    # Return the dict of computed values.
-    return moments
+        np.save(path, values)
+    drop_cached_values(main_folder)
+
+
+def _get_file_moments(path):
+    """Return the running moments of a features file's columns.
+
+    Return a dict containing the number of frames, and the column-wise
+    mean, sum of squared deviations to the mean, minimum and maximum,
+    as well as the data type of the file. Empty files' moments are NaN.
+    """
+    data = np.load(path)
+    if not data.size:
+        undefined = np.full(data.shape[1:], np.nan)
+        return {
+            'count': 0, 'means': undefined, 'sqdev': undefined,
+            'min': undefined, 'max': undefined, 'dtype': data.dtype
+        }
+    means = data.mean(axis=0, dtype=np.float64)
+    return {
+        'count': len(data), 'means': means,
+        'sqdev': np.square(data - means).sum(axis=0),
+        'min': data.min(axis=0), 'max': data.max(axis=0),
+        'dtype': data.dtype
+    }
+
+
+def _merge_moments(first, second):
+    """Merge the running moments of two sets of frames.
+
+    Means and sums of squared deviations are merged using the parallel
+    algorithm of Chan et al., so that the result is the same (within
+    float tolerance) as if moments were computed on the joint frames.
+    Moments of empty sets of frames are ignored.
+    """
+    if not first['count'] or not second['count']:
+        merged = dict(second if not first['count'] else first)
+        merged['dtype'] = np.result_type(first['dtype'], second['dtype'])
+        return merged
+    count = first['count'] + second['count']
+    delta = second['means'] - first['means']
+    return {
+        'count': count,
+        'means': first['means'] + delta * (second['count'] / count),
+        'sqdev': (
+            first['sqdev'] + second['sqdev']
+            + np.square(delta) * (first['count'] * second['count'] / count)
+        ),
+        'min': np.minimum(first['min'], second['min']),
+        'max': np.maximum(first['max'], second['max']),
+        'dtype': np.result_type(first['dtype'], second['dtype'])
+    }
+
+
+def _summarize_moments(files_moments):
+    """Derive normalization parameters from files' running moments.
+
+    files_moments : list of dict returned by `_get_file_moments`
+
+    Return a dict containing file-wise and global means, standard
+    deviations and spreads, recorded with the files' data type.
+    """
+    if not files_moments:
+        raise ValueError('No files to compute moments from.')
+    total = functools.reduce(_merge_moments, files_moments)
+    dtype = total['dtype']
+    return {
+        'file_means': np.array(
+            [moments['means'] for moments in files_moments], dtype=dtype
+        ),
+        'file_stds': np.array(
+            [_get_stds(moments) for moments in files_moments], dtype=dtype
+        ),
+        'file_spread': np.array(
+            [_get_spread(moments) for moments in files_moments], dtype=dtype
+        ),
+        'global_means': total['means'].astype(dtype),
+        'global_stds': _get_stds(total).astype(dtype),
+        'global_spread': _get_spread(total).astype(dtype)
+    }
+
+
+def _get_stds(moments):
+    """Return the standard deviations recorded by running moments."""
+    return np.sqrt(moments['sqdev'] / moments['count'])
+
+
+def _get_spread(moments):
+    """Return the spreads recorded by running moments."""
+    return moments['max'] - moments['min']
 
 
 def _conduct_normalization(
@@ -160,6 +289,8 @@ def _conduct_normalization(
     output_folder = os.path.join(main_folder, file_type + '_norm_' + norm_name)
     if not os.path.isdir(output_folder):
         os.makedirs(output_folder)
+    # Remove any packed copy of the folder, which is about to go stale.
+    drop_packed_store(main_folder, file_type + '_norm_' + norm_name)
     # Establish which files to work on.
     input_folder = os.path.join(main_folder, file_type)
     files = [
@@ -176,6 +307,7 @@ def _conduct_normalization(
             os.path.join(input_folder, 'articulators'),
             os.path.join(output_folder, 'articulators')
         )
+        drop_cached_values(main_folder)
 
 
 def _corpus_wide_normalize(
@@ -186,7 +318,7 @@ def _corpus_wide_normalize(
     # Gather files' moments. Compute them if needed.
     path = _get_normfile_path(main_folder, file_type, speaker)
     if os.path.isfile(path):
-        moments = np.load(path).tolist()
+        moments = load_norm_parameters(main_folder, file_type, speaker)
     elif speaker is None:
         moments = compute_moments(file_type, by_speaker=False)
     else:
@@ -194,7 +326,7 @@ def _corpus_wide_normalize(
     means = moments['global_means']
     norm = moments['global_%s' % norm_type]
     # Iteratively normalize the utterances.
-    normalize = lambda utterance: (utterance - means) / norm
+    normalize = functools.partial(_normalize_data, means=means, norm=norm)
     norm_name = norm_type + ('' if speaker is None else '_byspeaker')
     _conduct_normalization(
         file_type, norm_name, normalize, speaker,
@@ -207,15 +339,28 @@ def _file_wise_normalize(
     ):
     """Normalize a corpus using file-specific parameters."""
     # Define a file-wise normalization function.
-    if norm_type == 'stds':
-        get_norm = lambda utt: utt.std(axis=0)
-    elif norm_type == 'spread':
-        get_norm = lambda utt: (utt.max(axis=0) - utt.min(axis=0))
-    else:
+    if norm_type not in ('stds', 'spread'):
         raise KeyError("'norm_type' should be one of {'stds', 'spread'}.")
-    normalize = lambda utt: (utt - utt.mean(axis=0)) / get_norm(utt)
+    normalize = functools.partial(_normalize_file, norm_type=norm_type)
     # Conduct normalization using the previously defined function.
     norm_name = norm_type + '_byfile'
     _conduct_normalization(
         file_type, norm_name, normalize, None, main_folder, get_utterances_list
     )
+
+
+def _normalize_data(data, means, norm):
+    """Normalize data using pre-computed means and normalization divisors."""
+    return (data - means) / norm
+
+
+def _normalize_file(data, norm_type):
+    """Normalize a file's data using its own parameters.
+
+    norm_type : normalization divisor to use ('spread' or 'stds')
+    """
+    if norm_type == 'stds':
+        norm = data.std(axis=0)
+    else:
+        norm = data.max(axis=0) - data.min(axis=0)
+    return (data - data.mean(axis=0)) / norm
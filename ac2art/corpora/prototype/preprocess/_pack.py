@@ -0,0 +1,97 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Wrapper to build corpus-specific features packing functions."""
+
+import os
+
+from ac2art.corpora.prototype.utils import pack_features_folder
+from ac2art.utils import check_type_validity, import_from_string, CONSTANTS
+
+
+def build_packing_function(corpus):
+    """Define and return a corpus-specific features packing function.
+
+    Return a single function:
+      - pack_files
+    """
+    # Gather dataset-specific dependencies.
+    main_folder = CONSTANTS['%s_processed_folder' % corpus]
+    get_utterances_list = import_from_string(
+        'ac2art.corpora.%s.raw._loaders' % corpus, 'get_utterances_list'
+    )
+
+    def pack_files(folders):
+        """Pack pre-extracted {0} data into memory-mappable stores.
+
+        folders : name or list of names of the features folders to pack,
+                  e.g. 'ema', 'voicing' or 'mfcc_norm_stds' (str or list)
+
+        For each folder, the utterance-wise .npy files are gathered into
+        a single contiguous array, which is stored together with an index
+        of utterances under a 'packed/' subfolder of the processed data.
+
+        Once a folder is packed, the functions of the `{0}.load` submodule
+        transparently load data from the packed store, which is opened
+        once with memory mapping instead of opening one file per call.
+        Packed stores are removed when the files they copy are rewritten.
+
+        Utterances whose file is missing from a folder, e.g. due to
+        a failed extraction, are left out of its packed store. Return
+        a dict associating the names of the packed folders with the
+        lists of those skipped utterances.
+        """
+        nonlocal corpus, get_utterances_list, main_folder
+        check_type_validity(folders, (str, list), 'folders')
+        if isinstance(folders, str):
+            folders = [folders]
+        utterances = get_utterances_list()
+        skipped = {}
+        for folder in folders:
+            input_folder = os.path.join(main_folder, folder)
+            if not os.path.isdir(input_folder):
+                raise FileNotFoundError(
+                    "No '%s' folder of %s features to pack."
+                    % (folder, corpus)
+                )
+            # Establish which utterances' files are available.
+            file_type = folder.split('_norm_', 1)[0]
+            available = [
+                name for name in utterances
+                if _is_available(input_folder, name, file_type)
+            ]
+            skipped[folder] = sorted(set(utterances) - set(available))
+            if skipped[folder]:
+                print(
+                    "Skipped %s utterances missing from folder '%s': %s."
+                    % (len(skipped[folder]), folder, skipped[folder])
+                )
+            pack_features_folder(main_folder, folder, available)
+        return skipped
+
+    # Adjust the function's docstring and return it.
+    pack_files.__doc__ = pack_files.__doc__.format(corpus)
+    return pack_files
+
+
+def _is_available(folder, name, file_type):
+    """Return whether an utterance's features file exists in a folder."""
+    return os.path.isfile(
+        os.path.join(folder, name + '_%s.npy' % file_type)
+    )
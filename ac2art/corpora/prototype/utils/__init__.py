@@ -19,4 +19,12 @@
 
 """Set of utility functions for ac2art.corpora internal use."""
 
-from ._utils import _get_normfile_path, load_articulators_list, read_transcript
+from ._utils import _get_normfile_path, read_transcript
+from ._cache import (
+    drop_cached_values, get_articulators_index, load_articulators_list,
+    load_norm_parameters
+)
+from ._packed import (
+    PackedStore, drop_packed_store, get_packed_store, get_utterances_lengths,
+    pack_features_folder
+)
@@ -0,0 +1,133 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process cache of small, frequently-read corpus metadata files."""
+
+import os
+
+import numpy as np
+
+from ac2art.corpora.prototype.utils._utils import _get_normfile_path
+from ac2art.utils import CONSTANTS
+
+
+# Cached values, indexed by (path, *details); pylint: disable=invalid-name
+_cached_values = {}
+
+
+def _get_cached(key, build):
+    """Return the value cached under a given key, building it if needed."""
+    if key not in _cached_values:
+        _cached_values[key] = build()
+    return _cached_values[key]
+
+
+def drop_cached_values(main_folder):
+    """Drop all cached values derived from a corpus' processed data.
+
+    main_folder : path to the corpus' processed data folder (str)
+
+    This should be called whenever normalization parameters or
+    articulators lists are (re)written to disk.
+    """
+    main_folder = os.path.join(main_folder, '')
+    stale = [key for key in _cached_values if key[0].startswith(main_folder)]
+    for key in stale:
+        del _cached_values[key]
+
+
+def load_norm_parameters(main_folder, file_type, speaker=None):
+    """Return the normalization parameters of a type of features.
+
+    main_folder : path to the corpus' processed data folder (str)
+    file_type   : type of features whose parameters to return (str)
+    speaker     : optional speaker whose parameters to return (str)
+
+    The parameters file is read only once, and the dict it contains
+    is cached; a shallow copy of the latter is returned, whose arrays
+    are read-only, so that they may not be altered in place.
+    """
+    path = _get_normfile_path(main_folder, file_type, speaker)
+
+    def read_parameters():
+        """Read the parameters file, making its arrays read-only."""
+        parameters = np.load(path, allow_pickle=True).tolist()
+        for array in parameters.values():
+            array.flags.writeable = False
+        return parameters
+
+    return dict(_get_cached((path,), read_parameters))
+
+
+def _get_articulators_path(corpus, norm_type):
+    """Get the path to the articulators list of a corpus' EMA data.
+
+    If normalized EMA data was not written to disk (being normalized
+    on the fly when loaded), point to the raw EMA data's list instead.
+    """
+    main_folder = CONSTANTS['%s_processed_folder' % corpus]
+    if norm_type:
+        path = os.path.join(main_folder, 'ema_norm_' + norm_type)
+        if os.path.isdir(path):
+            return os.path.join(path, 'articulators')
+    return os.path.join(main_folder, 'ema', 'articulators')
+
+
+def load_articulators_list(corpus, norm_type=None):
+    """Load the list of articulators contained in a corpus's data."""
+    path = _get_articulators_path(corpus, norm_type)
+
+    def read_articulators():
+        """Read the articulators list file."""
+        with open(path, encoding='utf-8') as file:
+            return [row.strip('\n') for row in file]
+
+    return list(_get_cached((path,), read_articulators))
+
+
+def get_articulators_index(corpus, norm_type, articulators):
+    """Return the columns index of given articulators in EMA data.
+
+    corpus       : name of the corpus whose data to index (str)
+    norm_type    : type of normalization of the EMA data (str)
+    articulators : list of names of the articulators to select
+
+    Return a 1-D numpy.ndarray of int, which is computed only once
+    per (corpus, norm_type, articulators) combination.
+    """
+    path = _get_articulators_path(corpus, norm_type)
+
+    def build_index():
+        """Build the columns index of the selected articulators."""
+        articulators_list = load_articulators_list(corpus, norm_type)
+        invalid = [
+            name for name in articulators if name not in articulators_list
+        ]
+        if invalid:
+            raise KeyError(
+                'Invalid articulator(s): %s.\nValid articulators are %s.'
+                % (invalid, articulators_list)
+            )
+        index = np.array(
+            [articulators_list.index(name) for name in articulators]
+        )
+        index.flags.writeable = False
+        return index
+
+    return _get_cached((path, tuple(articulators)), build_index)
@@ -0,0 +1,186 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Packed, memory-mapped storage of a folder of utterance-wise features."""
+
+import os
+import shutil
+
+import numpy as np
+
+
+# Packed stores opened so far, indexed by path; pylint: disable=invalid-name
+_opened_stores = {}
+
+
+class PackedStore:
+    """Class giving access to a packed folder of utterance-wise features.
+
+    A packed store gathers the data of all utterances of a given
+    features folder (e.g. 'ema' or 'mfcc_norm_stds') into a single
+    contiguous 2-D array, recorded as a .npy file, together with
+    the list of utterances it contains and their lengths.
+
+    The data array is memory-mapped in read-only mode, so that
+    utterances' data is returned as zero-copy slices of it and
+    that the underlying pages are shared across processes.
+    """
+
+    def __init__(self, folder):
+        """Open the packed store recorded in a given folder.
+
+        folder : path to the folder containing the packed store (str)
+        """
+        self.folder = folder
+        self.data = np.load(os.path.join(folder, 'data.npy'), mmap_mode='r')
+        with open(os.path.join(folder, 'utterances.txt')) as file:
+            utterances = [row.strip('\n') for row in file]
+        lengths = np.load(os.path.join(folder, 'lengths.npy'))
+        ends = np.cumsum(lengths)
+        self.index = {
+            name: (int(end - length), int(end))
+            for name, length, end in zip(utterances, lengths, ends)
+        }
+
+    def __contains__(self, name):
+        """Return whether a given utterance is part of the store."""
+        return name in self.index
+
+    def __getitem__(self, name):
+        """Return a read-only view of a given utterance's data."""
+        start, end = self.index[name]
+        return self.data[start:end]
+
+    def __len__(self):
+        """Return the number of utterances in the store."""
+        return len(self.index)
+
+    def get_length(self, name):
+        """Return the number of frames of a given utterance's data."""
+        start, end = self.index[name]
+        return end - start
+
+
+def _get_packed_folder(main_folder, folder):
+    """Get the path to the packed version of a features folder."""
+    return os.path.join(main_folder, 'packed', folder)
+
+
+def get_packed_store(main_folder, folder):
+    """Return the packed store of a features folder, if any.
+
+    main_folder : path to the corpus' processed data folder (str)
+    folder      : name of the features folder, e.g. 'ema' (str)
+
+    Return a PackedStore instance, or None if the folder was not packed.
+    Opened stores are cached, so that the files are opened only once.
+    """
+    path = _get_packed_folder(main_folder, folder)
+    if path not in _opened_stores:
+        is_packed = os.path.isfile(os.path.join(path, 'data.npy'))
+        _opened_stores[path] = PackedStore(path) if is_packed else None
+    return _opened_stores[path]
+
+
+def drop_packed_store(main_folder, folder):
+    """Remove the packed version of a features folder, if any.
+
+    This should be called whenever the contents of the folder
+    are altered, so that the packed copy does not go stale.
+    """
+    path = _get_packed_folder(main_folder, folder)
+    _opened_stores.pop(path, None)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def get_utterances_lengths(main_folder, folder, utterances):
+    """Return the number of frames of utterances from a features folder.
+
+    main_folder : path to the corpus' processed data folder (str)
+    folder      : name of the features folder, e.g. 'ema' (str)
+    utterances  : list of names of the utterances whose lengths to return
+
+    Lengths are read from the folder's packed store if any, and from
+    the headers of the utterances' .npy files otherwise, so that no
+    actual data is loaded.
+
+    Return a 1-D numpy array of int.
+    """
+    store = get_packed_store(main_folder, folder)
+    file_type = folder.split('_norm_', 1)[0]
+    lengths = []
+    for name in utterances:
+        if store is not None and name in store:
+            lengths.append(store.get_length(name))
+        else:
+            path = os.path.join(
+                main_folder, folder, name + '_%s.npy' % file_type
+            )
+            lengths.append(np.load(path, mmap_mode='r').shape[0])
+    return np.array(lengths, dtype=np.int64)
+
+
+def pack_features_folder(main_folder, folder, utterances):
+    """Pack the utterance-wise .npy files of a features folder.
+
+    main_folder : path to the corpus' processed data folder (str)
+    folder      : name of the features folder to pack, e.g. 'ema' (str)
+    utterances  : list of names of the utterances to pack
+
+    The data is written to a 'packed/`folder`' subfolder of `main_folder`,
+    which is filled iteratively so as not to load all files at once.
+    """
+    if not utterances:
+        raise ValueError("No utterances to pack for folder '%s'." % folder)
+    file_type = folder.split('_norm_', 1)[0]
+    input_folder = os.path.join(main_folder, folder)
+    paths = [
+        os.path.join(input_folder, name + '_%s.npy' % file_type)
+        for name in utterances
+    ]
+    # Gather the files' shapes and data type without reading their data.
+    shapes = [np.load(path, mmap_mode='r').shape for path in paths]
+    if any(len(shape) != 2 for shape in shapes):
+        raise ValueError("Only 2-D arrays of features may be packed.")
+    if len(set(shape[1] for shape in shapes)) > 1:
+        raise ValueError(
+            "Files of folder '%s' do not share a same width." % folder
+        )
+    dtype = np.load(paths[0], mmap_mode='r').dtype
+    # Set up the output folder and a memory-mapped output array.
+    drop_packed_store(main_folder, folder)
+    output_folder = _get_packed_folder(main_folder, folder)
+    os.makedirs(output_folder)
+    lengths = np.array([shape[0] for shape in shapes], dtype=np.int64)
+    packed = np.lib.format.open_memmap(
+        os.path.join(output_folder, 'data.npy'), mode='w+', dtype=dtype,
+        shape=(int(lengths.sum()), shapes[0][1])
+    )
+    # Iteratively fill the packed array.
+    start = 0
+    for path, length in zip(paths, lengths):
+        packed[start:start + length] = np.load(path)
+        start += length
+    packed.flush()
+    del packed
+    # Record the utterances' names and lengths.
+    np.save(os.path.join(output_folder, 'lengths.npy'), lengths)
+    with open(os.path.join(output_folder, 'utterances.txt'), 'w') as file:
+        file.write('\n'.join(utterances))
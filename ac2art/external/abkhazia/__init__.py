@@ -34,6 +34,10 @@ of abkhazia was 0.3, and the latest commit to the git repository
 was that of SHA 0d622c7c93d4fc55f79211f1b0ab9bfe06c4ebf1.
 """
 
+from ._ark import (
+    build_ark_writer, read_ark_object, read_binary_ark, read_scp,
+    write_ark_matrix
+)
 from ._files import ark_to_npy, copy_feats, read_ark_file, update_scp
 from ._features import compute_mfcc
 from ._prepare import prepare_abkhazia_corpus
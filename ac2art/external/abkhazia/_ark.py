@@ -0,0 +1,265 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Set of functions to read and write binary Kaldi ark and scp files.
+
+This module implements the subset of Kaldi's binary archives format
+used to store features, so that these may be read from and written to
+without calling Kaldi binaries nor going through text conversions.
+
+Supported objects are float and double matrices ('FM', 'DM') and
+vectors ('FV', 'DV'), as well as compressed matrices, in any of the
+three formats produced by Kaldi ('CM', 'CM2', 'CM3'), which are read
+but not written.
+"""
+
+import contextlib
+import os
+
+import numpy as np
+
+
+# Matrix and vector tokens, associated with their data type.
+FULL_TYPES = {
+    'FM': np.dtype('<f4'), 'DM': np.dtype('<f8'),
+    'FV': np.dtype('<f4'), 'DV': np.dtype('<f8')
+}
+
+# Global header of compressed matrices: min value, range, rows and columns.
+COMPRESSED_HEADER = np.dtype(
+    [('min', '<f4'), ('range', '<f4'), ('rows', '<i4'), ('cols', '<i4')]
+)
+
+
+def read_binary_ark(filename):
+    """Yield the contents of a binary ark file.
+
+    Yield tuples consisting, for each utterance, of
+    its name (str) and its values (numpy.ndarray).
+    """
+    with open(filename, 'rb') as ark_file:
+        while True:
+            utterance = _read_key(ark_file)
+            if utterance is None:
+                break
+            yield utterance, read_ark_object(ark_file)
+
+
+def read_scp(filename):
+    """Yield the contents of binary ark files indexed by a scp file.
+
+    Yield tuples consisting, for each utterance, of
+    its name (str) and its values (numpy.ndarray).
+
+    Each record is read directly from the indexed position in its ark
+    file; ark files are opened once and kept open while being read.
+    """
+    opened = {}
+    with contextlib.ExitStack() as stack:
+        scp_file = stack.enter_context(open(filename, encoding='utf-8'))
+        for row in scp_file:
+            row = row.strip()
+            if not row:
+                continue
+            utterance, path = row.split(' ', 1)
+            path, offset = _parse_scp_path(path)
+            if path not in opened:
+                opened[path] = stack.enter_context(open(path, 'rb'))
+            opened[path].seek(offset)
+            yield utterance.strip('_'), read_ark_object(opened[path])
+
+
+def _parse_scp_path(path):
+    """Return the path to an ark file and offset of a scp entry."""
+    if path.endswith(']'):
+        raise ValueError("Unsupported scp entry with range: '%s'." % path)
+    if ':' in path:
+        path, offset = path.rsplit(':', 1)
+        if offset.isdigit():
+            return path, int(offset)
+        path += ':' + offset
+    return path, 0
+
+
+def _read_key(stream):
+    """Read the key of the next ark record, or None at end of file."""
+    key = bytearray()
+    while True:
+        char = stream.read(1)
+        if not char:
+            if key.strip():
+                raise ValueError('Unexpected end of ark file.')
+            return None
+        if char == b' ':
+            if key.strip():
+                return key.decode('utf-8').strip().strip('_')
+        else:
+            key += char
+
+
+def read_ark_object(stream):
+    """Read a binary matrix or vector from an ark file's stream.
+
+    stream : binary stream, positioned at the start of the object
+             (i.e. on the binary mode marker following its key)
+
+    Return a numpy.ndarray of float (1-D for vectors, 2-D for matrices).
+    """
+    if stream.read(2) != b'\0B':
+        raise ValueError('Only binary-mode ark records are supported.')
+    token = _read_token(stream)
+    if token in FULL_TYPES:
+        dtype = FULL_TYPES[token]
+        if token.endswith('V'):
+            return _read_array(stream, dtype, (_read_int(stream),))
+        n_rows = _read_int(stream)
+        n_cols = _read_int(stream)
+        return _read_array(stream, dtype, (n_rows, n_cols))
+    if token in ('CM', 'CM2', 'CM3'):
+        return _read_compressed_matrix(stream, token)
+    raise ValueError("Unsupported ark object type: '%s'." % token)
+
+
+def _read_token(stream):
+    """Read a space-terminated token from a binary stream."""
+    token = bytearray()
+    char = stream.read(1)
+    while char not in (b' ', b''):
+        token += char
+        char = stream.read(1)
+    return token.decode('utf-8')
+
+
+def _read_int(stream):
+    """Read a size-prefixed int32 from a binary stream."""
+    size = stream.read(1)
+    if size != b'\x04':
+        raise ValueError('Expected a 4-bytes integer in ark file.')
+    return int(_read_array(stream, np.dtype('<i4'), (1,))[0])
+
+
+def _read_array(stream, dtype, shape):
+    """Read an array of given type and shape from a binary stream."""
+    array = np.empty(shape, dtype=dtype)
+    n_bytes = stream.readinto(memoryview(array).cast('B'))
+    if n_bytes != array.nbytes:
+        raise ValueError('Unexpected end of ark file.')
+    return array
+
+
+def _read_compressed_header(stream):
+    """Read a Kaldi compressed matrix's global header from a binary stream.
+
+    Return the number of rows and columns of the matrix, as well as
+    the minimum value and range of values used in its quantization.
+    """
+    header = _read_array(stream, COMPRESSED_HEADER, (1,))[0]
+    return (
+        int(header['rows']), int(header['cols']),
+        header['min'], header['range']
+    )
+
+
+def _read_compressed_matrix(stream, token):
+    """Read and decompress a Kaldi compressed matrix from a binary stream.
+
+    The compressed matrix's global header (min value, range, number
+    of rows and columns) is expected to follow the 'CM', 'CM2' or
+    'CM3' token that is passed.
+    """
+    n_rows, n_cols, min_value, value_range = _read_compressed_header(stream)
+    # Two-bytes and one-byte formats: linear quantization of all values.
+    if token in ('CM2', 'CM3'):
+        dtype, scale = (
+            (np.dtype('<u2'), 65535.) if token == 'CM2'
+            else (np.dtype('u1'), 255.)
+        )
+        data = _read_array(stream, dtype, (n_rows, n_cols))
+        return (min_value + data * (value_range / scale)).astype(np.float32)
+    # Column-wise headers format: piecewise-linear quantization of values,
+    # based on column-wise percentiles, with data stored column by column.
+    percentiles = _read_array(stream, np.dtype('<u2'), (n_cols, 4))
+    percentiles = min_value + percentiles * (value_range / 65535.)
+    data = _read_array(stream, np.dtype('u1'), (n_cols, n_rows)).T
+    data = data.astype(np.float64)
+    p_0, p_25, p_75, p_100 = (percentiles[:, i] for i in range(4))
+    matrix = np.where(
+        data <= 64, p_0 + (p_25 - p_0) * data / 64.,
+        np.where(
+            data <= 192, p_25 + (p_75 - p_25) * (data - 64) / 128.,
+            p_75 + (p_100 - p_75) * (data - 192) / 63.
+        )
+    )
+    return matrix.astype(np.float32)
+
+
+def write_ark_matrix(stream, utterance, array):
+    """Write a matrix to a binary ark file's stream.
+
+    stream    : binary stream to which to write the record
+    utterance : name of the utterance the data relates to (str)
+    array     : 2-D numpy.ndarray of values to write; double precision
+                arrays are recorded as such, other ones as float
+
+    Return the offset of the written object in the stream, which is
+    the one recorded in scp files indexing it.
+    """
+    array = np.asarray(array)
+    if array.ndim != 2:
+        raise ValueError('Only 2-D arrays may be written to ark files.')
+    token, dtype = (
+        (b'DM ', '<f8') if array.dtype == np.float64 else (b'FM ', '<f4')
+    )
+    stream.write(utterance.encode('utf-8') + b' ')
+    offset = stream.tell()
+    stream.write(b'\0B' + token)
+    for size in array.shape:
+        stream.write(b'\x04' + np.int32(size).astype('<i4').tobytes())
+    stream.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+    return offset
+
+
+def build_ark_writer(filename):
+    """Set up and return a records storage function to binary ark file(s).
+
+    filename : path to the .ark or .scp file to write; .scp files are
+               doubled with a .ark one, whose records they index
+
+    The returned function takes an utterance's name and its data
+    (2-D numpy.ndarray) as arguments, and appends them to the file(s).
+    """
+    extension = filename.rsplit('.', 1)[-1]
+    if extension not in ('ark', 'scp'):
+        raise TypeError("'%s' is not an ark or scp file." % filename)
+    ark_path = os.path.abspath(filename[:-3] + 'ark')
+    scp_path = filename if extension == 'scp' else None
+    for path in (ark_path, scp_path):
+        if path is not None and os.path.isfile(path):
+            raise FileExistsError("File '%s' already exists." % path)
+
+    def write_record(utterance, array):
+        """Append an utterance's data to the ark (and scp) file."""
+        nonlocal ark_path, scp_path
+        with open(ark_path, 'ab') as ark_file:
+            offset = write_ark_matrix(ark_file, utterance, array)
+        if scp_path is not None:
+            with open(scp_path, 'a', encoding='utf-8') as scp_file:
+                scp_file.write('%s %s:%s\n' % (utterance, ark_path, offset))
+
+    return write_record
@@ -23,6 +23,7 @@ import os
 
 import numpy as np
 
+from ac2art.external.abkhazia._ark import read_binary_ark, read_scp
 from ac2art.utils import check_type_validity, CONSTANTS
 
 
@@ -126,24 +127,29 @@ def read_ark_file(filename):
     Yield tuples consisting, for each utterance, of
     its name (str) and its values (numpy.ndarray).
 
-    When given an ark or scp file as input, a temporary
-    txt copy is first created, and later removed.
+    Binary ark files, and those indexed by scp files, are read
+    natively, without requiring Kaldi nor any text conversion.
+    Text-mode ark files (e.g. written by Kaldi using 'ark,t:')
+    are parsed as ark-like txt files.
     """
     extension = filename.rsplit('.', 1)[1]
-    if extension not in ('ark', 'scp', 'txt'):
-        raise TypeError("'%s' is not an ark, scp or txt file." % filename)
-    # Copy the records to a txt file, if relevant.
-    convert = (extension != 'txt')
-    if convert:
-        txt_filename = filename[:-3] + 'txt'
-        copy_feats(filename, txt_filename)
-        filename = txt_filename
-    # Read and yield records from the txt file.
-    for record in _read_txt_ark_file(filename):
-        yield record
-    # Remove the temporary txt file, if any.
-    if convert:
-        os.remove(filename)
+    if extension == 'ark':
+        if _is_binary_ark(filename):
+            return read_binary_ark(filename)
+        return _read_txt_ark_file(filename)
+    if extension == 'scp':
+        return read_scp(filename)
+    if extension == 'txt':
+        return _read_txt_ark_file(filename)
+    raise TypeError("'%s' is not an ark, scp or txt file." % filename)
+
+
+def _is_binary_ark(filename):
+    """Return whether an ark file's first record is in binary mode."""
+    with open(filename, 'rb') as ark_file:
+        head = ark_file.read(4096)
+    key_end = head.find(b' ')
+    return key_end != -1 and head[key_end + 1:key_end + 3] == b'\0B'
 
 
 def _read_txt_ark_file(filename):
@@ -151,18 +157,34 @@ def _read_txt_ark_file(filename):
 
     Yield tuples consisting, for each utterance, of
     its name (str) and its values (numpy.ndarray).
+
+    Rows are only scanned so as to delimit each utterance's matrix,
+    whose text is then converted at once to a numpy array. Utterances
+    are read one at a time, so that memory use remains bounded.
     """
     with open(filename) as ark_file:
         utterance = None
-        array = []
+        rows = []
         for row in ark_file:
-            row = row.strip(' \n')
-            if row.endswith('['):
-                utterance = row.split(' ', 1)[0].strip('_')
-            elif row.endswith(']'):
-                row = row.strip(' ]')
-                array.append([float(value) for value in row.split(' ')])
-                yield (utterance, np.array(array))
-                array = []
-            else:
-                array.append([float(value) for value in row.split(' ')])
+            # Look for the start of the next utterance's matrix.
+            if utterance is None:
+                row = row.strip(' \n')
+                if row.endswith('['):
+                    utterance = row.split(' ', 1)[0].strip('_')
+                continue
+            # Gather the matrix's rows until its end is met.
+            rows.append(row)
+            if ']' not in row:
+                continue
+            # Convert the matrix's rows to an array and yield it.
+            n_cols = len(rows[0].replace(']', ' ').split())
+            text = ''.join(rows).replace(']', ' ')
+            values = np.array(text.split(), dtype=float)
+            if not n_cols or values.size != n_cols * len(rows):
+                raise ValueError(
+                    "Invalid matrix for utterance '%s' in file '%s'."
+                    % (utterance, filename)
+                )
+            yield (utterance, values.reshape(len(rows), n_cols))
+            utterance = None
+            rows = []
@@ -21,4 +21,5 @@
 
 from ._dataloader import AbstractDataLoader
 from ._esttrack import EstTrack
+from ._sphere import SphereFile
 from ._wav import Wav
@@ -19,9 +19,8 @@
 
 """Abstract class defining an API for data-loading classes.
 
-Note: as of the last restructuration of this package, this
-      class is only inherited from by a single class; it
-      may however be useful to handle additional corpora,
+Note: this class is inherited from by the EstTrack and SphereFile
+      classes; it may also be useful to handle additional corpora,
       such as the Usc Timit one.
 """
 
@@ -19,6 +19,7 @@
 
 """Class to handle EST Track files from the Mocha-Timit and mngu0 corpora."""
 
+import os
 
 import numpy as np
 
@@ -31,39 +32,67 @@ class EstTrack(AbstractDataLoader):
     EST Track files include .ema and .lsf files, respectively recording
     EMA articulatory data and pre-processed LSF representations of acoustic
     data.
+
+    Binary files' data may be memory-mapped rather than read at once,
+    in which case the `data` and `time_index` attributes are read-only
+    strided views of the mapped file. The `info` class method may be
+    used to access the files' metadata without reading their data.
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, mmap_mode=None):
         """Initialize the EstTrack instance.
 
-        filename : path to the Est Track file (str)
+        filename  : path to the Est Track file (str)
+        mmap_mode : optional mode in which to memory-map the data of
+                    binary files instead of reading it (only 'r' is
+                    supported; default None, implying no mapping)
         """
+        if mmap_mode not in (None, 'r'):
+            raise ValueError("`mmap_mode` should be either None or 'r'.")
         self.name = None
+        self.mmap_mode = mmap_mode
         super().__init__(filename)
 
+    @classmethod
+    def info(cls, filename):
+        """Return the metadata of an Est Track file, read from its header.
+
+        filename : path to the Est Track file (str)
+
+        Return a dict with keys 'n_frames', 'n_columns', 'column_names',
+        'name', 'storage_type' and 'byte_order'. No data is read.
+        """
+        with open(filename, 'rb') as infile:
+            return _read_header(infile, filename)
+
     def load(self):
         """Load the Est Track data from file."""
         # Read and parse the file.
         with open(self.filename, 'rb') as infile:
-            # Check file validity.
-            if next(infile).decode('latin-1').strip('\n') != 'EST_File Track':
-                raise ValueError(
-                    "'%s' is not an EST Track file." % self.filename
-                )
-            # Parse the file's header for meta-information.
-            n_frames, n_columns, storage_type, byte_order = (
-                self._parse_header(infile)
-            )
+            # Check file validity and parse its header for meta-information.
+            header = _read_header(infile, self.filename)
+            self.name = header['name']
+            self.column_names = header['column_names']
+            n_frames, n_columns = header['n_frames'], header['n_columns']
+            storage_type = header['storage_type']
+            dtype = np.dtype(header['byte_order'] + 'f')
             # Load the actual data.
             if storage_type == 'binary':
-                data = np.fromfile(infile, np.dtype(byte_order + 'f'))
                 expected_shape = (n_frames * (n_columns + 2),)
-                if data.shape != expected_shape:
+                size = os.fstat(infile.fileno()).st_size - infile.tell()
+                if size != expected_shape[0] * dtype.itemsize:
                     raise ValueError(
                         'Dimension error: expected %s values, got %s.'
-                        % (expected_shape, data.shape)
+                        % (expected_shape, (size // dtype.itemsize,))
+                    )
+                if self.mmap_mode is None:
+                    data = np.fromfile(infile, dtype)
+                    data = data.reshape(n_frames, n_columns + 2)
+                else:
+                    data = np.memmap(
+                        self.filename, dtype, mode=self.mmap_mode,
+                        offset=infile.tell(), shape=(n_frames, n_columns + 2)
                     )
-                data = data.reshape(n_frames, n_columns + 2)
             elif storage_type == 'ascii':
                 data = np.genfromtxt(infile)
             else:
@@ -74,31 +103,40 @@ class EstTrack(AbstractDataLoader):
         self.time_index = data[:, 0]
         self.data = data[:, 2:]
 
-    def _parse_header(self, infile):
-        """Read the Est Track file's header and parse information out of it.
 
-        infile : an open stream to the file, read in binary mode.
+def _read_header(infile, filename):
+    """Read an Est Track file's header and parse information out of it.
 
-        Return the number of data frames (int) and columns (int), and
-        strings indicating the data storage type and its byte order.
-        """
-        storage_type = 'binary'
-        byte_order = 'l'
-        for line in infile:
-            line = line.decode('latin-1').strip('\n')
-            if line == 'EST_Header_End':
-                break
-            elif line.startswith('DataType'):
-                storage_type = line.rsplit(' ', 1)[1]
-            elif line.startswith('ByteOrder'):
-                byte_order = {'01': '<', '10': '>'}[line[-2:]]
-            elif line.startswith('NumFrames'):
-                n_frames = int(line.rsplit(' ', 1)[-1])
-            elif line.startswith('NumChannels'):
-                n_columns = int(line.rsplit(' ', 1)[-1])
-            elif line.startswith('Channel_'):
-                col_id, col_name = line.split(' ', 1)
-                self.column_names[int(col_id.split('_', 1)[-1])] = col_name
-            elif line.startswith('name'):
-                self.name = line.rsplit(' ', 1)[-1]
-        return n_frames, n_columns, storage_type, byte_order
+    infile   : an open stream to the file, read in binary mode,
+               positioned at the start of the file
+    filename : path to the file, used in error messages
+
+    Return a dict of metadata, leaving `infile` positioned
+    at the start of the data.
+    """
+    # Check file validity.
+    if infile.readline().decode('latin-1').strip('\n') != 'EST_File Track':
+        raise ValueError("'%s' is not an EST Track file." % filename)
+    # Parse the file's header.
+    header = {
+        'name': None, 'column_names': {},
+        'storage_type': 'binary', 'byte_order': '<'
+    }
+    for line in iter(infile.readline, b''):
+        line = line.decode('latin-1').strip('\n')
+        if line == 'EST_Header_End':
+            break
+        elif line.startswith('DataType'):
+            header['storage_type'] = line.rsplit(' ', 1)[1]
+        elif line.startswith('ByteOrder'):
+            header['byte_order'] = {'01': '<', '10': '>'}[line[-2:]]
+        elif line.startswith('NumFrames'):
+            header['n_frames'] = int(line.rsplit(' ', 1)[-1])
+        elif line.startswith('NumChannels'):
+            header['n_columns'] = int(line.rsplit(' ', 1)[-1])
+        elif line.startswith('Channel_'):
+            col_id, col_name = line.split(' ', 1)
+            header['column_names'][int(col_id.split('_', 1)[-1])] = col_name
+        elif line.startswith('name'):
+            header['name'] = line.rsplit(' ', 1)[-1]
+    return header
@@ -0,0 +1,123 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Class to handle NIST SPHERE audio files from the Mocha-Timit corpus."""
+
+import numpy as np
+import scipy.io.wavfile
+
+from ac2art.internal.data_loaders import AbstractDataLoader
+
+
+class SphereFile(AbstractDataLoader):
+    """Class to load data from NIST SPHERE audio files.
+
+    SPHERE files consist of an ASCII header, listing typed fields
+    such as the sampling rate and samples' encoding, followed by
+    the (interleaved) samples of each of the recorded channels.
+
+    Only uncompressed PCM-encoded files are supported. Their samples
+    are read directly from file into the instance's `data` attribute,
+    without any intermediate conversion to another file format.
+    """
+
+    def __init__(self, filename):
+        """Initialize the SphereFile instance.
+
+        filename : path to the SPHERE file (str)
+        """
+        self.header = {}
+        super().__init__(filename)
+
+    @property
+    def sampling_rate(self):
+        """Return the sampling rate of the audio, in Hz."""
+        return self.header['sample_rate']
+
+    def load(self):
+        """Load the SPHERE file's header and samples."""
+        with open(self.filename, 'rb') as infile:
+            # Check file validity and parse the header.
+            if infile.readline().strip() != b'NIST_1A':
+                raise ValueError(
+                    "'%s' is not a NIST SPHERE file." % self.filename
+                )
+            header_size = int(infile.readline().strip())
+            self._parse_header(infile)
+            dtype = self._get_samples_dtype()
+            # Load the samples.
+            infile.seek(header_size)
+            n_channels = self.header.get('channel_count', 1)
+            count = self.header.get('sample_count', -1)
+            if count != -1:
+                count *= n_channels
+            data = np.fromfile(infile, dtype, count)
+        # Assign the loaded data to the instance's attributes.
+        self.data = data.reshape(-1, n_channels)
+        self.column_names = {
+            i: 'channel_%s' % i for i in range(n_channels)
+        }
+        self.time_index = np.arange(len(self.data)) / self.sampling_rate
+
+    def _parse_header(self, infile):
+        """Read the SPHERE file's header fields.
+
+        infile : an open stream to the file, read in binary mode
+                 and positioned after the header's second line
+        """
+        types = {'-i': int, '-r': float}
+        for line in infile:
+            line = line.decode('latin-1').strip('\n')
+            if line.strip() == 'end_head':
+                break
+            if not line.strip() or line.startswith(';'):
+                continue
+            key, field_type, value = line.split(' ', 2)
+            self.header[key] = types.get(field_type, str)(value)
+
+    def _get_samples_dtype(self):
+        """Return the numpy dtype of the file's samples."""
+        coding = self.header.get('sample_coding', 'pcm')
+        if coding != 'pcm':
+            raise ValueError(
+                "Unsupported SPHERE sample coding: '%s'." % coding
+            )
+        n_bytes = self.header.get('sample_n_bytes', 2)
+        byte_format = self.header.get('sample_byte_format', '01')
+        if n_bytes == 1:
+            return np.dtype('i1')
+        byte_order = {'01': '<', '10': '>'}.get(byte_format[:2])
+        if byte_order is None or n_bytes not in (2, 4):
+            raise ValueError(
+                "Unsupported SPHERE sample format: %s bytes, '%s' order."
+                % (n_bytes, byte_format)
+            )
+        return np.dtype('%si%s' % (byte_order, n_bytes))
+
+    def get_signal(self):
+        """Return the audio signal, as mono float32 values in [-1, 1]."""
+        scale = 1. / (1 << (8 * self.data.dtype.itemsize - 1))
+        return (self.data.mean(axis=1) * scale).astype(np.float32)
+
+    def write_wav(self, path):
+        """Write the audio data to a PCM .wav file at a given path."""
+        data = self.data[:, 0] if self.data.shape[1] == 1 else self.data
+        scipy.io.wavfile.write(
+            path, self.sampling_rate, data.astype(data.dtype.newbyteorder('='))
+        )
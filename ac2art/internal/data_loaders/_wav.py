@@ -19,22 +19,25 @@
 
 """Set of tools to handle acoustic waveform data."""
 
+import functools
 import os
 
 import numpy as np
-import scipy.linalg
-import scipy.signal
 import librosa
 
-from ac2art.internal.data_utils import add_dynamic_features
+from ac2art.internal.data_loaders import SphereFile
+from ac2art.internal.data_utils import add_dynamic_features, resample_signal
 from ac2art.utils import check_type_validity
 
 
 class Wav:
     """Class to load and transform acoustic data from .wav files.
 
-    This class loads data from a .wav file and build frames of samples
-    out of it at initialisation.
+    This class loads data from a .wav file at initialisation. Frames of
+    samples, the power spectrogram and the root mean square energy of
+    the signal are then computed lazily, and cached so as to be shared
+    by the various features-producing methods. This cache may be freed
+    using the 'clear_cache' method.
 
     It may then produce the following representations of the audio, by frame:
       - MFCC (Mel Frequency Cepstral Coefficients), using 'get_mffc'.
@@ -44,25 +47,80 @@ class Wav:
     """
 
     def __init__(
-            self, filename, sampling_rate=16000, frame_time=25, hop_time=10
+            self, filename, sampling_rate=16000, frame_time=25, hop_time=10,
+            resampling='kaiser_best'
         ):
         """Load the .wav data and reframe it.
 
-        filename    : path to the .wav audio file.
-        sample_rate : sampling rate of the signal, in Hz; resampling
-                      will be used if needed (int, default 16000)
-        frame_time  : frames duration, in milliseconds (int, default 25)
-        hop_time    : number of milliseconds between each frame's
-                      start time (int, default 10)
+        filename      : path to the .wav (or NIST SPHERE) audio file
+        sampling_rate : sampling rate of the signal, in Hz; resampling
+                        will be used if needed, unless set to None
+                        (int, default 16000)
+        frame_time    : frames duration, in milliseconds (int, default 25)
+        hop_time      : number of milliseconds between each frame's
+                        start time (int, default 10)
+        resampling    : resampling method, either 'polyphase' or a
+                        `librosa.resample` res_type (str, default
+                        'kaiser_best')
+
+        Decoded (and resampled) signals are cached, so that loading
+        the same file with the same sampling rate and resampling
+        method again does not require decoding it again.
         """
         check_type_validity(filename, str, 'filename')
         self.filename = os.path.abspath(filename)
-        data, sampling_rate = librosa.load(self.filename, sr=sampling_rate)
-        self.signal = data
+        self._cache = {}
+        signal, sampling_rate = _load_audio(
+            self.filename, os.path.getmtime(self.filename),
+            sampling_rate, resampling
+        )
+        self._set_signal(signal, sampling_rate, frame_time, hop_time)
+
+    @classmethod
+    def from_array(
+            cls, signal, sampling_rate, frame_time=25, hop_time=10,
+            target_rate=None, resampling='kaiser_best'
+        ):
+        """Instantiate from an array of audio samples.
+
+        signal        : 1-D numpy.ndarray of float audio samples
+        sampling_rate : sampling rate of the signal, in Hz (int)
+        frame_time    : frames duration, in milliseconds (int, default 25)
+        hop_time      : number of milliseconds between each frame's
+                        start time (int, default 10)
+        target_rate   : optional sampling rate to which to resample
+                        the signal, in Hz (int, default None)
+        resampling    : resampling method, either 'polyphase' or a
+                        `librosa.resample` res_type (str, default
+                        'kaiser_best')
+        """
+        # Arguments mirror those of __init__; pylint: disable=too-many-arguments
+        check_type_validity(signal, np.ndarray, 'signal')
+        if signal.ndim != 1:
+            raise ValueError('`signal` should be a 1-D np.array.')
+        if target_rate is not None:
+            signal = resample_audio(
+                signal, sampling_rate, target_rate, resampling
+            )
+            sampling_rate = target_rate
+        wav = cls.__new__(cls)
+        wav.filename = None
+        wav._cache = {}
+        wav._set_signal(signal, sampling_rate, frame_time, hop_time)
+        return wav
+
+    def _set_signal(self, signal, sampling_rate, frame_time, hop_time):
+        """Assign the audio signal and frames' settings to the instance."""
+        self.signal = signal
         self.sampling_rate = sampling_rate
         self.frame_length = int((frame_time * sampling_rate) / 1000)
         self.hop_length = int((hop_time * sampling_rate) / 1000)
 
+    @staticmethod
+    def clear_audio_cache():
+        """Drop all cached decoded audio signals."""
+        _load_audio.cache_clear()
+
     def __len__(self):
         """Return the number of samples."""
         return len(self.signal)
@@ -72,6 +130,39 @@ class Wav:
         """Return the waveform's duration in seconds."""
         return len(self) / self.sampling_rate
 
+    def _get_cached(self, name, compute):
+        """Return a cached representation, computing it if needed."""
+        if name not in self._cache:
+            value = compute()
+            value.setflags(write=False)
+            self._cache[name] = value
+        return self._cache[name]
+
+    def clear_cache(self):
+        """Drop the cached frames, spectrogram and energy of the signal."""
+        self._cache = {}
+
+    @property
+    def frames(self):
+        """Return the (read-only) frames of samples, with one frame per row."""
+        return self._get_cached('frames', lambda: librosa.util.frame(
+            self.signal, self.frame_length, self.hop_length
+        ).T)
+
+    @property
+    def power_spectrum(self):
+        """Return the (read-only) power spectrogram, with one frame per row.
+
+        The spectrogram is computed using a short-time Fourier transform,
+        with windows spanning the frames' length, centered on the frames.
+        """
+        return self._get_cached('power_spectrum', lambda: np.square(np.abs(
+            librosa.stft(
+                self.signal, n_fft=self.frame_length,
+                hop_length=self.hop_length
+            )
+        )).T)
+
     def get(self, features, n_coeff, static_only):
         """Wrap the call to any features-producing method.
 
@@ -98,10 +189,13 @@ class Wav:
         which it adapts so as to pass some specific options when building
         the initial spectrogram.
         """
-        # Compute MFCC coefficients.
+        # Compute MFCC coefficients, based on the cached power spectrogram.
+        mel_basis = librosa.filters.mel(
+            sr=self.sampling_rate, n_fft=self.frame_length
+        )
+        mel_spectrum = np.dot(mel_basis, self.power_spectrum.T)
         mfcc = librosa.feature.mfcc(
-            self.signal, sr=self.sampling_rate, n_mfcc=n_coeff,
-            n_fft=self.frame_length, hop_length=self.hop_length
+            S=librosa.power_to_db(mel_spectrum), n_mfcc=n_coeff
         ).T
         # Optionally return the sole static mfcc coefficients.
         if static_only:
@@ -111,10 +205,10 @@ class Wav:
 
     def get_rms_energy(self):
         """Return root mean squared energy for each audio frame."""
-        return librosa.feature.rmse(
+        return self._get_cached('rms_energy', lambda: librosa.feature.rmse(
             self.signal, frame_length=self.frame_length,
             hop_length=self.hop_length
-        ).T
+        ).T).copy()
 
     def get_lpc(self, n_coeff=20, static_only=False):
         """Return linear predictive coding coefficients for each audio frame.
@@ -126,10 +220,7 @@ class Wav:
                       delta and deltadelta LPC and energy features
                       (bool, default False)
         """
-        frames = librosa.util.frame(
-            self.signal, self.frame_length, self.hop_length
-        )
-        lpc, _ = linear_predictive_coding(frames, n_coeff)
+        lpc, _ = linear_predictive_coding(self.frames, n_coeff)
         if static_only:
             return lpc
         energy = self.get_rms_energy()
@@ -163,6 +254,57 @@ class Wav:
         )
 
 
+@functools.lru_cache(maxsize=16)
+def _load_audio(path, mtime, sampling_rate, resampling):
+    """Decode and resample the signal of an audio file.
+
+    The file's modification time is part of the arguments, so that
+    cached signals are discarded when the file is modified. If
+    `sampling_rate` is None, the native sampling rate is kept.
+
+    Return the (read-only) signal and its sampling rate.
+    """
+    # Argument only used as cache key; pylint: disable=unused-argument
+    with open(path, 'rb') as file:
+        is_sphere = file.read(7) == b'NIST_1A'
+    if is_sphere:
+        sphere = SphereFile(path)
+        signal, native_rate = sphere.get_signal(), sphere.sampling_rate
+    else:
+        signal, native_rate = librosa.load(path, sr=None)
+    if sampling_rate is None:
+        sampling_rate = native_rate
+    signal = resample_audio(signal, native_rate, sampling_rate, resampling)
+    signal.setflags(write=False)
+    return signal, sampling_rate
+
+
+def resample_audio(signal, original_rate, target_rate, method='kaiser_best'):
+    """Resample an audio signal from a sampling rate to another.
+
+    signal        : 1-D numpy.ndarray of audio samples
+    original_rate : sampling rate of the signal, in Hz (int)
+    target_rate   : sampling rate to resample the signal to, in Hz (int)
+    method        : resampling method, either 'polyphase' (rational
+                    resampling using a polyphase filter) or a res_type
+                    supported by `librosa.resample` (str, default
+                    'kaiser_best')
+
+    The signal is returned as is if both sampling rates are equal.
+    """
+    check_type_validity(method, str, 'method')
+    if original_rate == target_rate:
+        return signal
+    if method == 'polyphase':
+        resampled = resample_signal(
+            signal, original_rate, target_rate, method='polyphase'
+        )
+        return resampled.astype(signal.dtype)
+    return librosa.resample(
+        signal, orig_sr=original_rate, target_sr=target_rate, res_type=method
+    )
+
+
 def linear_predictive_coding(frames, n_coeff=20):
     """Return linear predictive coding coefficients for each audio frame.
 
@@ -180,21 +322,69 @@ def linear_predictive_coding(frames, n_coeff=20):
     n_coeff = min(n_coeff, frames.shape[1] - 1)
     # Compute the frame-wise LPC coefficients.
     autocorrelations = librosa.autocorrelate(frames, n_coeff + 1)
-    lpc = np.array([
-        # Levinson-Durbin recursion. False positive pylint: disable=no-member
-        scipy.linalg.solve_toeplitz(autocorr[:-1], autocorr[1:])
-        for autocorr in autocorrelations
-    ])
-    # Compute the frame_wise root mean squared prediction errors.
-    frame_wise_errors = np.array([
-        frames[:, i] - np.sum(lpc * frames[:, i - n_coeff:i][:, ::-1], axis=1)
-        for i in range(n_coeff, frames.shape[1])
-    ])
-    frames_rmse = np.sqrt(np.mean(np.square(frame_wise_errors), axis=0))
+    lpc = levinson_durbin(autocorrelations)
+    # Compute the frame-wise root mean squared prediction errors.
+    frames_rmse = np.sqrt(np.mean(
+        np.square(lpc_residuals(frames, lpc)), axis=1
+    ))
     # Return the LPC coefficients and error terms.
     return lpc, frames_rmse
 
 
+def levinson_durbin(autocorrelations):
+    """Solve the LPC normal equations of multiple frames at once.
+
+    autocorrelations : 2-D numpy.ndarray where each line contains the
+                       autocorrelation coefficients of a frame, from
+                       lag zero to the lag equal to the LPC order
+
+    The Levinson-Durbin recursion is run jointly on all frames, so that
+    each of its steps is a vectorized operation instead of a Python-level
+    loop over frames. Frames whose prediction error vanishes (e.g. silent
+    frames) have their remaining coefficients set to zero.
+
+    Return a 2-D numpy.ndarray of LPC coefficients, with one line per frame.
+    """
+    autocorr = np.asarray(autocorrelations, dtype=np.float64)
+    n_frames, order = autocorr.shape[0], autocorr.shape[1] - 1
+    lpc = np.zeros((n_frames, order))
+    errors = autocorr[:, 0].copy()
+    for i in range(order):
+        # Compute the i-th reflection coefficient of each frame.
+        residual = (
+            autocorr[:, i + 1]
+            - np.sum(lpc[:, :i] * autocorr[:, i:0:-1], axis=1)
+        )
+        reflection = np.divide(
+            residual, errors, out=np.zeros(n_frames), where=errors > 0
+        )
+        # Update the coefficients and the prediction errors.
+        lpc[:, :i] -= reflection[:, np.newaxis] * lpc[:, i - 1::-1][:, :i]
+        lpc[:, i] = reflection
+        errors *= 1 - np.square(reflection)
+    return lpc
+
+
+def lpc_residuals(frames, lpc):
+    """Return the prediction errors of LPC coefficients on audio frames.
+
+    frames : 2-D numpy.ndarray where each line represents an audio frame
+    lpc    : 2-D numpy.ndarray of LPC coefficients, with one line per frame
+
+    Each frame is passed through its own FIR prediction filter, which is
+    applied as a sum of shifted frames over the (few) filter taps, rather
+    than over the (many) samples of each frame.
+
+    Return a 2-D numpy.ndarray of shape (n_frames, frame_length - n_coeff).
+    """
+    n_coeff = lpc.shape[1]
+    length = frames.shape[1]
+    errors = frames[:, n_coeff:].astype(np.float64)
+    for lag in range(1, n_coeff + 1):
+        errors -= lpc[:, [lag - 1]] * frames[:, n_coeff - lag:length - lag]
+    return errors
+
+
 def lpc_to_lsf(lpc_coefficients):
     """Turn a numpy.ndarray of LPC coefficients to LSF coefficients.
 
@@ -202,34 +392,27 @@ def lpc_to_lsf(lpc_coefficients):
     save for the fact that it operates on LPC coefficients
     of multiple frames at the same time.
 
-    The returned LSF coefficients have values in [0, pi].
+    The returned LSF coefficients have values in [0, pi]. Frames
+    whose coefficients cannot be normalized (e.g. silent frames)
+    are assigned NaN values.
     """
     # Normalize the LPC coefficients and add a final zero coefficient.
-    lpc = lpc_coefficients.copy()
-    lpc /= lpc[:, [0]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lpc = lpc_coefficients / lpc_coefficients[:, [0]]
     lpc = np.concatenate([lpc, np.zeros((len(lpc), 1))], axis=1)
     # Form the P and Q polynomials by sum and difference filters.
     p_polynoms = lpc - lpc[:, ::-1]
     q_polynoms = lpc + lpc[:, ::-1]
     # If the LPC order is odd, remove the known roots of P.
     if lpc.shape[1] % 2:
-        p_polynoms = np.array([
-            scipy.signal.deconvolve(polynom, np.array([1, 0, -1]))[0]
-            for polynom in p_polynoms
-        ])
+        p_polynoms = deflate_polynoms(deflate_polynoms(p_polynoms, 1), -1)
     # If the LPC order is even, remove the known roots of P and Q.
     else:
-        p_polynoms = np.array([
-            scipy.signal.deconvolve(polynom, np.array([1, -1]))[0]
-            for polynom in p_polynoms
-        ])
-        q_polynoms = np.array([
-            scipy.signal.deconvolve(polynom, np.array([1, 1]))[0]
-            for polynom in q_polynoms
-        ])
+        p_polynoms = deflate_polynoms(p_polynoms, 1)
+        q_polynoms = deflate_polynoms(q_polynoms, -1)
     # Compute polynomial roots.
-    p_roots = np.array([np.roots(polynom) for polynom in p_polynoms])
-    q_roots = np.array([np.roots(polynom) for polynom in q_polynoms])
+    p_roots = polynoms_to_roots(p_polynoms)
+    q_roots = polynoms_to_roots(q_polynoms)
     # Compute roots' angle on the unit circle. Ommit complex conjugates.
     lsf = np.abs(np.concatenate(
         [np.angle(p_roots[:, ::2]), np.angle(q_roots[:, ::2])], axis=1
@@ -239,12 +422,77 @@ def lpc_to_lsf(lpc_coefficients):
     return lsf
 
 
+def deflate_polynoms(polynoms, root):
+    """Divide multiple polynomials by a same (z - `root`) factor.
+
+    polynoms : 2-D numpy.ndarray where each line contains the
+               coefficients of a polynomial, in decreasing powers
+    root     : root to deflate, either 1 or -1
+
+    The division is computed in closed form, as a cumulated sum
+    of (sign-alternated, if `root` is -1) coefficients, on all
+    polynomials at once. The remainders are discarded.
+    """
+    if root not in (1, -1):
+        raise ValueError('`root` should be either 1 or -1.')
+    signs = np.power(root, np.arange(polynoms.shape[1]))
+    return (signs * np.cumsum(polynoms * signs, axis=1))[:, :-1]
+
+
+def inflate_polynoms(polynoms, root):
+    """Multiply multiple polynomials by a same (z - `root`) factor.
+
+    polynoms : 2-D numpy.ndarray where each line contains the
+               coefficients of a polynomial, in decreasing powers
+    root     : root to add to the polynomials (scalar or 1-D
+               numpy.ndarray with one root per polynomial)
+    """
+    root = np.reshape(root, (-1, 1))
+    padding = np.zeros((len(polynoms), 1), dtype=polynoms.dtype)
+    return (
+        np.concatenate([polynoms, padding], axis=1)
+        - root * np.concatenate([padding, polynoms], axis=1)
+    )
+
+
+def polynoms_to_roots(polynoms):
+    """Return the roots of multiple polynomials of a same degree.
+
+    polynoms : 2-D numpy.ndarray where each line contains the
+               coefficients of a polynomial, in decreasing powers
+
+    The companion matrices of all polynomials are stacked, so that
+    their eigenvalues are computed through a single call. Polynomials
+    with non-finite coefficients are assigned NaN roots.
+
+    Return a 2-D numpy.ndarray of complex roots, with one line per polynom.
+    """
+    n_polynoms, degree = polynoms.shape[0], polynoms.shape[1] - 1
+    # Build the companion matrices, as in numpy.roots.
+    companions = np.zeros((n_polynoms, degree, degree))
+    companions[:, 1:, :-1] = np.eye(degree - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        companions[:, 0] = -polynoms[:, 1:] / polynoms[:, [0]]
+    # Compute the roots of the well-defined polynomials.
+    valid = np.isfinite(companions).all(axis=(1, 2))
+    roots = np.full((n_polynoms, degree), np.nan, dtype=complex)
+    if valid.any():
+        roots[valid] = np.linalg.eigvals(companions[valid])
+    return roots
+
+
 def roots_to_polynoms(roots):
-    """Convert an array of roots to polynomial coefficients."""
+    """Convert an array of roots to polynomial coefficients.
+
+    The roots' complex conjugates are added to the provided roots,
+    so that the polynomials have real coefficients. Polynomials are
+    built jointly, adding one root to all of them at each step.
+    """
     roots = np.concatenate([roots, np.conjugate(roots)], axis=1)
-    return np.array([
-        np.poly(polynom_roots) for polynom_roots in roots
-    ])
+    polynoms = np.ones((len(roots), 1), dtype=complex)
+    for i in range(roots.shape[1]):
+        polynoms = inflate_polynoms(polynoms, roots[:, i])
+    return polynoms.real
 
 
 def lsf_to_lpc(lsf_coefficients):
@@ -258,19 +506,10 @@ def lsf_to_lpc(lsf_coefficients):
     q_polynoms = roots_to_polynoms(roots[:, ::2])
     # Restore omitted polynomial roots based on LSF order parity.
     if lsf_coefficients.shape[1] % 2:
-        p_polynoms = np.array([
-            scipy.signal.convolve(polynom, np.array([1, 0, -1]))
-            for polynom in p_polynoms
-        ])
+        p_polynoms = inflate_polynoms(inflate_polynoms(p_polynoms, 1), -1)
     else:
-        p_polynoms = np.array([
-            scipy.signal.convolve(polynom, np.array([1, -1]))
-            for polynom in p_polynoms
-        ])
-        q_polynoms = np.array([
-            scipy.signal.convolve(polynom, np.array([1, 1]))
-            for polynom in q_polynoms
-        ])
+        p_polynoms = inflate_polynoms(p_polynoms, 1)
+        q_polynoms = inflate_polynoms(q_polynoms, -1)
     # Add up the computed polynomials to deduce the LPC coefficients.
     lpc = (p_polynoms + q_polynoms) / 2
     return lpc[:, :-1]
@@ -21,10 +21,17 @@
 
 from ._data_utils import (
     add_dynamic_features,
+    bucket_by_length,
     build_context_windows,
     build_dynamic_weights_matrix,
+    get_simple_difference,
     interpolate_missing_values,
     lowpass_filter,
+    resample_signal,
     sequences_to_batch,
-    batch_to_sequences
+    batch_to_sequences,
+    sequences_to_ragged,
+    ragged_to_sequences,
+    ragged_to_batch,
+    batch_to_ragged
 )
@@ -20,9 +20,12 @@
 """Set of functions to enhance acoustic and articulatory data."""
 
 
+import math
+
 import numpy as np
 import scipy.signal
 import scipy.interpolate
+import scipy.ndimage
 
 from ac2art.utils import check_positive_int, check_type_validity
 
@@ -30,60 +33,99 @@ from ac2art.utils import check_positive_int, check_type_validity
 def add_dynamic_features(static_features, window=5):
     """Build delta and deltadelta features on top of static ones.
 
-    static_features : 2-D numpy.ndarray of static features to enhance
+    static_features : 2-D numpy.ndarray of static features to enhance,
+                      or 3-D one batching sequences of such features
+                      along its first dimension
     window          : half-size of the time window used (int, default 5)
     """
     delta = get_delta_features(static_features, window)
     deltadelta = get_delta_features(delta, window)
-    return np.concatenate([static_features, delta, deltadelta], axis=1)
+    return np.concatenate([static_features, delta, deltadelta], axis=-1)
 
 
 def get_delta_features(array, window=5):
     """Compute and return delta features, using a given time window.
 
-    array  : 2-D numpy.ndarray of values whose delta to compute
+    array  : 2-D numpy.ndarray of values whose delta to compute, or
+             3-D one batching sequences of such values along its first
+             dimension (time being the second-to-last dimension)
     window : half-size of the time window used (int, default 5)
+
+    Delta features are computed through a single correlation of
+    the array with the regression weights of each lag, the first
+    and last values being replicated beyond the array's edges.
     """
-    norm = 2 * np.sum(i ** 2 for i in range(1, window + 1))
-    return np.sum(
-        get_simple_difference(array, lag) * lag for lag in range(1, window + 1)
-    ) / norm
+    norm = 2 * sum(i ** 2 for i in range(1, window + 1))
+    weights = np.arange(-window, window + 1) / norm
+    array = np.asarray(array, dtype=np.result_type(array, np.float32))
+    return scipy.ndimage.correlate1d(array, weights, axis=-2, mode='nearest')
 
 
 def get_simple_difference(array, lag):
     """Compute and return the simple difference of a series for a given lag.
 
-    array : 2-D numpy.ndarray whose first dimension is time
+    array : 2-D numpy.ndarray whose first dimension is time, or 3-D
+            one batching such series along its first dimension
     lag   : lag to use, so that the difference at time t is
             between values at times t + lag and t - lag
+
+    The first and last values are replicated beyond the array's edges.
     """
-    padding = np.ones((lag, array.shape[1]))
-    past = np.concatenate([padding * array[0], array[:-lag]])
-    future = np.concatenate([array[lag:], padding * array[-1]])
-    return future - past
+    weights = np.zeros(2 * lag + 1)
+    weights[[0, -1]] = (-1, 1)
+    array = np.asarray(array, dtype=np.result_type(array, np.float32))
+    return scipy.ndimage.correlate1d(array, weights, axis=-2, mode='nearest')
 
 
-def build_context_windows(audio_frames, window=5, zero_padding=True):
+def build_context_windows(
+        audio_frames, window=5, zero_padding=True, as_view=False
+    ):
     """Build context windows out of a series of audio frames.
 
     audio_frames : 2-D numpy.ndarray of frames of audio features
     window       : half-size of the context window built
     zero_padding : whether to zero-pad the data instead of using
                    the edge frames only as context (bool, default True)
+    as_view      : whether to return a read-only strided view of the
+                   (padded) frames instead of a new array (bool,
+                   default False)
 
     The context windows are built using past and future frames
-    symmetrically around a central frame.
+    symmetrically around a central frame. Without zero-padding,
+    sequences of less than `2 * window + 1` frames result in an
+    empty array.
+
+    When `as_view` is True, the returned array shares its memory with
+    a contiguous (and possibly padded) copy of the input frames, so
+    that it uses no more memory than the latter, instead of being
+    `2 * window + 1` times larger. The returned array is read-only.
     """
     # Optionally zero-pad the signal.
     if zero_padding:
-        padding = np.zeros((window, audio_frames.shape[1]))
+        padding = np.zeros(
+            (window, audio_frames.shape[1]), dtype=audio_frames.dtype
+        )
         frames = np.concatenate([padding, audio_frames, padding])
         length = len(audio_frames)
     else:
         frames = audio_frames
         length = len(audio_frames) - 2 * window
-    # Build the windows of frames and return them.
     full_window = 1 + 2 * window
+    # Handle sequences too short to build any window out of.
+    if length <= 0:
+        return np.empty(
+            (0, full_window * audio_frames.shape[1]), dtype=audio_frames.dtype
+        )
+    # Optionally return the windows as a sliding view over the frames.
+    if as_view:
+        frames = np.ascontiguousarray(frames)
+        width = frames.shape[1]
+        return np.lib.stride_tricks.as_strided(
+            frames.ravel(), shape=(length, full_window * width),
+            strides=(width * frames.itemsize, frames.itemsize),
+            writeable=False
+        )
+    # Otherwise, build the windows of frames and return them.
     return np.concatenate(
         [frames[i:i + length] for i in range(full_window)], axis=1
     )
@@ -127,50 +169,175 @@ def build_dynamic_weights_matrix(size, window, complete=False):
 
 
 def interpolate_missing_values(array):
-    """Fill NaN values in a 1-D numpy array by cubic spline interpolation."""
+    """Fill NaN values in a numpy array by cubic spline interpolation.
+
+    array : 1-D numpy.ndarray, or 2-D one whose columns are
+            channels to interpolate independently
+
+    Channels sharing the same missing values' positions, as is the
+    case when a given sensor drops out, are interpolated jointly:
+    a single spline is fit to all of them and evaluated at once on
+    the missing indices.
+    """
     # Check array's type validity.
     check_type_validity(array, np.ndarray, 'array')
-    if array.ndim > 1:
-        raise TypeError("'array' must be one-dimensional.")
+    if array.ndim > 2:
+        raise TypeError("'array' must be one- or two-dimensional.")
+    if array.ndim == 1:
+        return interpolate_missing_values(array.reshape(-1, 1)).ravel()
     # Identify NaN values. If there aren't any, simply return the array.
     is_nan = np.isnan(array)
-    if is_nan.sum() == 0:
+    if not is_nan.any():
         return array
     array = array.copy()
-    not_nan = ~ is_nan
-    # Build a cubic spline out of non-NaN values.
-    spline = scipy.interpolate.splrep(
-        np.argwhere(not_nan).ravel(), array[not_nan], k=3
-    )
-    # Interpolate missing values and replace them.
-    for i in np.argwhere(is_nan).ravel():
-        array[i] = scipy.interpolate.splev(i, spline)
+    # Group channels based on their NaN values' positions.
+    groups = {}
+    for column, mask in enumerate(np.packbits(is_nan, axis=0).T):
+        groups.setdefault(mask.tobytes(), []).append(column)
+    for columns in groups.values():
+        mask = is_nan[:, columns[0]]
+        if not mask.any():
+            continue
+        # Build a cubic spline out of non-NaN values and use it
+        # to replace missing ones.
+        spline = scipy.interpolate.make_interp_spline(
+            np.flatnonzero(~mask), array[:, columns][~mask], k=3
+        )
+        array[np.ix_(mask, columns)] = spline(np.flatnonzero(mask))
     return array
 
 
-def lowpass_filter(signal, cutoff, sample_rate, order=5):
+def lowpass_filter(signal, cutoff, sample_rate, order=5, axis=0):
     """Low-pass filter a signal at a given cutoff frequency.
 
     signal      : single or multi-channel signal (1-D or 2-D numpy.array)
     cutoff      : cutoff frequency, in Hz (positive int)
     sample_rate : sampling rate of the signal, in Hz (positive int)
     order       : half-order of the butterworth filter used (int, default 5)
+    axis        : time axis of the signal, along which to filter all
+                  channels at once (int, default 0)
 
-    Filtering is conducted using a butterworth digital filter,
-    applied forward then backward so as to be zero-phased.
+    Filtering is conducted using a butterworth digital filter, expressed
+    as second-order sections, applied forward then backward so as to be
+    zero-phased.
+    """
+    sos = scipy.signal.butter(
+        order, 2 * cutoff / sample_rate, btype='low', analog=False,
+        output='sos'
+    )
+    return scipy.signal.sosfiltfilt(sos, signal, axis=axis)
+
+
+def resample_signal(signal, original_rate, target_rate, method='fft', axis=0):
+    """Resample a single or multi-channel signal to a given sampling rate.
+
+    signal        : numpy.ndarray of values to resample
+    original_rate : sampling rate of the signal, in Hz (positive int)
+    target_rate   : sampling rate to resample the signal to, in Hz
+                    (positive int)
+    method        : resampling method, either 'fft', using the Fourier
+                    method, or 'polyphase', using a polyphase filter with
+                    the rational ratio of the sampling rates (e.g. 1/5 for
+                    500 Hz to 100 Hz) (str, default 'fft')
+    axis          : time axis of the signal, along which to resample all
+                    channels at once (int, default 0)
+
+    With the 'polyphase' method, the signal's mean is removed prior to
+    filtering and restored afterwards, so as to avoid edge artifacts
+    due to the implicit zero-padding of the signal. The signal is
+    returned as is if both sampling rates are equal.
+    """
+    if method not in ('fft', 'polyphase'):
+        raise ValueError("Unknown resampling method: '%s'." % method)
+    if original_rate == target_rate:
+        return signal
+    if method == 'fft':
+        ratio = target_rate / original_rate
+        return scipy.signal.resample(
+            signal, num=int(signal.shape[axis] * ratio), axis=axis
+        )
+    divisor = math.gcd(int(original_rate), int(target_rate))
+    mean = np.mean(signal, axis=axis, keepdims=True)
+    resampled = scipy.signal.resample_poly(
+        signal - mean, int(target_rate) // divisor,
+        int(original_rate) // divisor, axis=axis
+    )
+    return resampled + mean
+
+
+def bucket_by_length(
+        lengths, batch_size, max_padding=.2, shuffle=True, seed=None
+    ):
+    """Group sequences into batches of similar lengths.
+
+    lengths     : list or 1-D numpy array of the sequences' lengths
+    batch_size  : maximum number of sequences per batch (positive int)
+    max_padding : maximum share of padding frames in any batch of
+                  more than one sequence, once zero-padded to its
+                  longest sequence (float in [0, 1[, default .2)
+    shuffle     : whether to randomize the composition of batches
+                  among sequences of same length, and the order
+                  of the batches (bool, default True)
+    seed        : optional random seed to use when shuffling (int)
+
+    Sequences are sorted by length and greedily grouped into batches,
+    which are closed when full or when adding the next sequence would
+    bring their share of padding frames above `max_padding`.
+
+    Return a list of 1-D numpy arrays, each of which contains
+    the indices of the sequences in a batch, and the share of
+    padding frames over all batches (float).
     """
-    # Build the initial butterworth low-pass filter.
-    filt_b, filt_a = scipy.signal.butter(
-        order, 2 * cutoff / sample_rate, btype='low', analog=False
+    check_positive_int(batch_size, 'batch_size')
+    check_type_validity(max_padding, (float, int), 'max_padding')
+    if not 0 <= max_padding < 1:
+        raise ValueError("'max_padding' should be in [0, 1[.")
+    lengths = np.asarray(lengths)
+    random = np.random.RandomState(seed)
+    # Sort sequences by length, in random order among equal lengths.
+    order = np.arange(len(lengths))
+    if shuffle:
+        order = random.permutation(order)
+    order = order[np.argsort(lengths[order], kind='stable')]
+    # Greedily group the sorted sequences into batches.
+    batches = _group_sorted_sequences(lengths, order, batch_size, max_padding)
+    # Compute the share of padding frames and return the batches.
+    padded_total = sum(len(batch) * lengths[batch[-1]] for batch in batches)
+    padding_ratio = (
+        1 - lengths.sum() / padded_total if padded_total else 0.
     )
-    # If the signal has a single channel, filter it out and return it.
-    if len(signal.shape) == 1:
-        return scipy.signal.filtfilt(filt_b, filt_a, signal)
-    # Otehrwise, conduct channel-wise filtering
-    return np.concatenate([
-        np.expand_dims(scipy.signal.filtfilt(filt_b, filt_a, channel), 1)
-        for channel in signal.T
-    ], axis=1)
+    if shuffle:
+        batches = [batches[i] for i in random.permutation(len(batches))]
+    return batches, float(padding_ratio)
+
+
+def _group_sorted_sequences(lengths, order, batch_size, max_padding):
+    """Greedily group sequences sorted by length into batches.
+
+    lengths     : 1-D numpy array of the sequences' lengths
+    order       : 1-D numpy array of the sequences' indices,
+                  sorted by increasing length
+    batch_size  : maximum number of sequences per batch
+    max_padding : maximum share of padding frames in any batch
+                  of more than one sequence
+
+    Return a list of 1-D numpy arrays of sequences' indices.
+    """
+    batches = []
+    start = 0
+    total = 0
+    for end, index in enumerate(order, 1):
+        n_sequences = end - start
+        total += lengths[index]
+        full = n_sequences > batch_size
+        padded = 1 - total / (n_sequences * lengths[index]) > max_padding
+        if full or (n_sequences > 1 and padded):
+            batches.append(order[start:end - 1])
+            start = end - 1
+            total = lengths[index]
+    if start < len(order):
+        batches.append(order[start:])
+    return batches
 
 
 def sequences_to_batch(sequences, length=None):
@@ -181,7 +348,8 @@ def sequences_to_batch(sequences, length=None):
     length    : optional size of the batched array's second dimension
                 (otherwise, maximum sample length is used)
 
-    Return a numpy.array of shape [n_sequences, length, sequences_width].
+    Return a numpy.array of shape [n_sequences, length, sequences_width],
+    of same dtype as the sequences, and an array of their true lengths.
     """
     # Check sequences argument validity.
     check_type_validity(sequences, (list, np.ndarray), 'sequences')
@@ -211,13 +379,11 @@ def sequences_to_batch(sequences, length=None):
         batch_sizes = np.array([
             min(len(sequence), length) for sequence in sequences
         ])
-    # Zero-pad the sequences and concatenate them.
-    batched = np.array([
-        np.concatenate([
-            seq[:length], np.zeros((length - seq_length, seq.shape[1]))
-        ])
-        for seq, seq_length in zip(sequences, batch_sizes)
-    ])
+    # Fill a pre-allocated zero-padded array with the sequences.
+    dtype = np.result_type(*[sequence.dtype for sequence in sequences])
+    batched = np.zeros((len(sequences), length, width), dtype=dtype)
+    for i, (sequence, seq_length) in enumerate(zip(sequences, batch_sizes)):
+        batched[i, :seq_length] = sequence[:seq_length]
     # Return the batched sequences and the true sequence lengths.
     return batched, batch_sizes
 
@@ -229,10 +395,93 @@ def batch_to_sequences(batch, batch_sizes):
                   [n_sequences, max_length, sequences_width]
     batch_sizes : list of true lengths of the batched sequences
                   (i.e. notwithstanding zero padding)
+
+    Return either a 3-D numpy array, if all sequences share the same
+    length, or a 1-D numpy array of objects containing views of the
+    batch, one per sequence. If there is a single sequence, return
+    it as a 2-D numpy array.
     """
-    sequences = np.array([
-        sequence[:batch_sizes[i]] for i, sequence in enumerate(batch)
-    ])
+    batch_sizes = np.asarray(batch_sizes)
     if batch.shape[0] == 1:
-        sequences = sequences[0]
+        return batch[0, :batch_sizes[0]]
+    if np.all(batch_sizes == batch_sizes[0]):
+        return batch[:, :batch_sizes[0]]
+    sequences = np.empty(len(batch), dtype=object)
+    for i, (sequence, length) in enumerate(zip(batch, batch_sizes)):
+        sequences[i] = sequence[:length]
     return sequences
+
+
+def sequences_to_ragged(sequences):
+    """Gather a set of sequences into a flat array and their lengths.
+
+    sequences : list or array of two-dimensional numpy arrays sharing
+                the same shape on their last dimension
+
+    This representation of variable-length sequences avoids both
+    zero-padding and numpy arrays of objects.
+
+    Return a 2-D numpy array stacking the sequences' values along
+    its first dimension, and a 1-D array of the sequences' lengths.
+    """
+    lengths = np.array([len(sequence) for sequence in sequences])
+    return np.concatenate(sequences), lengths
+
+
+def ragged_to_sequences(values, lengths):
+    """Split a flat array of sequences' values into a list of sequences.
+
+    values  : 2-D numpy array stacking the sequences' values
+    lengths : 1-D array of int recording the sequences' lengths
+
+    Return a list of views of `values`, one per sequence.
+    """
+    return np.split(values, np.cumsum(lengths)[:-1])
+
+
+def ragged_to_batch(values, lengths, length=None):
+    """Batch a flat array of sequences' values into a 3-D array.
+
+    values  : 2-D numpy array stacking the sequences' values
+    lengths : 1-D array of int recording the sequences' lengths
+    length  : optional size of the batched array's second dimension
+              (otherwise, maximum sequence length is used)
+
+    Return a numpy.array of shape [n_sequences, length, values_width],
+    of same dtype as `values`, and an array of the sequences' lengths
+    (truncated to `length` if needed).
+    """
+    lengths = np.asarray(lengths)
+    if length is None:
+        length = lengths.max()
+    else:
+        check_positive_int(length, 'length')
+    # Select the values to keep and their positions in the batch.
+    positions = np.arange(len(values)) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    keep = positions < length
+    batch_sizes = np.minimum(lengths, length)
+    # Fill a pre-allocated zero-padded array with the kept values.
+    batched = np.zeros(
+        (len(lengths), length, values.shape[1]), dtype=values.dtype
+    )
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    batched[rows[keep], positions[keep]] = values[keep]
+    return batched, batch_sizes
+
+
+def batch_to_ragged(batch, batch_sizes):
+    """Gather an array of batched sequences into a flat array of values.
+
+    batch       : three-dimensional numpy array of shape
+                  [n_sequences, max_length, sequences_width]
+    batch_sizes : list of true lengths of the batched sequences
+                  (i.e. notwithstanding zero padding)
+
+    Return a 2-D numpy array stacking the sequences' values along
+    its first dimension, and a 1-D array of the sequences' lengths.
+    """
+    batch_sizes = np.asarray(batch_sizes)
+    mask = np.arange(batch.shape[1]) < batch_sizes[:, np.newaxis]
+    return batch[mask], batch_sizes
@@ -23,9 +23,7 @@
 import tensorflow as tf
 
 from ac2art.internal.network_bricks import build_layers_stack
-from ac2art.internal.tf_utils import (
-    add_dynamic_features, batch_tensor_mean, run_along_first_dim
-)
+from ac2art.internal.tf_utils import add_dynamic_features, batch_tensor_mean
 
 
 def build_binary_classif_readouts(pred_proba, labels, batch_sizes=None):
@@ -107,9 +105,6 @@ def refine_signal(
         signal = top_filter.output
     # Optionally add dynamic features to the signal.
     if add_dynamic:
-        signal = (
-            add_dynamic_features(signal, window=5) if len(signal.shape) == 2
-            else run_along_first_dim(add_dynamic_features, signal, window=5)
-        )
+        signal = add_dynamic_features(signal, window=5, axis=-1)
     # Return the refined signal and the defined top filter, if any.
     return signal, top_filter
@@ -23,15 +23,18 @@ from ._tf_utils import (
     add_dynamic_features,
     batch_tensor_mean,
     binary_step,
+    build_context_windows,
+    build_utterances_dataset,
     conv2d,
     get_activation_function_name,
     get_delta_features,
-    get_simple_difference,
     get_rnn_cell_type_name,
+    get_simple_difference,
     index_tensor,
     log_base,
     minimize_safely,
     reduce_finite_mean,
+    replicate_last_frames,
     run_along_first_dim,
     setup_activation_function,
     setup_rnn_cell_type,
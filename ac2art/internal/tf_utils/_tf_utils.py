@@ -24,21 +24,36 @@ import inspect
 import tensorflow as tf
 import numpy as np
 
-from ac2art.utils import check_type_validity, get_object, get_object_name
+from ac2art.utils import (
+    check_positive_int, check_type_validity, get_object, get_object_name
+)
 
 
-def add_dynamic_features(tensor, window=5, axis=1):
+def add_dynamic_features(tensor, window=5, axis=1, batch_sizes=None):
     """Compute delta and deltadelta features to a given tensor.
 
-    tensor : rank 2 tensor whose delta and delta features to compute
-    window : half-size of the window of lags used to compute
-             delta features (positive int, default 5)
-    axis   : axis along which to stack the basic, delta and deltadelta
-             features (default 1, i.e. horizontal stacking)
+    tensor      : rank 2 tensor whose delta and delta features to compute,
+                  or rank 3 tensor batching sequences of such features
+    window      : half-size of the window of lags used to compute
+                  delta features (positive int, default 5)
+    axis        : axis along which to stack the basic, delta and deltadelta
+                  features (default 1, i.e. horizontal stacking)
+    batch_sizes : optional rank 1 tensor recording the actual length of
+                  the sequences batched in a rank 3 `tensor`, whose padded
+                  frames are then replaced with the last actual ones when
+                  computing the dynamic features
+
+    Deltadelta features are computed as the delta features of
+    the delta ones, as in `ac2art.internal.data_utils`.
     """
-    tf.assert_rank(tensor, 2)
-    delta = get_delta_features(tensor, window)
-    deltadelta = get_delta_features(tensor, window)
+    replicate = len(tensor.shape) == 3 and batch_sizes is not None
+    static = (
+        replicate_last_frames(tensor, batch_sizes) if replicate else tensor
+    )
+    delta = get_delta_features(static, window)
+    if replicate:
+        delta = replicate_last_frames(delta, batch_sizes)
+    deltadelta = get_delta_features(delta, window)
     return tf.concat([tensor, delta, deltadelta], axis=axis)
 
 
@@ -65,6 +80,123 @@ def binary_step(tensor):
     return tf.cast(tensor > 0, tf.float32)
 
 
+def build_context_windows(tensor, window=5):
+    """Build context windows out of a tensor of frames, with zero padding.
+
+    tensor : rank 2 tensor of frames, or rank 3 tensor batching
+             sequences of frames, whose last dimension is fixed
+    window : half-size of the context windows (positive int, default 5)
+
+    Return a tensor of same rank as `tensor`, whose last dimension
+    is `2 * window + 1` times larger, stacking each frame with its
+    `window` predecessors and successors (zero-valued beyond the
+    edges of the sequence(s)).
+    """
+    if len(tensor.shape) not in (2, 3):
+        raise TypeError("'tensor' must be of rank 2 or 3.")
+    paddings = [[window, window], [0, 0]]
+    if len(tensor.shape) == 3:
+        paddings.insert(0, [0, 0])
+    length = tf.shape(tensor)[-2]
+    padded = tf.pad(tensor, paddings)
+    return tf.concat([
+        padded[..., i:i + length, :] for i in range(2 * window + 1)
+    ], axis=-1)
+
+
+def build_utterances_dataset(
+        load_utterance, utterances, batch_size, sequences=False,
+        context_window=0, input_norm=None, shuffle=True, n_parallel=4,
+        prefetch=2, seed=None
+    ):
+    """Build a tensorflow Dataset yielding batches of utterances' data.
+
+    load_utterance : function returning the input and target data of
+                     an utterance of given name, as 2-D numpy arrays,
+                     e.g. `ac2art.corpora.<corpus>.load.load_utterance`
+    utterances     : list of names of the utterances to use, e.g. as
+                     returned by `ac2art.corpora.<corpus>.load.get_utterances`
+    batch_size     : number of frames (or of sequences, if `sequences`
+                     is True) per batch (positive int)
+    sequences      : whether to yield zero-padded batches of sequences
+                     and their lengths rather than batches of frames
+                     (bool, default False)
+    context_window : half-size of the context windows of input frames
+                     to build, with zero padding (int, default 0)
+    input_norm     : optional tuple of arrays of means and scales used
+                     to normalize the input frames
+    shuffle        : whether to shuffle the utterances, and the frames
+                     when not using sequences (bool, default True)
+    n_parallel     : number of utterances loaded and processed in
+                     parallel (positive int, default 4)
+    prefetch       : number of batches prepared in advance, while
+                     the previous ones are being used (int, default 2)
+    seed           : optional random seed to use when shuffling (int)
+
+    Utterances are loaded using `load_utterance` in parallel threads,
+    after which context windows and normalization are computed within
+    the tensorflow graph. The resulting dataset iterates over the data
+    once and may be passed to the `set_dataset` method of a network
+    taking inputs of matching shape, instantiated with `use_dataset=True`.
+
+    Note that the first utterance is loaded when the dataset is built,
+    so as to infer the (fixed) width of its input and target data.
+    """
+    # Arguments serve modularity; pylint: disable=too-many-arguments
+    check_type_validity(utterances, list, 'utterances')
+    check_positive_int(batch_size, 'batch_size')
+    check_positive_int(n_parallel, 'n_parallel')
+    # Gather the width of the data, loading the first utterance.
+    input_width, targets_width = (
+        data.shape[1] for data in load_utterance(utterances[0])
+    )
+
+    def load_data(name):
+        """Load an utterance's data, as float32 numpy arrays."""
+        return tuple(
+            np.asarray(data, dtype=np.float32)
+            for data in load_utterance(name.decode('utf-8'))
+        )
+
+    def process_utterance(name):
+        """Load an utterance's data and process it."""
+        input_data, targets = tf.py_func(
+            load_data, [name], (tf.float32, tf.float32), stateful=False
+        )
+        input_data.set_shape([None, input_width])
+        targets.set_shape([None, targets_width])
+        if input_norm is not None:
+            input_data = (input_data - input_norm[0]) / input_norm[1]
+        if context_window:
+            input_data = build_context_windows(input_data, context_window)
+        return input_data, targets
+
+    # Set up a dataset of processed utterances.
+    dataset = tf.data.Dataset.from_tensor_slices(utterances)
+    if shuffle:
+        dataset = dataset.shuffle(len(utterances), seed=seed)
+    dataset = dataset.map(process_utterance, num_parallel_calls=n_parallel)
+    # Batch either zero-padded sequences or frames.
+    if sequences:
+        dataset = dataset.map(
+            lambda input_data, targets:
+            (input_data, targets, tf.shape(input_data)[0])
+        )
+        input_width *= 2 * context_window + 1
+        dataset = dataset.padded_batch(
+            batch_size, ([None, input_width], [None, targets_width], [])
+        )
+    else:
+        dataset = dataset.flat_map(
+            lambda input_data, targets:
+            tf.data.Dataset.from_tensor_slices((input_data, targets))
+        )
+        if shuffle:
+            dataset = dataset.shuffle(10 * batch_size, seed=seed)
+        dataset = dataset.batch(batch_size)
+    return dataset.prefetch(prefetch)
+
+
 def conv2d(input_data, weights):
     """Convolute 2-D inputs to a 4-D weights matrix filter."""
     return tf.nn.conv2d(input_data, weights, [1, 1, 1, 1], 'SAME')
@@ -87,17 +219,60 @@ def get_activation_function_name(function):
     return get_object_name(function, ACTIVATION_FUNCTIONS)
 
 
+def _correlate_along_time(tensor, weights):
+    """Correlate each channel of a tensor with weights along time.
+
+    tensor  : rank 2 tensor, or rank 3 tensor batching sequences (time
+              being the second-to-last dimension), whose last dimension
+              is fixed
+    weights : odd-length list of weights, centered on the current frame
+
+    The first and last frames are replicated beyond the edges of the
+    sequence(s), and the weights are applied through a single depthwise
+    convolution.
+    """
+    if len(tensor.shape) not in (2, 3):
+        raise TypeError("'tensor' must be of rank 2 or 3.")
+    window = len(weights) // 2
+    # Reshape the tensor to (batch, 1, time, channels) and pad it.
+    batched = tf.expand_dims(
+        tensor if len(tensor.shape) == 3 else tf.expand_dims(tensor, 0), 1
+    )
+    padded = tf.concat([
+        tf.tile(batched[:, :, :1], [1, 1, window, 1]),
+        batched,
+        tf.tile(batched[:, :, -1:], [1, 1, window, 1])
+    ], axis=2)
+    # Build the kernel and apply it to each channel.
+    kernel = tf.tile(
+        tf.reshape(
+            tf.constant(weights, dtype=tensor.dtype), (1, len(weights), 1, 1)
+        ),
+        [1, 1, tensor.shape[-1].value, 1]
+    )
+    output = tf.nn.depthwise_conv2d(
+        padded, kernel, strides=[1, 1, 1, 1], padding='VALID'
+    )
+    # Restore the tensor's initial rank.
+    output = tf.squeeze(output, 1)
+    return output if len(tensor.shape) == 3 else tf.squeeze(output, 0)
+
+
 def get_delta_features(tensor, window=5):
     """Compute and return delta features, using a given time window.
 
-    static_features : 2-D tensor of values whose delta to compute
-    window          : half-size of the time window used (int, default 5)
+    tensor : rank 2 tensor of values whose delta to compute, or rank 3
+             tensor batching sequences of such values (time being the
+             second-to-last dimension), whose last dimension is fixed
+    window : half-size of the time window used (int, default 5)
+
+    Delta features are computed through a single depthwise convolution
+    with the regression weights of each lag, the first and last frames
+    being replicated beyond the edges of the sequence(s).
     """
     norm = 2 * sum(i ** 2 for i in range(1, window + 1))
-    delta = tf.add_n([
-        get_simple_difference(tensor, lag=i) * i for i in range(1, window + 1)
-    ])
-    return delta / norm
+    weights = [i / norm for i in range(-window, window + 1)]
+    return _correlate_along_time(tensor, weights)
 
 
 def get_rnn_cell_type_name(cell_type):
@@ -108,15 +283,14 @@ def get_rnn_cell_type_name(cell_type):
 def get_simple_difference(tensor, lag):
     """Compute and return the simple difference of a series for a given lag.
 
-    tensor : 2-D tensor whose first dimension is time
+    tensor : rank 2 tensor whose first dimension is time, or rank 3
+             tensor batching such series along its first dimension,
+             whose last dimension is fixed
     lag    : lag to use, so that the difference at time t is
              between values at times t + lag and t - lag
     """
-    tf.assert_rank(tensor, 2)
-    padding = tf.ones((lag, tensor.shape[1].value))
-    past = tf.concat([padding * tensor[0], tensor[:-lag]], axis=0)
-    future = tf.concat([tensor[lag:], padding * tensor[-1]], axis=0)
-    return future - past
+    weights = [-1.] + [0.] * (2 * lag - 1) + [1.]
+    return _correlate_along_time(tensor, weights)
 
 
 def index_tensor(tensor, start=0):
@@ -204,6 +378,31 @@ def reduce_finite_mean(tensor, axis=None):
     return sums / tf.cast(n_obs, tf.float32)
 
 
+def replicate_last_frames(tensor, batch_sizes):
+    """Replace the padded frames of batched sequences with the last ones.
+
+    tensor      : rank 3 tensor batching zero-padded sequences of frames
+    batch_sizes : rank 1 tensor recording the actual (pre-padding)
+                  length of the batched sequences
+
+    Return a tensor of same shape as `tensor`, in which each sequence's
+    padded frames are set to be equal to its last actual frame (empty
+    sequences are left zero-valued).
+    """
+    tf.assert_rank(tensor, 3)
+    tf.assert_rank(batch_sizes, 1)
+    mask = tf.sequence_mask(
+        batch_sizes, maxlen=tf.shape(tensor)[1], dtype=tensor.dtype
+    )
+    mask = tf.expand_dims(mask, 2)
+    last_index = tf.stack(
+        [tf.range(tf.shape(tensor)[0]), tf.maximum(batch_sizes - 1, 0)],
+        axis=1
+    )
+    last_frames = tf.expand_dims(tf.gather_nd(tensor, last_index), 1)
+    return tensor * mask + last_frames * (1 - mask)
+
+
 def run_along_first_dim(function, tensors, *args, **kwargs):
     """Apply a function along the first dimension of one or more tensors.
 
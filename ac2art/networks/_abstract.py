@@ -30,6 +30,9 @@ from ac2art.internal.network_bricks import (
     build_layers_stack, refine_signal, validate_layer_config
 )
 from ac2art.internal.neural_layers import AbstractRNN, DenseLayer, SignalFilter
+from ac2art.internal.tf_utils import (
+    add_dynamic_features, build_context_windows
+)
 from ac2art.utils import (
     check_positive_int, check_type_validity, instantiate, onetimemethod
 )
@@ -41,32 +44,52 @@ class NeuralNetwork(metaclass=ABCMeta):
     This class defines both an API and a building procedure for neural
     networks aimed at learning acoustic-to-articulatory inversion.
     """
+    # Attributes record the network's structure.
+    # pylint: disable=too-many-instance-attributes
 
     def __init__(
             self, input_shape, n_targets, layers_config, top_filter=None,
-            use_dynamic=True, binary_tracks=None, norm_params=None, **kwargs
+            use_dynamic=True, binary_tracks=None, norm_params=None,
+            context_window=0, static_targets=False, use_dataset=False,
+            **kwargs
         ):
         """Initialize the neural network.
 
-        input_shape   : shape of the input data fed to the network,
-                        of either [n_samples, input_size] shape
-                        or [n_batches, max_length, input_size],
-                        where the last axis must be fixed (non-None)
-                        (tuple, list, tensorflow.TensorShape)
-        n_targets     : number of targets to predict,
-                        notwithstanding dynamic features
-        layers_config : list of tuples specifying a layer configuration,
-                        made of a layer class (or short name), a number
-                        of units (or a cutoff frequency for filters) and
-                        an optional dict of keyword arguments
-        top_filter    : optional tuple specifying a SignalFilter to use
-                        on top of the network's raw prediction
-        use_dynamic   : whether to produce dynamic features and use them
-                        when training the model (bool, default True)
-        binary_tracks : optional list of targets which are binary-valued
-                        (and should therefore not have delta counterparts)
-        norm_params   : optional normalization parameters of the targets
-                        (np.ndarray)
+        input_shape    : shape of the input data fed to the network,
+                         of either [n_samples, input_size] shape
+                         or [n_batches, max_length, input_size],
+                         where the last axis must be fixed (non-None)
+                         (tuple, list, tensorflow.TensorShape)
+        n_targets      : number of targets to predict,
+                         notwithstanding dynamic features
+        layers_config  : list of tuples specifying a layer configuration,
+                         made of a layer class (or short name), a number
+                         of units (or a cutoff frequency for filters) and
+                         an optional dict of keyword arguments
+        top_filter     : optional tuple specifying a SignalFilter to use
+                         on top of the network's raw prediction
+        use_dynamic    : whether to produce dynamic features and use them
+                         when training the model (bool, default True)
+        binary_tracks  : optional list of targets which are binary-valued
+                         (and should therefore not have delta counterparts)
+        norm_params    : optional normalization parameters of the targets
+                         (np.ndarray)
+        context_window : half-size of the context windows of input frames
+                         to build within the network (int, default 0);
+                         when positive, raw frames are to be fed to the
+                         network rather than pre-built context windows
+        static_targets : whether targets are fed without their dynamic
+                         features, which are then computed within the
+                         network (bool, default False; only used when
+                         `use_dynamic` is True)
+        use_dataset    : whether to enable drawing data from a tensorflow
+                         Dataset set up through the `set_dataset` method,
+                         rather than only feeding it (bool, default False)
+
+        Context windows and dynamic targets may only be built within
+        the network when it takes batches of sequences as input (i.e.
+        `input_shape` is of length 3), so that they are computed for
+        each utterance separately, with proper edge padding.
         """
         # Arguments serve modularity; pylint: disable=too-many-arguments
         # Record and process initialization arguments.
@@ -74,12 +97,15 @@ class NeuralNetwork(metaclass=ABCMeta):
             'input_shape': input_shape, 'n_targets': n_targets,
             'layers_config': layers_config, 'top_filter': top_filter,
             'use_dynamic': use_dynamic, 'binary_tracks': binary_tracks,
-            'norm_params': norm_params
+            'norm_params': norm_params, 'context_window': context_window,
+            'static_targets': static_targets, 'use_dataset': use_dataset
         }
         self._init_arguments.update(kwargs)
         self._validate_args()
         # Declare common attributes to contain the network's structure.
         self.holders = {}
+        self._input_iterator = None
+        self._dataset_initializers = {}
         self.layers = OrderedDict()
         self.readouts = {}
         self.training_function = None
@@ -250,6 +276,17 @@ class NeuralNetwork(metaclass=ABCMeta):
                     )
             else:
                 self._init_arguments['binary_tracks'] = None
+        # Validate the in-graph input and targets building parameters.
+        check_type_validity(self.context_window, int, 'context_window')
+        if self.context_window < 0:
+            raise ValueError("'context_window' should be a positive int.")
+        check_type_validity(self.static_targets, bool, 'static_targets')
+        check_type_validity(self.use_dataset, bool, 'use_dataset')
+        if self._builds_input_stage() and len(self.input_shape) != 3:
+            raise ValueError(
+                "In-graph context windows and dynamic targets require "
+                "batches of sequences: 'input_shape' must be of length 3."
+            )
         # Validate the model's normalization parameters.
         norm_params = self.norm_params
         check_type_validity(
@@ -263,21 +300,88 @@ class NeuralNetwork(metaclass=ABCMeta):
 
     @onetimemethod
     def _build_placeholders(self):
-        """Build the network's placeholders."""
-        self.holders['input'] = tf.placeholder(tf.float32, self.input_shape)
+        """Build the network's placeholders.
+
+        If `use_dataset` is True, the input data, targets and (optional)
+        batch sizes placeholders default to the outputs of an iterator,
+        so that data may either be fed or drawn from a tensorflow Dataset
+        (see `set_dataset`).
+        """
+        # Gather the shapes and types of the data placeholders.
         n_targets = self.n_targets
-        if self.use_dynamic:
+        if self.use_dynamic and not self.static_targets:
             n_binary = len(self.binary_tracks) if self.binary_tracks else 0
             n_targets += 2 * (self.n_targets - n_binary)
-        self.holders['targets'] = tf.placeholder(
-            tf.float32, [*self.input_shape[:-1], n_targets]
-        )
-        self.holders['keep_prob'] = tf.placeholder(tf.float32, ())
+        shapes = [self.input_shape, [*self.input_shape[:-1], n_targets]]
+        types = [tf.float32, tf.float32]
         if len(self.input_shape) == 3:
-            self.holders['batch_sizes'] = (
-                tf.placeholder(tf.int32, [self.input_shape[0]])
+            shapes.append([self.input_shape[0]])
+            types.append(tf.int32)
+        names = ('input', 'targets', 'batch_sizes')
+        # Optionally build placeholders defaulting to an iterator's outputs.
+        if self.use_dataset:
+            self._input_iterator = tf.data.Iterator.from_structure(
+                tuple(types), tuple(tf.TensorShape(shape) for shape in shapes)
+            )
+            defaults = self._input_iterator.get_next()
+            for name, default, shape in zip(names, defaults, shapes):
+                self.holders[name] = (
+                    tf.placeholder_with_default(default, shape)
+                )
+        # Otherwise, build basic placeholders.
+        else:
+            for name, dtype, shape in zip(names, types, shapes):
+                self.holders[name] = tf.placeholder(dtype, shape)
+        self.holders['keep_prob'] = tf.placeholder(tf.float32, ())
+        self._build_input_stage()
+
+    @onetimemethod
+    def _build_input_stage(self):
+        """Optionally build input context windows and dynamic targets.
+
+        When doing so, the actual placeholders are moved to the
+        '_raw_input' and '_raw_targets' keys of the `holders` attribute,
+        while the 'input' and 'targets' keys are assigned the tensors
+        derived from them, on which the rest of the network is built.
+        """
+        # Build context windows of the raw input frames.
+        if self.context_window:
+            self.holders['_raw_input'] = self.holders['input']
+            self.holders['input'] = build_context_windows(
+                self.holders['_raw_input'], self.context_window
+            )
+        # Compute the dynamic features of the continuous raw targets.
+        if self.use_dynamic and self.static_targets:
+            static = self.holders['targets']
+            self.holders['_raw_targets'] = static
+            if self.binary_tracks:
+                continuous = [
+                    i for i in range(self.n_targets)
+                    if i not in self.binary_tracks
+                ]
+                static = tf.stack(
+                    [static[..., i] for i in continuous], axis=-1
+                )
+            # Match the features produced by the corpora loading functions.
+            n_static = static.shape[-1].value
+            dynamic = add_dynamic_features(
+                static, window=5, axis=-1,
+                batch_sizes=self.holders['batch_sizes']
+            )[..., n_static:]
+            self.holders['targets'] = tf.concat(
+                [self.holders['_raw_targets'], dynamic], axis=-1
             )
 
+    def _builds_input_stage(self):
+        """Return whether inputs or targets are processed in-graph."""
+        return bool(
+            self.context_window or (self.use_dynamic and self.static_targets)
+        )
+
+    def _get_fed_holder(self, name):
+        """Return the placeholder to feed for 'input' or 'targets' data."""
+        return self.holders.get('_raw_' + name, self.holders[name])
+
     @onetimemethod
     def _build_hidden_layers(self):
         """Build the network's hidden layers."""
@@ -363,16 +467,22 @@ class NeuralNetwork(metaclass=ABCMeta):
         """
         return NotImplemented
 
-    def get_feed_dict(self, input_data, targets=None, keep_prob=1):
+    def get_feed_dict(self, input_data=None, targets=None, keep_prob=1):
         """Build a tensorflow feeding dictionary out of provided arguments.
 
-        input_data : data to feed to the network
+        input_data : optional data to feed to the network (otherwise,
+                     data is drawn from the dataset set up through
+                     the `set_dataset` method)
         targets    : optional true targets associated with the inputs
         keep_prob  : dropout keep-probability to use (default 1)
         """
+        # Handle the case when data is drawn from a dataset.
+        if input_data is None:
+            return {self.holders['keep_prob']: keep_prob}
         # Build the basic feed dict.
+        input_holder = self._get_fed_holder('input')
         feed_dict = {
-            self.holders['input']: input_data,
+            input_holder: input_data,
             self.holders['keep_prob']: keep_prob
         }
         # Alter data and update the feed dict when using batches of sequences.
@@ -382,22 +492,73 @@ class NeuralNetwork(metaclass=ABCMeta):
             if targets is not None:
                 targets, _ = sequences_to_batch(targets, length)
             feed_dict.update({
-                self.holders['input']: input_data,
+                input_holder: input_data,
                 self.holders['batch_sizes']: batch_sizes
             })
         # Add the target data to the feed dict, if any.
         if targets is not None:
-            feed_dict[self.holders['targets']] = targets
+            feed_dict[self._get_fed_holder('targets')] = targets
         # Return the defined feed dict.
         return feed_dict
 
-    def run_training_function(self, input_data, targets, keep_prob=1):
+    def set_dataset(self, dataset):
+        """Set up a dataset from which to draw data when none is fed.
+
+        dataset : tensorflow.data.Dataset yielding tuples of input data
+                  and targets, plus batch sizes when the network takes
+                  batches of sequences as input, e.g. built using the
+                  `ac2art.internal.tf_utils.build_utterances_dataset`
+                  function
+
+        Once a dataset is set, the `run_training_function` and `score`
+        methods may be called without data, so as to use the dataset's
+        next batch, which avoids copying data through feed dicts.
+        Calling this method again restarts iterating over the dataset
+        (tensorflow.errors.OutOfRangeError is raised once it is over).
+
+        Datasets yielding (shuffled) frames rather than sequences are
+        rejected when the network builds context windows or dynamic
+        targets, as these would mix up unrelated frames.
+
+        This method is only available if the network was instantiated
+        with `use_dataset=True`.
+        """
+        if self._input_iterator is None:
+            raise RuntimeError(
+                "Datasets may only be set on networks instantiated "
+                "with `use_dataset=True`."
+            )
+        if self._builds_input_stage():
+            input_shape = tf.TensorShape(dataset.output_shapes[0])
+            if input_shape.ndims != 3:
+                raise ValueError(
+                    "In-graph context windows and dynamic targets require "
+                    "a dataset yielding batches of sequences."
+                )
+        if dataset not in self._dataset_initializers:
+            self._dataset_initializers[dataset] = (
+                self._input_iterator.make_initializer(dataset)
+            )
+        self.session.run(self._dataset_initializers[dataset])
+
+    def run_training_function(
+            self, input_data=None, targets=None, keep_prob=1
+        ):
         """Run a training step of the model.
 
-        input_data : samples to feed to the network (2-D numpy.ndarray)
+        input_data : samples to feed to the network (2-D numpy.ndarray),
+                     or None to use a batch from the dataset set up
+                     through the `set_dataset` method
         targets    : target values associated with the input data
         keep_prob  : probability for each unit to have its outputs used in
                      the training procedure (float in [0., 1.], default 1.)
+
+        To have the next batches loaded while a training step is run,
+        feed batches yielded by the `iterate_dataset` function of the
+        `ac2art.corpora.<corpus>.load` submodules using threads (with
+        `concatenate=True` when the network takes 2-D inputs), e.g.:
+        >>> for batch in iterate_dataset('train', 32, n_threads=2):
+        ...     model.run_training_function(*batch)
         """
         feed_dict = self.get_feed_dict(input_data, targets, keep_prob)
         self.session.run(self.training_function, feed_dict)
@@ -415,10 +576,12 @@ class NeuralNetwork(metaclass=ABCMeta):
         return prediction
 
     @abstractmethod
-    def score(self, input_data, targets):
+    def score(self, input_data=None, targets=None):
         """Return the root mean square prediction error of the network.
 
         input_data : input data sample to evalute the model on which
+                     (if None, use a batch from the dataset set up
+                     through the `set_dataset` method)
         targets    : true targets associated with the input dataset
         """
         return NotImplemented
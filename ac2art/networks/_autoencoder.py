@@ -46,7 +46,8 @@ class AutoEncoder(MultilayerPerceptron):
     def __init__(
             self, input_shape, n_targets, encoder_config, decoder_config,
             encoder_filter=None, decoder_filter=None, use_dynamic=True,
-            binary_tracks=None, norm_params=None, optimizer=None
+            binary_tracks=None, norm_params=None, optimizer=None,
+            use_dataset=False
         ):
         """Instantiate the auto-encoder network.
 
@@ -69,6 +70,9 @@ class AutoEncoder(MultilayerPerceptron):
                          (np.ndarray)
         optimizer      : tensorflow.train.Optimizer instance (by default,
                          Adam optimizer with 1e-3 learning rate)
+        use_dataset    : whether to enable drawing data from a tensorflow
+                         Dataset set up through the `set_dataset` method,
+                         rather than only feeding it (bool, default False)
 
         The `encoder_config` and `decoder_config` arguments should
         be of a similar form as the `layers_config` argument of any
@@ -90,7 +94,7 @@ class AutoEncoder(MultilayerPerceptron):
             use_dynamic=use_dynamic, binary_tracks=binary_tracks,
             encoder_config=encoder_config, encoder_filter=encoder_filter,
             decoder_config=decoder_config, decoder_filter=decoder_filter,
-            optimizer=optimizer
+            use_dataset=use_dataset, optimizer=optimizer
         )
         # Remove unused inherited argument.
         self._init_arguments.pop('top_filter')
@@ -106,6 +110,8 @@ class AutoEncoder(MultilayerPerceptron):
         """
         init_args, rebuild_init = super()._adjust_init_arguments_for_saving()
         init_args.pop('layers_config')
+        init_args.pop('context_window')
+        init_args.pop('static_targets')
         return init_args, rebuild_init
 
     @onetimemethod
@@ -235,7 +241,7 @@ class AutoEncoder(MultilayerPerceptron):
             decoder_pred[i] = dec_pred
         return encoder_pred, decoder_pred
 
-    def score(self, input_data, targets):
+    def score(self, input_data=None, targets=None):
         """Compute the root mean square prediction errors of the network.
 
         input_data : input data to be rebuilt by the network's decoder part
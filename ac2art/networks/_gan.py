@@ -48,33 +48,45 @@ class GenerativeAdversarialNets(MultilayerPerceptron):
     def __init__(
             self, input_shape, n_targets, layers_config, discr_config,
             top_filter=None, use_dynamic=True, binary_tracks=None,
-            norm_params=None, optimizer=None
+            norm_params=None, optimizer=None, context_window=0,
+            static_targets=False, use_dataset=False
         ):
         """Instantiate a multilayer perceptron for regression tasks.
 
-        input_shape   : shape of the input data fed to the network,
-                        of either [n_samples, input_size] shape
-                        or [n_batches, max_length, input_size],
-                        where the last axis must be fixed (non-None)
-                        (tuple, list, tensorflow.TensorShape)
-        n_targets     : number of targets to predict,
-                        notwithstanding dynamic features
-        layers_config : list of tuples specifying a layer configuration,
-                        made of a layer class (or short name), a number
-                        of units (or a cutoff frequency for filters) and
-                        an optional dict of keyword arguments
-        discr_config  : list of tuples specifying the discriminator's layers
-                        (similar format as `layers_config`)
-        top_filter    : optional tuple specifying a SignalFilter to use
-                        on top of the generator network's raw prediction
-        use_dynamic   : whether to produce dynamic features and use them
-                        when training the model (bool, default True)
-        binary_tracks : optional list of targets which are binary-valued
-                        (and should therefore not have delta counterparts)
-        norm_params   : optional normalization parameters of the targets
-                        (np.ndarray)
-        optimizer     : tensorflow.train.Optimizer instance (by default,
-                        Adam optimizer with 1e-3 learning rate)
+        input_shape    : shape of the input data fed to the network,
+                         of either [n_samples, input_size] shape
+                         or [n_batches, max_length, input_size],
+                         where the last axis must be fixed (non-None)
+                         (tuple, list, tensorflow.TensorShape)
+        n_targets      : number of targets to predict,
+                         notwithstanding dynamic features
+        layers_config  : list of tuples specifying a layer configuration,
+                         made of a layer class (or short name), a number
+                         of units (or a cutoff frequency for filters) and
+                         an optional dict of keyword arguments
+        discr_config   : list of tuples specifying the discriminator's layers
+                         (similar format as `layers_config`)
+        top_filter     : optional tuple specifying a SignalFilter to use
+                         on top of the generator network's raw prediction
+        use_dynamic    : whether to produce dynamic features and use them
+                         when training the model (bool, default True)
+        binary_tracks  : optional list of targets which are binary-valued
+                         (and should therefore not have delta counterparts)
+        norm_params    : optional normalization parameters of the targets
+                         (np.ndarray)
+        optimizer      : tensorflow.train.Optimizer instance (by default,
+                         Adam optimizer with 1e-3 learning rate)
+        context_window : half-size of the context windows of input frames
+                         to build within the network (int, default 0)
+        static_targets : whether targets are fed without their dynamic
+                         features, which are then computed within the
+                         network (bool, default False)
+        use_dataset    : whether to enable drawing data from a tensorflow
+                         Dataset set up through the `set_dataset` method,
+                         rather than only feeding it (bool, default False)
+
+        Note: `context_window` and `static_targets` may only be used
+              with batches of sequences as input (3-D `input_shape`).
         """
         # Arguments serve modularity ; pylint: disable=too-many-arguments
         # Use the basic API init instead of that of the direct parent.
@@ -82,7 +94,9 @@ class GenerativeAdversarialNets(MultilayerPerceptron):
         NeuralNetwork.__init__(
             self, input_shape, n_targets, layers_config,
             top_filter, use_dynamic, binary_tracks, norm_params,
-            discr_config=discr_config, optimizer=optimizer
+            context_window, static_targets, use_dataset,
+            discr_config=discr_config,
+            optimizer=optimizer
         )
 
     @onetimemethod
@@ -215,11 +229,14 @@ class GenerativeAdversarialNets(MultilayerPerceptron):
         self.training_function = training_function
 
     def run_training_function(
-            self, input_data, target_data, keep_prob=1, network='both'
+            self, input_data=None, target_data=None, keep_prob=1,
+            network='both'
         ):
         """Run a training step, fitting both networks adversarially.
 
         input_data  : input data to feed to the generator network
+                      (if None, use a batch from the dataset set up
+                      through the `set_dataset` method)
         keep_prob   : probability for each unit to have its outputs used in
                       the training procedure (float in [0., 1.], default 1.)
         network     : str identifying the model(s) to fit, among
@@ -229,10 +246,12 @@ class GenerativeAdversarialNets(MultilayerPerceptron):
         feed_dict = self.get_feed_dict(input_data, target_data, keep_prob)
         self.session.run(self.training_function(network), feed_dict)
 
-    def score(self, input_data, target_data, network='generator'):
+    def score(self, input_data=None, target_data=None, network='generator'):
         """Score the network(s) based on the provided data.
 
         input_data : input data sample to evalute the model on which
+                     (if None, use a batch from the dataset set up
+                     through the `set_dataset` method)
         targets    : true targets associated with the input dataset
         network    : network(s) to score ; either 'generator',
                      'discriminator' or 'both'
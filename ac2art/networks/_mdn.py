@@ -54,24 +54,31 @@ class MixtureDensityNetwork(MultilayerPerceptron):
 
     def __init__(
             self, input_shape, n_targets, n_components, layers_config,
-            top_filter=None, norm_params=None, optimizer=None
+            top_filter=None, norm_params=None, optimizer=None,
+            context_window=0, use_dataset=False
         ):
         """Instantiate the mixture density network.
 
-        input_shape   : shape of the 2-D input data fed to the network,
-                        with the number of samples as first component
-        n_targets     : number of targets to predict
-        n_components  : number of mixture components to model
-        layers_config : list of tuples specifying a layer configuration,
-                        made of a layer class (or short name), a number
-                        of units (or a cutoff frequency for filters) and
-                        an optional dict of keyword arguments
-        top_filter    : optional tuple specifying a SignalFilter to use
-                        on top of the network's raw prediction
-        norm_params   : optional normalization parameters of the targets
-                        (np.ndarray)
-        optimizer     : tensorflow.train.Optimizer instance (by default,
-                        Adam optimizer with 1e-3 learning rate)
+        input_shape    : shape of the 2-D input data fed to the network,
+                         with the number of samples as first component
+        n_targets      : number of targets to predict
+        n_components   : number of mixture components to model
+        layers_config  : list of tuples specifying a layer configuration,
+                         made of a layer class (or short name), a number
+                         of units (or a cutoff frequency for filters) and
+                         an optional dict of keyword arguments
+        top_filter     : optional tuple specifying a SignalFilter to use
+                         on top of the network's raw prediction
+        norm_params    : optional normalization parameters of the targets
+                         (np.ndarray)
+        optimizer      : tensorflow.train.Optimizer instance (by default,
+                         Adam optimizer with 1e-3 learning rate)
+        context_window : half-size of the context windows of input frames
+                         to build within the network (int, default 0;
+                         only available with 3-D `input_shape`)
+        use_dataset    : whether to enable drawing data from a tensorflow
+                         Dataset set up through the `set_dataset` method,
+                         rather than only feeding it (bool, default False)
         """
         # Arguments serve modularity; pylint: disable=too-many-arguments
         # Use the basic API init instead of that of the direct parent.
@@ -80,6 +87,7 @@ class MixtureDensityNetwork(MultilayerPerceptron):
         NeuralNetwork.__init__(
             self, input_shape, n_targets, layers_config, top_filter,
             use_dynamic=False, binary_tracks=None, norm_params=norm_params,
+            context_window=context_window, use_dataset=use_dataset,
             optimizer=optimizer, n_components=n_components
         )
 
@@ -95,6 +103,7 @@ class MixtureDensityNetwork(MultilayerPerceptron):
         init_arguments, rebuild = super()._adjust_init_arguments_for_saving()
         init_arguments.pop('use_dynamic')
         init_arguments.pop('binary_tracks')
+        init_arguments.pop('static_targets')
         return init_arguments, rebuild
 
     @onetimemethod
@@ -222,11 +231,13 @@ class MixtureDensityNetwork(MultilayerPerceptron):
         self.training_function = train_step
 
     def get_feed_dict(
-            self, input_data, targets=None, keep_prob=1, loss='rmse'
+            self, input_data=None, targets=None, keep_prob=1, loss='rmse'
         ):
         """Return a tensorflow feeding dictionary out of provided arguments.
 
-        input_data : data to feed to the network
+        input_data : optional data to feed to the network (otherwise,
+                     data is drawn from the dataset set up through
+                     the `set_dataset` method)
         targets    : optional true targets associated with the inputs
         keep_prob  : probability to use for the dropout layers (default 1)
         loss       : loss computed (str in {'likelihood', 'rmse'})
@@ -236,12 +247,15 @@ class MixtureDensityNetwork(MultilayerPerceptron):
         return super().get_feed_dict(input_data, targets, keep_prob)
 
     def run_training_function(
-            self, input_data, targets, keep_prob=1, loss='likelihood'
+            self, input_data=None, targets=None, keep_prob=1,
+            loss='likelihood'
         ):
         """Run a training step of the model.
 
         input_data : a 2-D numpy.ndarray (or pandas.DataFrame) where
                      each row is a sample to feed to the model
+                     (if None, use a batch from the dataset set up
+                     through the `set_dataset` method)
         targets    : target values associated with the input data
                      (numpy.ndarray or pandas structure)
         keep_prob  : probability for each unit to have its outputs used in
@@ -253,10 +267,12 @@ class MixtureDensityNetwork(MultilayerPerceptron):
         feed_dict = self.get_feed_dict(input_data, targets, keep_prob, loss)
         self.session.run(self.training_function(loss), feed_dict)
 
-    def score(self, input_data, targets, loss='rmse'):
+    def score(self, input_data=None, targets=None, loss='rmse'):
         """Return a given metric evaluating the network.
 
         input_data : input data sample to evalute the model on which
+                     (if None, use a batch from the dataset set up
+                     through the `set_dataset` method)
         targets    : true targets associated with the input dataset
         loss       : quantity to score ; either 'likelihood' of the
                      produced GMM or 'rmse' of the derived prediction
@@ -59,36 +59,49 @@ class MultilayerPerceptron(NeuralNetwork):
     def __init__(
             self, input_shape, n_targets, layers_config, top_filter=None,
             use_dynamic=True, binary_tracks=None, norm_params=None,
-            optimizer=None
+            optimizer=None, context_window=0, static_targets=False,
+            use_dataset=False
         ):
         """Instantiate a multilayer perceptron for regression tasks.
 
-        input_shape   : shape of the input data fed to the network,
-                        of either [n_samples, input_size] shape
-                        or [n_batches, max_length, input_size],
-                        where the last axis must be fixed (non-None)
-                        (tuple, list, tensorflow.TensorShape)
-        n_targets     : number of targets to predict,
-                        notwithstanding dynamic features
-        layers_config : list of tuples specifying a layer configuration,
-                        made of a layer class (or short name), a number
-                        of units (or a cutoff frequency for filters) and
-                        an optional dict of keyword arguments
-        top_filter    : optional tuple specifying a SignalFilter to use
-                        on top of the network's raw prediction
-        use_dynamic   : whether to produce dynamic features and use them
-                        when training the model (bool, default True)
-        binary_tracks : optional list of targets which are binary-valued
-                        (and should therefore not have delta counterparts)
-        norm_params   : optional normalization parameters of the targets
-                        (np.ndarray)
-        optimizer     : tensorflow.train.Optimizer instance (by default,
-                        Adam optimizer with 1e-3 learning rate)
+        input_shape    : shape of the input data fed to the network,
+                         of either [n_samples, input_size] shape
+                         or [n_batches, max_length, input_size],
+                         where the last axis must be fixed (non-None)
+                         (tuple, list, tensorflow.TensorShape)
+        n_targets      : number of targets to predict,
+                         notwithstanding dynamic features
+        layers_config  : list of tuples specifying a layer configuration,
+                         made of a layer class (or short name), a number
+                         of units (or a cutoff frequency for filters) and
+                         an optional dict of keyword arguments
+        top_filter     : optional tuple specifying a SignalFilter to use
+                         on top of the network's raw prediction
+        use_dynamic    : whether to produce dynamic features and use them
+                         when training the model (bool, default True)
+        binary_tracks  : optional list of targets which are binary-valued
+                         (and should therefore not have delta counterparts)
+        norm_params    : optional normalization parameters of the targets
+                         (np.ndarray)
+        optimizer      : tensorflow.train.Optimizer instance (by default,
+                         Adam optimizer with 1e-3 learning rate)
+        context_window : half-size of the context windows of input frames
+                         to build within the network (int, default 0)
+        static_targets : whether targets are fed without their dynamic
+                         features, which are then computed within the
+                         network (bool, default False)
+        use_dataset    : whether to enable drawing data from a tensorflow
+                         Dataset set up through the `set_dataset` method,
+                         rather than only feeding it (bool, default False)
+
+        Note: `context_window` and `static_targets` may only be used
+              with batches of sequences as input (3-D `input_shape`).
         """
         # Arguments serve modularity; pylint: disable=too-many-arguments
         super().__init__(
             input_shape, n_targets, layers_config, top_filter,
-            use_dynamic, binary_tracks, norm_params, optimizer=optimizer
+            use_dynamic, binary_tracks, norm_params, context_window,
+            static_targets, use_dataset, optimizer=optimizer
         )
 
     def _adjust_init_arguments_for_saving(self):
@@ -222,10 +235,12 @@ class MultilayerPerceptron(NeuralNetwork):
         else:
             self.training_function = fit_weights
 
-    def score(self, input_data, targets):
+    def score(self, input_data=None, targets=None):
         """Return the root mean square prediction error of the network.
 
         input_data : input data sample to evalute the model on which
+                     (if None, use a batch from the dataset set up
+                     through the `set_dataset` method)
         targets    : true targets associated with the input dataset
 
         For binary-valued targets, cross-entropy is returned.
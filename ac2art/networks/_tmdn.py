@@ -98,11 +98,13 @@ class TrajectoryMDN(MixtureDensityNetwork):
         self.readouts['raw_prediction'] = tf.cast(trajectory, tf.float32)
 
     def get_feed_dict(
-            self, input_data, targets=None, keep_prob=1, loss='rmse'
+            self, input_data=None, targets=None, keep_prob=1, loss='rmse'
         ):
         """Return a tensorflow feeding dictionary out of provided arguments.
 
-        input_data : data to feed to the network
+        input_data : optional data to feed to the network (otherwise,
+                     data is drawn from the dataset set up through
+                     the `set_dataset` method)
         targets    : optional true targets associated with the inputs
         keep_prob  : probability to use for the dropout layers (default 1)
         loss       : loss computed (str in {'likelihood', 'rmse'})
@@ -111,7 +113,12 @@ class TrajectoryMDN(MixtureDensityNetwork):
         # If needed, generate a delta weights matrix and set it to be fed.
         if loss == 'rmse':
             if len(self.input_shape) == 2 or self.input_shape[1] is None:
-                length = feed_dict[self.holders['input']].shape[-2]
+                if input_data is None:
+                    raise ValueError(
+                        "TrajectoryMDN 'rmse' loss requires data to be fed, "
+                        "so as to build its delta weights matrix."
+                    )
+                length = feed_dict[self._get_fed_holder('input')].shape[-2]
                 weights = build_dynamic_weights_matrix(
                     length, window=5, complete=True
                 )
@@ -49,7 +49,6 @@ setuptools.setup(
         'numpy >= 1.12',
         'pandas >= 0.20',
         'scipy >= 1.0',
-        'sphfile >= 1.0',
         'tensorflow >= 1.8'
     ],
     classifiers=[
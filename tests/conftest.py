@@ -0,0 +1,84 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared fixtures for the tests of ac2art."""
+
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from ac2art.utils import CONSTANTS
+
+
+SPEAKERS = ['spk1', 'spk2']
+UTTERANCES = ['spk1_001', 'spk1_002', 'spk1_003', 'spk2_001', 'spk2_002']
+ARTICULATORS = ['tt_x', 'tt_y', 'td_x', 'td_y']
+
+
+@pytest.fixture
+def speakers():
+    """Return the list of speakers of the 'fake' corpus."""
+    return list(SPEAKERS)
+
+
+@pytest.fixture
+def utterances():
+    """Return the list of utterances of the 'fake' corpus."""
+    return list(UTTERANCES)
+
+
+@pytest.fixture
+def fake_corpus(tmp_path, monkeypatch):
+    """Set up a small processed 'fake' corpus of random features.
+
+    The corpus comprises raw 'mfcc', 'ema' and 'voicing' features of
+    a few utterances from two speakers. Its raw loaders module is
+    registered so that the prototype wrappers may be used with it.
+
+    Return the path to the corpus' processed data folder.
+    """
+    main_folder = str(tmp_path / 'fake')
+    monkeypatch.setitem(CONSTANTS, 'fake_processed_folder', main_folder)
+    # Register a minimal raw loaders module for the corpus.
+    loaders = types.ModuleType('ac2art.corpora.fake.raw._loaders')
+    loaders.SPEAKERS = SPEAKERS
+    loaders.get_utterances_list = lambda speaker=None: [
+        name for name in UTTERANCES
+        if speaker is None or name.startswith(speaker + '_')
+    ]
+    monkeypatch.setitem(sys.modules, loaders.__name__, loaders)
+    # Write random features files, of varying lengths and scales.
+    rng = np.random.RandomState(0)
+    widths = {'mfcc': 6, 'ema': len(ARTICULATORS), 'voicing': 1}
+    for file_type, width in widths.items():
+        os.makedirs(os.path.join(main_folder, file_type))
+        for i, name in enumerate(UTTERANCES):
+            data = rng.normal(i, 1 + i, size=(20 + 7 * i, width))
+            np.save(
+                os.path.join(
+                    main_folder, file_type, name + '_%s.npy' % file_type
+                ),
+                data.astype(np.float32)
+            )
+    with open(os.path.join(main_folder, 'ema', 'articulators'), 'w') as file:
+        file.write('\n'.join(ARTICULATORS))
+    return main_folder
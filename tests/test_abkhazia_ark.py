@@ -0,0 +1,134 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the binary Kaldi ark and scp files tools of `abkhazia`."""
+
+import io
+
+import numpy as np
+import pytest
+
+from ac2art.external.abkhazia import (
+    build_ark_writer, read_ark_file, read_ark_object, read_binary_ark,
+    read_scp
+)
+
+
+def get_records():
+    """Return a list of (utterance, array) records of float and double."""
+    rng = np.random.RandomState(0)
+    return [
+        ('utt_a', rng.normal(size=(5, 3)).astype(np.float32)),
+        ('utt_b', rng.normal(size=(1, 3))),
+        ('utt_c', rng.normal(size=(4, 2)).astype(np.float32))
+    ]
+
+
+def check_records(read, expected):
+    """Check that read records match expected ones, types included."""
+    read = list(read)
+    assert [name for name, _ in read] == [name for name, _ in expected]
+    for (_, array), (_, reference) in zip(read, expected):
+        assert array.dtype == reference.dtype
+        np.testing.assert_array_equal(array, reference)
+
+
+@pytest.mark.parametrize('extension', ['ark', 'scp'])
+def test_ark_round_trip(tmp_path, extension):
+    """Test that matrices written using `build_ark_writer` are read back."""
+    path = str(tmp_path / ('feats.' + extension))
+    records = get_records()
+    write_record = build_ark_writer(path)
+    for utterance, array in records:
+        write_record(utterance, array)
+    ark_path = str(tmp_path / 'feats.ark')
+    check_records(read_binary_ark(ark_path), records)
+    check_records(read_ark_file(ark_path), records)
+    if extension == 'scp':
+        check_records(read_scp(path), records)
+        check_records(read_ark_file(path), records)
+    with pytest.raises(FileExistsError):
+        build_ark_writer(path)
+
+
+def test_text_mode_ark(tmp_path):
+    """Test that text-mode ark files are parsed as text."""
+    path = str(tmp_path / 'feats.ark')
+    with open(path, 'w') as file:
+        file.write('utt_a  [\n  1 2 ]\nutt_b  [\n  3 4\n  5 6 ]\n')
+    records = list(read_ark_file(path))
+    assert [name for name, _ in records] == ['utt_a', 'utt_b']
+    np.testing.assert_array_equal(records[1][1], [[3, 4], [5, 6]])
+
+
+def build_compressed(token, min_value, value_range, shape, payload):
+    """Build the binary record of a compressed matrix (without key)."""
+    header = np.array(
+        [(min_value, value_range) + shape],
+        dtype=[('min', '<f4'), ('range', '<f4'), ('rows', '<i4'),
+               ('cols', '<i4')]
+    )
+    return b'\0B' + token + b' ' + header.tobytes() + payload
+
+
+def test_read_compressed_one_byte():
+    """Test the decoding of one-byte linearly-quantized matrices (CM3)."""
+    data = np.array([[0, 51, 255], [102, 204, 153]], dtype=np.uint8)
+    record = build_compressed(b'CM3', -1., 2., (2, 3), data.tobytes())
+    matrix = read_ark_object(io.BytesIO(record))
+    assert matrix.dtype == np.float32
+    expected = -1 + 2 * data.astype(float) / 255
+    np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+
+def test_read_compressed_two_bytes():
+    """Test the decoding of two-bytes linearly-quantized matrices (CM2)."""
+    data = np.array([[0, 65535], [13107, 52428]], dtype='<u2')
+    record = build_compressed(b'CM2', 10., 5., (2, 2), data.tobytes())
+    matrix = read_ark_object(io.BytesIO(record))
+    expected = 10 + 5 * data.astype(float) / 65535
+    np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+
+def test_read_compressed_column_headers():
+    """Test the decoding of column-wise percentiles matrices (CM)."""
+    # With min 0 and range 65535, percentile headers are read as is.
+    percentiles = np.array(
+        [[0, 16384, 49152, 65535], [100, 200, 300, 400]], dtype='<u2'
+    )
+    data = np.array([[0, 64, 128, 192, 255], [0, 32, 64, 160, 255]])
+    record = build_compressed(
+        b'CM', 0., 65535., (5, 2),
+        percentiles.tobytes() + data.astype(np.uint8).tobytes()
+    )
+    matrix = read_ark_object(io.BytesIO(record))
+    expected = np.array([
+        [0, 16384, 32768, 49152, 65535],
+        [100, 150, 200, 275, 400]
+    ]).T
+    assert matrix.shape == (5, 2)
+    np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+
+
+def test_read_unsupported_object():
+    """Test that unsupported or text-mode objects are rejected."""
+    with pytest.raises(ValueError):
+        read_ark_object(io.BytesIO(b'\0BFOO 1 2'))
+    with pytest.raises(ValueError):
+        read_ark_object(io.BytesIO(b' [ 1 2 ]'))
@@ -0,0 +1,53 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the ark-like text files reader of `ac2art.external.abkhazia`."""
+
+import numpy as np
+import pytest
+
+from ac2art.external.abkhazia import read_ark_file
+
+
+TEXT_ARK = (
+    'single  [\n  7 8 9 ]\n'
+    'multiple  [\n  1 2 3\n  4 5 6\n  -1.5 0 2e-1 ]\n'
+)
+
+
+def test_read_txt_ark_file(tmp_path):
+    """Test that text arks with one-row and multi-row matrices are read."""
+    path = str(tmp_path / 'feats.txt')
+    with open(path, 'w') as file:
+        file.write(TEXT_ARK)
+    records = list(read_ark_file(path))
+    assert [name for name, _ in records] == ['single', 'multiple']
+    np.testing.assert_array_equal(records[0][1], [[7, 8, 9]])
+    np.testing.assert_array_equal(
+        records[1][1], [[1, 2, 3], [4, 5, 6], [-1.5, 0, .2]]
+    )
+
+
+def test_read_txt_ark_file_ragged(tmp_path):
+    """Test that matrices with inconsistent rows widths are rejected."""
+    path = str(tmp_path / 'feats.txt')
+    with open(path, 'w') as file:
+        file.write('ragged  [\n  1 2 3\n  4 5 ]\n')
+    with pytest.raises(ValueError):
+        list(read_ark_file(path))
@@ -0,0 +1,98 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the in-process cache of corpus metadata."""
+
+import os
+
+import numpy as np
+import pytest
+
+from ac2art.corpora.prototype.preprocess import build_normalization_functions
+from ac2art.corpora.prototype.utils import (
+    drop_cached_values, get_articulators_index, load_norm_parameters
+)
+from ac2art.corpora.prototype.utils._utils import _get_normfile_path
+
+
+@pytest.fixture
+def clean_cache(fake_corpus):
+    """Drop any cached values of the 'fake' corpus, before and after use."""
+    drop_cached_values(fake_corpus)
+    yield fake_corpus
+    drop_cached_values(fake_corpus)
+
+
+def write_articulators(main_folder, articulators):
+    """Overwrite the list of articulators of a corpus' EMA data."""
+    path = os.path.join(main_folder, 'ema', 'articulators')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(articulators))
+
+
+def test_norm_parameters_cache(clean_cache):
+    """Test that cached parameters are served until re-computed."""
+    compute_moments, normalize_files = build_normalization_functions('fake')
+    compute_moments('ema')
+    parameters = load_norm_parameters(clean_cache, 'ema')
+    assert load_norm_parameters(clean_cache, 'ema')['global_means'] is (
+        parameters['global_means']
+    )
+    # Check that the file is not read again, until the cache is dropped.
+    path = _get_normfile_path(clean_cache, 'ema', None)
+    altered = dict(parameters, global_means=parameters['global_means'] + 1)
+    np.save(path, altered)
+    cached = load_norm_parameters(clean_cache, 'ema')['global_means']
+    np.testing.assert_array_equal(cached, parameters['global_means'])
+    # Check that normalizing files drops the cache.
+    normalize_files('ema', 'stds')
+    reloaded = load_norm_parameters(clean_cache, 'ema')['global_means']
+    np.testing.assert_array_equal(reloaded, altered['global_means'])
+    # Check that computing the moments again refreshes the cache.
+    compute_moments('ema')
+    refreshed = load_norm_parameters(clean_cache, 'ema')['global_means']
+    np.testing.assert_allclose(refreshed, parameters['global_means'])
+    assert refreshed is not cached
+
+
+def test_norm_parameters_read_only(clean_cache):
+    """Test that cached parameters may not be altered in place."""
+    compute_moments, _ = build_normalization_functions('fake')
+    compute_moments('ema')
+    parameters = load_norm_parameters(clean_cache, 'ema')
+    reference = parameters['global_stds'].copy()
+    with pytest.raises(ValueError):
+        parameters['global_stds'] *= 2
+    parameters['global_stds'] = parameters['global_stds'] * 2
+    np.testing.assert_array_equal(
+        load_norm_parameters(clean_cache, 'ema')['global_stds'], reference
+    )
+
+
+def test_articulators_index_cache(clean_cache):
+    """Test that articulators indexes are served until the cache is dropped."""
+    index = get_articulators_index('fake', None, ['td_x', 'tt_y'])
+    np.testing.assert_array_equal(index, [2, 1])
+    assert get_articulators_index('fake', None, ['td_x', 'tt_y']) is index
+    write_articulators(clean_cache, ['td_x', 'tt_y', 'tt_x', 'td_y'])
+    assert get_articulators_index('fake', None, ['td_x', 'tt_y']) is index
+    drop_cached_values(clean_cache)
+    np.testing.assert_array_equal(
+        get_articulators_index('fake', None, ['td_x', 'tt_y']), [0, 1]
+    )
@@ -0,0 +1,248 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the numpy data processing functions of ac2art."""
+
+import numpy as np
+import pytest
+import scipy.interpolate
+import scipy.signal
+
+from ac2art.internal.data_utils import (
+    add_dynamic_features, batch_to_ragged, batch_to_sequences,
+    bucket_by_length, build_context_windows, get_simple_difference,
+    interpolate_missing_values, lowpass_filter, ragged_to_batch,
+    ragged_to_sequences, resample_signal, sequences_to_batch,
+    sequences_to_ragged
+)
+
+
+@pytest.mark.parametrize('zero_padding', [True, False])
+@pytest.mark.parametrize('length', [0, 3, 11, 20])
+def test_build_context_windows(zero_padding, length):
+    """Test that context windows views match copies, with input dtype."""
+    frames = np.arange(length * 4, dtype=np.float32).reshape(length, 4)
+    windows = build_context_windows(frames, 5, zero_padding)
+    view = build_context_windows(frames, 5, zero_padding, as_view=True)
+    expected_length = length if zero_padding else max(length - 10, 0)
+    assert windows.shape == (expected_length, 44)
+    assert windows.dtype == view.dtype == np.float32
+    np.testing.assert_array_equal(windows, view)
+    if expected_length:
+        np.testing.assert_array_equal(
+            windows[0, 20:24] if zero_padding else windows[0, :4], frames[0]
+        )
+
+
+@pytest.mark.parametrize('shuffle', [True, False])
+@pytest.mark.parametrize('max_padding', [0, .2, .5])
+def test_bucket_by_length(shuffle, max_padding):
+    """Test that buckets cover all sequences and respect their bounds."""
+    lengths = np.random.RandomState(0).randint(1, 100, size=57)
+    batches, ratio = bucket_by_length(lengths, 8, max_padding, shuffle, 1)
+    indices = np.concatenate(batches)
+    assert sorted(indices) == list(range(len(lengths)))
+    padded_total = 0
+    for batch in batches:
+        batch_lengths = lengths[batch]
+        assert 1 <= len(batch) <= 8
+        padded = len(batch) * batch_lengths.max()
+        padded_total += padded
+        if len(batch) > 1:
+            assert 1 - batch_lengths.sum() / padded <= max_padding + 1e-12
+    assert np.isclose(ratio, 1 - lengths.sum() / padded_total)
+    # Check that batches do not overlap in terms of lengths.
+    bounds = sorted((lengths[b].min(), lengths[b].max()) for b in batches)
+    for (_, upper), (lower, _) in zip(bounds[:-1], bounds[1:]):
+        assert upper <= lower
+    # Check that shuffling is reproducible.
+    repeated, _ = bucket_by_length(lengths, 8, max_padding, shuffle, 1)
+    for batch, other in zip(batches, repeated):
+        np.testing.assert_array_equal(batch, other)
+
+
+@pytest.mark.parametrize('length', [None, 6])
+def test_sequences_batching_round_trip(length):
+    """Test that batched and ragged sequences may be split back."""
+    rng = np.random.RandomState(0)
+    sequences = [
+        rng.normal(size=(size, 3)).astype(np.float32) for size in (4, 9, 7)
+    ]
+    expected = [sequence[:length] for sequence in sequences]
+    # Check the round trip through a zero-padded batch.
+    batch, batch_sizes = sequences_to_batch(sequences, length)
+    assert batch.shape == (3, length or 9, 3)
+    assert batch.dtype == np.float32
+    np.testing.assert_array_equal(batch_sizes, [len(e) for e in expected])
+    split = batch_to_sequences(batch, batch_sizes)
+    assert len(split) == len(expected)
+    for sequence, reference in zip(split, expected):
+        np.testing.assert_array_equal(sequence, reference)
+    # Check the round trips through ragged arrays.
+    values, lengths = sequences_to_ragged(sequences)
+    for sequence, reference in zip(
+            ragged_to_sequences(values, lengths), sequences
+        ):
+        np.testing.assert_array_equal(sequence, reference)
+    ragged_batch, ragged_sizes = ragged_to_batch(values, lengths, length)
+    np.testing.assert_array_equal(ragged_batch, batch)
+    np.testing.assert_array_equal(ragged_sizes, batch_sizes)
+    flat, flat_sizes = batch_to_ragged(batch, batch_sizes)
+    np.testing.assert_array_equal(flat, np.concatenate(expected))
+    np.testing.assert_array_equal(flat_sizes, batch_sizes)
+
+
+def interpolate_channel(channel):
+    """Interpolate a channel's NaN values with a per-point spline."""
+    channel = channel.copy()
+    is_nan = np.isnan(channel)
+    spline = scipy.interpolate.splrep(
+        np.flatnonzero(~is_nan), channel[~is_nan], k=3
+    )
+    channel[is_nan] = scipy.interpolate.splev(np.flatnonzero(is_nan), spline)
+    return channel
+
+
+def test_interpolate_missing_values():
+    """Test NaN interpolation of 1-D and 2-D arrays, by channel groups."""
+    rng = np.random.RandomState(0)
+    array = np.cumsum(rng.normal(size=(60, 5)), axis=0)
+    # Set NaN runs at the start, middle and end of some channels,
+    # two channels sharing the same missing values' positions.
+    for column in (0, 1):
+        array[:3, column] = np.nan
+        array[20:26, column] = np.nan
+        array[-4:, column] = np.nan
+    array[30:33, 2] = np.nan
+    array[-1, 3] = np.nan
+    interpolated = interpolate_missing_values(array)
+    assert not np.isnan(interpolated).any()
+    assert np.isnan(array).sum() == 30
+    for column in range(5):
+        reference = (
+            interpolate_channel(array[:, column])
+            if np.isnan(array[:, column]).any() else array[:, column]
+        )
+        np.testing.assert_allclose(interpolated[:, column], reference)
+        # Check that 1-D arrays are handled the same way.
+        np.testing.assert_allclose(
+            interpolate_missing_values(array[:, column]), reference
+        )
+    # Check that arrays without missing values are returned as is.
+    np.testing.assert_array_equal(
+        interpolate_missing_values(array[:, 4]), array[:, 4]
+    )
+
+
+def get_reference_difference(array, lag):
+    """Return the difference between values at t + lag and t - lag."""
+    padding = np.ones((lag, array.shape[1]))
+    past = np.concatenate([padding * array[0], array[:-lag]])
+    future = np.concatenate([array[lag:], padding * array[-1]])
+    return future - past
+
+
+def get_reference_delta(array, window):
+    """Compute delta features as a weighted sum of simple differences."""
+    norm = 2 * sum(i ** 2 for i in range(1, window + 1))
+    return sum(
+        get_reference_difference(array, lag) * lag
+        for lag in range(1, window + 1)
+    ) / norm
+
+
+@pytest.mark.parametrize('lag', [1, 3])
+def test_get_simple_difference(lag):
+    """Test simple differences of single and batched sequences."""
+    batch = np.random.RandomState(0).normal(size=(2, 12, 4))
+    for array in batch:
+        np.testing.assert_allclose(
+            get_simple_difference(array, lag),
+            get_reference_difference(array, lag)
+        )
+    np.testing.assert_allclose(
+        get_simple_difference(batch, lag),
+        [get_reference_difference(array, lag) for array in batch]
+    )
+
+
+@pytest.mark.parametrize('window', [1, 3, 5])
+@pytest.mark.parametrize('length', [12, 40])
+def test_add_dynamic_features(window, length):
+    """Test delta features against simple differences-based ones."""
+    array = np.random.RandomState(0).normal(size=(length, 4))
+    delta = get_reference_delta(array, window)
+    deltadelta = get_reference_delta(delta, window)
+    dynamic = add_dynamic_features(array, window)
+    assert dynamic.shape == (length, 12)
+    np.testing.assert_array_equal(dynamic[:, :4], array)
+    np.testing.assert_allclose(dynamic[:, 4:8], delta, atol=1e-12)
+    np.testing.assert_allclose(dynamic[:, 8:], deltadelta, atol=1e-12)
+    # Check that batched sequences are processed independently.
+    batched = add_dynamic_features(np.stack([array, -array]), window)
+    np.testing.assert_allclose(batched[0], dynamic, atol=1e-12)
+    np.testing.assert_allclose(batched[1], -dynamic, atol=1e-12)
+
+
+@pytest.mark.parametrize('cutoff', [5, 20, 80])
+def test_lowpass_filter(cutoff):
+    """Test joint low-pass filtering against channel-wise filtfilt."""
+    signal = np.random.RandomState(0).normal(size=(1000, 3)).cumsum(axis=0)
+    filt_b, filt_a = scipy.signal.butter(5, 2 * cutoff / 500, btype='low')
+    expected = np.stack([
+        scipy.signal.filtfilt(filt_b, filt_a, channel)
+        for channel in signal.T
+    ], axis=1)
+    # Allow for the (b, a) filter's rounding errors at low cutoffs.
+    tolerance = 1e-7 * np.abs(expected).max()
+    np.testing.assert_allclose(
+        lowpass_filter(signal, cutoff, 500), expected, atol=tolerance
+    )
+    np.testing.assert_allclose(
+        lowpass_filter(signal[:, 0], cutoff, 500), expected[:, 0],
+        atol=tolerance
+    )
+    np.testing.assert_allclose(
+        lowpass_filter(signal.T, cutoff, 500, axis=1), expected.T,
+        atol=tolerance
+    )
+
+
+def test_resample_signal():
+    """Test FFT and polyphase resampling against the former method."""
+    time = np.arange(2500) / 500
+    signal = np.stack([
+        np.sin(2 * np.pi * 1.5 * time) + 3, np.cos(2 * np.pi * 4 * time)
+    ], axis=1)
+    expected = scipy.signal.resample(signal, num=500)
+    np.testing.assert_array_equal(
+        resample_signal(signal, 500, 100), expected
+    )
+    assert resample_signal(signal, 500, 500) is signal
+    # The polyphase method mostly differs from the former near the edges.
+    polyphase = resample_signal(signal, 500, 100, method='polyphase')
+    assert polyphase.shape == expected.shape
+    np.testing.assert_allclose(
+        polyphase[20:-20], expected[20:-20], atol=1e-2
+    )
+    np.testing.assert_allclose(
+        resample_signal(signal.T, 500, 100, 'polyphase', axis=1), polyphase.T
+    )
+    with pytest.raises(ValueError):
+        resample_signal(signal, 500, 100, method='linear')
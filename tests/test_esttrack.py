@@ -0,0 +1,85 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the EST Track files loader."""
+
+import numpy as np
+import pytest
+
+from ac2art.internal.data_loaders import EstTrack
+
+
+COLUMNS = ['tt_x', 'tt_y', 'td_x']
+
+
+def write_track(path, byte_order):
+    """Write random data to a binary EST Track file and return it."""
+    rng = np.random.RandomState(0)
+    dtype = np.dtype(('<' if byte_order == '01' else '>') + 'f4')
+    values = np.concatenate([
+        np.arange(10)[:, np.newaxis] * .01, np.ones((10, 1)),
+        rng.normal(size=(10, len(COLUMNS)))
+    ], axis=1).astype(dtype)
+    header = [
+        'EST_File Track', 'DataType binary', 'ByteOrder ' + byte_order,
+        'NumFrames 10', 'NumChannels %s' % len(COLUMNS), 'name utt_001'
+    ] + ['Channel_%s %s' % item for item in enumerate(COLUMNS)]
+    with open(path, 'wb') as file:
+        file.write(('\n'.join(header) + '\nEST_Header_End\n').encode('ascii'))
+        file.write(values.tobytes())
+    return values
+
+
+@pytest.mark.parametrize('byte_order', ['01', '10'])
+def test_esttrack_binary(tmp_path, byte_order):
+    """Test that binary tracks are read eagerly or memory-mapped alike."""
+    path = str(tmp_path / 'track.ema')
+    values = write_track(path, byte_order)
+    info = EstTrack.info(path)
+    assert info == {
+        'name': 'utt_001', 'column_names': dict(enumerate(COLUMNS)),
+        'storage_type': 'binary',
+        'byte_order': {'01': '<', '10': '>'}[byte_order],
+        'n_frames': 10, 'n_columns': len(COLUMNS)
+    }
+    track = EstTrack(path)
+    assert track.name == 'utt_001'
+    assert track.column_names == info['column_names']
+    np.testing.assert_array_equal(track.data, values[:, 2:])
+    np.testing.assert_array_equal(track.time_index, values[:, 0])
+    mapped = EstTrack(path, mmap_mode='r')
+    np.testing.assert_array_equal(mapped.data, track.data)
+    np.testing.assert_array_equal(mapped.time_index, track.time_index)
+    assert not mapped.data.flags.writeable
+
+
+def test_esttrack_errors(tmp_path):
+    """Test that invalid files and mapping modes are rejected."""
+    path = str(tmp_path / 'track.ema')
+    write_track(path, '01')
+    with pytest.raises(ValueError):
+        EstTrack(path, mmap_mode='r+')
+    with open(path, 'ab') as file:
+        file.write(b'\0' * 4)
+    with pytest.raises(ValueError, match='Dimension error'):
+        EstTrack(path)
+    with open(path, 'wb') as file:
+        file.write(b'NIST_1A\n')
+    with pytest.raises(ValueError, match='not an EST Track file'):
+        EstTrack.info(path)
@@ -0,0 +1,234 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the utterances' features extraction wrapper."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from ac2art.corpora.prototype.preprocess import (
+    build_features_extraction_functions
+)
+from ac2art.corpora.prototype.preprocess._extract import (
+    _fit_end_frame, _run_extraction
+)
+from ac2art.corpora.prototype.utils import (
+    drop_cached_values, get_articulators_index
+)
+
+
+ARTICULATORS = ['tt_x', 'tt_y', 'td_x', 'td_y']
+
+
+class FakeWav:
+    """Minimal stand-in for the Wav class, producing random features."""
+
+    def __init__(self, utterance, hop_time=10):
+        """Set up the random generator of the utterance's features."""
+        self.seed = sum(map(ord, utterance))
+        self.n_frames = int(300 / hop_time)
+
+    def get(self, name, n_coeff, static_only=False):
+        """Return random features spanning 300 milliseconds."""
+        # Arguments mimic those of Wav; pylint: disable=unused-argument
+        rng = np.random.RandomState(self.seed)
+        return rng.normal(size=(self.n_frames, 3 * n_coeff))
+
+
+@pytest.fixture
+def raw_corpus(fake_corpus, tmp_path):
+    """Complete the 'fake' corpus' raw loaders with extraction ones.
+
+    Each utterance has a raw file, whose path is returned by the
+    `get_raw_files` loader. Loading the EMA data of an utterance
+    whose name is listed in the `failing` attribute of the loaders
+    module raises a ValueError.
+
+    Return the loaders module.
+    """
+    loaders = sys.modules['ac2art.corpora.fake.raw._loaders']
+    raw_folder = tmp_path / 'raw'
+    raw_folder.mkdir()
+    for name in loaders.get_utterances_list():
+        (raw_folder / name).write_text(name)
+    loaders.failing = []
+    loaders.loaded = []
+
+    def load_ema(utterance, articulators):
+        """Return random EMA data, or fail on selected utterances."""
+        loaders.loaded.append(utterance)
+        if utterance in loaders.failing:
+            raise ValueError('corrupted EMA file')
+        rng = np.random.RandomState(sum(map(ord, utterance)))
+        return rng.normal(size=(30, len(articulators))), articulators
+
+    loaders.get_raw_files = lambda utterance: [str(raw_folder / utterance)]
+    loaders.load_ema = load_ema
+    loaders.load_phone_labels = lambda utterance: [
+        [.02, '#'], [.25, 'a'], [.3, '#']
+    ]
+    loaders.load_voicing = lambda utterance, rate: (
+        np.ones((3 * rate // 10, 1))
+    )
+    loaders.load_wav = lambda utterance, frames_time, hop_time: (
+        FakeWav(utterance, hop_time)
+    )
+    return loaders
+
+
+def get_extraction_function():
+    """Build the 'fake' corpus' extraction function."""
+    return build_features_extraction_functions(
+        'fake', 100, ARTICULATORS, ''
+    )
+
+
+def test_run_extraction_isolates_failures():
+    """Test that failed utterances are reported without stopping others."""
+    def extract_data(utterance, features, *args, end_frame=None):
+        """Fail on a given utterance, otherwise return its arguments."""
+        if utterance == 'b':
+            raise KeyError('missing')
+        return utterance, features, args, end_frame
+
+    tasks = [('a', ['ema'], None), ('b', ['ema'], 3), ('c', ['lpc'], 5)]
+    done, failures = _run_extraction(extract_data, tasks, (1, 2))
+    assert list(done) == ['a', 'c']
+    assert done['c'] == ('c', ['lpc'], (1, 2), 5)
+    assert failures == {'b': "KeyError: 'missing'"}
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_extract_utterances_data(raw_corpus, fake_corpus, utterances, n_jobs):
+    """Test that extraction isolates failures, serially or in parallel."""
+    raw_corpus.failing = [utterances[1], utterances[3]]
+    extract_utterances_data = get_extraction_function()
+    failures = extract_utterances_data(
+        'lpc', n_coeff=4, n_jobs=n_jobs, chunksize=1
+    )
+    assert sorted(failures) == raw_corpus.failing
+    assert all('corrupted EMA file' in err for err in failures.values())
+    for name in utterances:
+        path = os.path.join(fake_corpus, 'lpc', name + '_lpc.npy')
+        if name in raw_corpus.failing:
+            assert not os.path.isfile(path)
+            continue
+        lpc = np.load(path)
+        np.testing.assert_array_equal(lpc, FakeWav(name).get('lpc', 4)[2:25])
+        ema = np.load(os.path.join(fake_corpus, 'ema', name + '_ema.npy'))
+        assert ema.shape == (23, len(ARTICULATORS))
+    # Check that utterances are processed in order when run serially.
+    if n_jobs == 1:
+        assert raw_corpus.loaded == utterances
+
+
+def test_extract_utterances_data_skips_unchanged(raw_corpus, utterances):
+    """Test that a second extraction only redoes outdated utterances."""
+    extract_utterances_data = get_extraction_function()
+    assert not extract_utterances_data('lpc', n_coeff=4)
+    assert raw_corpus.loaded == utterances
+    # Check that unchanged utterances are skipped.
+    raw_corpus.loaded = []
+    assert not extract_utterances_data('lpc', n_coeff=4)
+    assert not raw_corpus.loaded
+    # Check that utterances whose raw files changed are redone.
+    path = raw_corpus.get_raw_files(utterances[2])[0]
+    mtime = os.path.getmtime(path)
+    os.utime(path, (mtime + 10, mtime + 10))
+    assert not extract_utterances_data('lpc', n_coeff=4)
+    assert raw_corpus.loaded == [utterances[2]]
+    # Check that forcing the extraction redoes all utterances.
+    raw_corpus.loaded = []
+    assert not extract_utterances_data('lpc', n_coeff=4, force=True)
+    assert raw_corpus.loaded == utterances
+
+
+def test_extract_utterances_data_adds_features(
+        raw_corpus, fake_corpus, utterances
+    ):
+    """Test that new features are extracted alone and fit previous ones."""
+    extract_utterances_data = get_extraction_function()
+    assert not extract_utterances_data('lpc', n_coeff=4)
+    raw_corpus.loaded = []
+    assert not extract_utterances_data(['lpc', 'lsf'], n_coeff=4)
+    assert not raw_corpus.loaded
+    for name in utterances:
+        path = os.path.join(fake_corpus, 'lsf', name + '_lsf.npy')
+        assert np.load(path).shape == (23, 12)
+    # Check that changing the settings of features redoes them.
+    assert not extract_utterances_data(['lpc', 'lsf'], n_coeff=[4, 5])
+    assert not raw_corpus.loaded
+    path = os.path.join(fake_corpus, 'lsf', utterances[0] + '_lsf.npy')
+    assert np.load(path).shape == (23, 15)
+
+
+def test_extract_utterances_data_drops_cache(raw_corpus, fake_corpus):
+    """Test that extraction refreshes the cached articulators index."""
+    drop_cached_values(fake_corpus)
+    assert list(get_articulators_index('fake', None, ['td_x'])) == [2]
+    extract_utterances_data = get_extraction_function()
+    assert not extract_utterances_data(
+        'lpc', 4, articulators_list=['td_x', 'tt_x']
+    )
+    assert list(get_articulators_index('fake', None, ['td_x'])) == [0]
+
+
+def check_lengths(folder, utterances, features, length):
+    """Check the number of frames of some extracted features."""
+    for name in features:
+        for utterance in utterances:
+            path = os.path.join(folder, name, utterance + '_%s.npy' % name)
+            assert len(np.load(path)) == length
+
+
+def test_extract_utterances_data_changes_rate(
+        raw_corpus, fake_corpus, utterances
+    ):
+    """Test that features extracted at another rate are not matched."""
+    extract_utterances_data = get_extraction_function()
+    assert not extract_utterances_data('lsf', 4, ema_sampling_rate=200)
+    check_lengths(fake_corpus, utterances, ['ema', 'lsf'], 46)
+    # Check that new features are not trimmed to the former rate's ones.
+    assert not extract_utterances_data('lpc', 4, ema_sampling_rate=100)
+    check_lengths(fake_corpus, utterances, ['ema', 'lpc'], 23)
+    # Check that former features are redone, rather than matched.
+    assert not extract_utterances_data(
+        ['lpc', 'lsf'], 4, ema_sampling_rate=200
+    )
+    check_lengths(fake_corpus, utterances, ['ema', 'lpc', 'lsf'], 46)
+    raw_corpus.loaded = []
+    assert not extract_utterances_data(
+        ['lpc', 'lsf'], 4, ema_sampling_rate=200
+    )
+    assert not raw_corpus.loaded
+
+
+def test_fit_end_frame():
+    """Test that features are trimmed to fit the shortest ones."""
+    data = {'ema': np.zeros((30, 4)), 'lpc': np.zeros((24, 12))}
+    assert _fit_end_frame('utt', data, 2, 25) == 24
+    assert _fit_end_frame('utt', data, 2, 20) == 20
+    assert _fit_end_frame('utt', data, 2, 30, previous=20) == 20
+    with pytest.raises(ValueError, match='previously-extracted'):
+        _fit_end_frame('utt', data, 2, 20, previous=25)
+    with pytest.raises(ValueError, match='start trimming zone'):
+        _fit_end_frame('utt', data, 26, 30)
@@ -0,0 +1,144 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the corpus-wise dataset loading functions."""
+
+import os
+
+import numpy as np
+import pytest
+
+from ac2art.corpora.prototype.load import build_loading_functions
+from ac2art.corpora.prototype.load._load import _iterate_prefetched
+
+
+LOADING_KWARGS = {'audio_type': 'mfcc', 'ema_norm': '', 'context_window': 0}
+
+
+@pytest.fixture
+def loaders(fake_corpus):
+    """Return the 'fake' corpus' utterance and dataset loaders."""
+    functions = build_loading_functions('fake', default_byspeaker=False)
+    return functions[6], functions[8], functions[9]
+
+
+def check_batch(batch, names, load_utterance, concatenate):
+    """Check that a batch of data matches its utterances' data."""
+    expected = [load_utterance(name, **LOADING_KWARGS) for name in names]
+    for i, data in enumerate(batch):
+        reference = [utterance[i] for utterance in expected]
+        if concatenate:
+            np.testing.assert_array_equal(data, np.concatenate(reference))
+        else:
+            assert len(data) == len(reference)
+            for array, ref_array in zip(data, reference):
+                np.testing.assert_array_equal(array, ref_array)
+
+
+def test_iterate_dataset_single_utterances(loaders, utterances):
+    """Test that utterances are yielded one at a time, in order."""
+    load_utterance, iterate_dataset, _ = loaders
+    yielded = list(iterate_dataset(None, **LOADING_KWARGS))
+    assert len(yielded) == len(utterances)
+    for (acoustic, ema), name in zip(yielded, utterances):
+        reference = load_utterance(name, **LOADING_KWARGS)
+        np.testing.assert_array_equal(acoustic, reference[0])
+        np.testing.assert_array_equal(ema, reference[1])
+
+
+@pytest.mark.parametrize('concatenate', [False, True])
+def test_iterate_dataset_batches(loaders, utterances, concatenate):
+    """Test that utterances are batched in order, with a smaller last one."""
+    load_utterance, iterate_dataset, _ = loaders
+    batches = list(
+        iterate_dataset(None, 2, concatenate=concatenate, **LOADING_KWARGS)
+    )
+    assert len(batches) == 3
+    for i, batch in enumerate(batches):
+        names = utterances[2 * i:2 * i + 2]
+        check_batch(batch, names, load_utterance, concatenate)
+
+
+@pytest.mark.parametrize('concatenate', [False, True])
+def test_iterate_dataset_bucketed(loaders, utterances, concatenate):
+    """Test that bucketed batches follow `get_bucketed_batches`."""
+    load_utterance, iterate_dataset, get_bucketed_batches = loaders
+    buckets, _ = get_bucketed_batches(None, 2, .2, seed=0, audio_type='mfcc')
+    assert sorted(name for names in buckets for name in names) == utterances
+    batches = list(iterate_dataset(
+        None, 2, concatenate=concatenate, max_padding=.2, seed=0,
+        **LOADING_KWARGS
+    ))
+    assert len(batches) == len(buckets)
+    for batch, names in zip(batches, buckets):
+        check_batch(batch, names, load_utterance, concatenate)
+    # Check that the shuffling is reproducible.
+    repeated = list(iterate_dataset(
+        None, 2, concatenate=True, max_padding=.2, seed=0, **LOADING_KWARGS
+    ))
+    for batch, names in zip(repeated, buckets):
+        check_batch(batch, names, load_utterance, True)
+
+
+def test_iterate_dataset_padding_requires_batches(loaders):
+    """Test that setting `max_padding` without `batch_size` fails."""
+    _, iterate_dataset, _ = loaders
+    with pytest.raises(ValueError, match='batch_size'):
+        next(iterate_dataset(None, max_padding=.2, **LOADING_KWARGS))
+
+
+@pytest.mark.parametrize('queue_size', [None, 1, 3])
+def test_iterate_dataset_prefetched(loaders, queue_size):
+    """Test that prefetched batches match those loaded serially."""
+    _, iterate_dataset, _ = loaders
+    serial = list(iterate_dataset(None, 2, n_threads=0, **LOADING_KWARGS))
+    prefetched = list(iterate_dataset(
+        None, 2, n_threads=2, queue_size=queue_size, **LOADING_KWARGS
+    ))
+    assert len(prefetched) == len(serial)
+    for batch, reference in zip(prefetched, serial):
+        for data, ref_data in zip(batch, reference):
+            assert len(data) == len(ref_data)
+            for array, ref_array in zip(data, ref_data):
+                np.testing.assert_array_equal(array, ref_array)
+
+
+def test_iterate_prefetched_error():
+    """Test that a prefetched call's exception reaches the caller."""
+    def function(argument):
+        """Return the argument, unless it is 3."""
+        if argument == 3:
+            raise ValueError('failed on 3')
+        return argument
+
+    outputs = []
+    with pytest.raises(ValueError, match='failed on 3'):
+        for output in _iterate_prefetched(function, range(10), 2, 4):
+            outputs.append(output)
+    assert outputs == [0, 1, 2]
+
+
+def test_iterate_dataset_prefetched_error(loaders, fake_corpus, utterances):
+    """Test that a failed prefetched load raises in the calling thread."""
+    _, iterate_dataset, _ = loaders
+    os.remove(os.path.join(fake_corpus, 'ema', utterances[3] + '_ema.npy'))
+    iterator = iterate_dataset(None, 2, n_threads=2, **LOADING_KWARGS)
+    assert len(next(iterator)[0]) == 2
+    with pytest.raises(FileNotFoundError):
+        list(iterator)
@@ -0,0 +1,95 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the streaming computation of features' moments."""
+
+import os
+
+import numpy as np
+import pytest
+
+from ac2art.corpora.prototype.preprocess import build_normalization_functions
+
+
+def get_reference_moments(main_folder, utterances):
+    """Compute moments by concatenating the files' mfcc data."""
+    dataset = [
+        np.load(os.path.join(main_folder, 'mfcc', name + '_mfcc.npy'))
+        for name in utterances
+    ]
+    filled = [data for data in dataset if len(data)]
+    concatenated = np.concatenate(filled)
+    return dataset, {
+        'global_means': concatenated.mean(axis=0),
+        'global_stds': concatenated.std(axis=0),
+        'global_spread': (
+            concatenated.max(axis=0) - concatenated.min(axis=0)
+        )
+    }
+
+
+def check_moments(moments, main_folder, utterances):
+    """Check computed moments against concatenation-based ones."""
+    dataset, reference = get_reference_moments(main_folder, utterances)
+    for key, values in reference.items():
+        assert moments[key].dtype == np.float32
+        np.testing.assert_allclose(moments[key], values, rtol=1e-5)
+    for i, data in enumerate(dataset):
+        if not len(data):
+            assert np.isnan(moments['file_means'][i]).all()
+            continue
+        np.testing.assert_allclose(
+            moments['file_means'][i], data.mean(axis=0), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            moments['file_stds'][i], data.std(axis=0), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            moments['file_spread'][i], data.max(axis=0) - data.min(axis=0),
+            rtol=1e-5
+        )
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+@pytest.mark.parametrize('empty_file', [False, True])
+def test_compute_moments(
+        fake_corpus, speakers, utterances, n_jobs, empty_file
+    ):
+    """Test that streaming moments match concatenation-based ones."""
+    if empty_file:
+        path = os.path.join(fake_corpus, 'mfcc', utterances[1] + '_mfcc.npy')
+        np.save(path, np.zeros((0, 6), dtype=np.float32))
+    compute_moments, _ = build_normalization_functions('fake')
+    # Check corpus-wide moments.
+    moments = compute_moments('mfcc', n_jobs=n_jobs)
+    check_moments(moments, fake_corpus, utterances)
+    # Check speaker-wise moments.
+    speaker_moments = compute_moments('mfcc', by_speaker=True, n_jobs=n_jobs)
+    assert sorted(speaker_moments) == speakers
+    for speaker, moments in speaker_moments.items():
+        speaker_utterances = [
+            name for name in utterances if name.startswith(speaker + '_')
+        ]
+        check_moments(moments, fake_corpus, speaker_utterances)
+    # Check that all moments were stored.
+    for speaker in [None] + speakers:
+        name = 'mfcc' if speaker is None else 'mfcc_' + speaker
+        assert os.path.isfile(
+            os.path.join(fake_corpus, 'norm_params', 'norm_%s.npy' % name)
+        )
@@ -0,0 +1,88 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the on-the-fly normalization of features at load time."""
+
+import os
+
+import numpy as np
+import pytest
+
+from ac2art.corpora.prototype.load._load import build_file_loaders
+from ac2art.corpora.prototype.preprocess import build_normalization_functions
+
+
+SUFFIXES = {'corpus': '', 'speaker': '_byspeaker', 'file': '_byfile'}
+
+
+def load_normalized(utterances, norm_name):
+    """Load the normalized acoustic and articulatory data of utterances."""
+    _, _, load_acoustic, load_ema = build_file_loaders('fake')
+    return {
+        name: (
+            load_acoustic(name, 'mfcc_' + norm_name),
+            load_ema(
+                name, norm_name, use_dynamic=True,
+                articulators=['td_y', 'tt_x']
+            )
+        )
+        for name in utterances
+    }
+
+
+@pytest.mark.parametrize('scope', ['corpus', 'speaker', 'file'])
+@pytest.mark.parametrize('norm_type', ['stds', 'spread'])
+def test_on_the_fly_normalization(fake_corpus, utterances, norm_type, scope):
+    """Test that on-the-fly normalization matches materialized one."""
+    compute_moments, normalize_files = build_normalization_functions('fake')
+    compute_moments('mfcc')
+    compute_moments('ema')
+    norm_name = norm_type + SUFFIXES[scope]
+    norm_folder = os.path.join(fake_corpus, 'mfcc_norm_' + norm_name)
+    # Normalize the data on the fly.
+    on_the_fly = load_normalized(utterances, norm_name)
+    assert not os.path.isdir(norm_folder)
+    # Materialize normalized files and load them.
+    normalize_files('mfcc', norm_type, scope)
+    normalize_files('ema', norm_type, scope)
+    assert os.path.isdir(norm_folder)
+    stored = load_normalized(utterances, norm_name)
+    for name in utterances:
+        for virtual, materialized in zip(on_the_fly[name], stored[name]):
+            assert virtual.dtype == materialized.dtype
+            np.testing.assert_allclose(virtual, materialized, rtol=1e-6)
+
+
+def test_on_the_fly_normalization_without_moments(fake_corpus, utterances):
+    """Test that missing moments raise an explicit error."""
+    _, _, load_acoustic, _ = build_file_loaders('fake')
+    with pytest.raises(FileNotFoundError, match='compute_moments'):
+        load_acoustic(utterances[0], 'mfcc_stds')
+    # File-wise normalization does not require any pre-computed moments.
+    data = load_acoustic(utterances[0], 'mfcc_stds_byfile')
+    np.testing.assert_allclose(data.std(axis=0), 1, rtol=1e-5)
+
+
+def test_invalid_normalization(fake_corpus, utterances):
+    """Test that unknown normalization names are rejected."""
+    _, _, load_acoustic, _ = build_file_loaders('fake')
+    with pytest.raises(ValueError):
+        load_acoustic(utterances[0], 'mfcc_foo')
+    with pytest.raises(ValueError):
+        load_acoustic(utterances[0], 'mfcc_stds_bygroup')
@@ -0,0 +1,42 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the packing of features folders into memory-mapped stores."""
+
+import os
+
+import numpy as np
+
+from ac2art.corpora.prototype.preprocess import build_packing_function
+from ac2art.corpora.prototype.utils import get_packed_store
+
+
+def test_pack_files_with_missing_utterance(fake_corpus, utterances):
+    """Test that utterances missing from a folder are skipped."""
+    missing = utterances[2]
+    os.remove(os.path.join(fake_corpus, 'mfcc', missing + '_mfcc.npy'))
+    pack_files = build_packing_function('fake')
+    skipped = pack_files(['mfcc', 'ema'])
+    assert skipped == {'mfcc': [missing], 'ema': []}
+    store = get_packed_store(fake_corpus, 'mfcc')
+    assert missing not in store
+    for name in utterances:
+        if name != missing:
+            path = os.path.join(fake_corpus, 'mfcc', name + '_mfcc.npy')
+            np.testing.assert_array_equal(store[name], np.load(path))
@@ -0,0 +1,335 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the tensorflow-related utility functions of ac2art."""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from ac2art.internal import data_utils, tf_utils
+from ac2art.internal.network_bricks import refine_signal
+from ac2art.networks import MultilayerPerceptron, TrajectoryMDN
+
+
+@pytest.mark.parametrize('window', [1, 5])
+def test_add_dynamic_features(window):
+    """Test that in-graph dynamic features match the numpy ones."""
+    rng = np.random.RandomState(0)
+    sequences = [rng.normal(size=(size, 3)) for size in (14, 9, 11)]
+    batch, batch_sizes = data_utils.sequences_to_batch(sequences)
+    with tf.Graph().as_default():
+        single = tf_utils.add_dynamic_features(
+            tf.constant(sequences[0]), window, axis=-1
+        )
+        batched = tf_utils.add_dynamic_features(
+            tf.constant(batch), window, axis=-1,
+            batch_sizes=tf.constant(batch_sizes, dtype=tf.int32)
+        )
+        with tf.Session() as session:
+            single, batched = session.run([single, batched])
+    np.testing.assert_allclose(
+        single, data_utils.add_dynamic_features(sequences[0], window),
+        atol=1e-12
+    )
+    for i, sequence in enumerate(sequences):
+        np.testing.assert_allclose(
+            batched[i, :len(sequence)],
+            data_utils.add_dynamic_features(sequence, window), atol=1e-12
+        )
+
+
+
+def get_sequences(n_columns, seed=0):
+    """Return a list of random sequences of frames of various lengths."""
+    rng = np.random.RandomState(seed)
+    return [rng.normal(size=(size, n_columns)) for size in (14, 9, 11)]
+
+
+def run_graph(function, *arrays, **kwargs):
+    """Run a function of tensors on constant arrays, in a new graph."""
+    with tf.Graph().as_default():
+        tensors = [tf.constant(array) for array in arrays]
+        output = function(*tensors, **kwargs)
+        with tf.Session() as session:
+            return session.run(output)
+
+
+@pytest.mark.parametrize('lag', [1, 3])
+def test_get_simple_difference(lag):
+    """Test that in-graph simple differences match the numpy ones."""
+    sequences = get_sequences(3)
+    batch, _ = data_utils.sequences_to_batch(sequences)
+    single = run_graph(tf_utils.get_simple_difference, sequences[0], lag=lag)
+    batched = run_graph(tf_utils.get_simple_difference, batch, lag=lag)
+    np.testing.assert_allclose(
+        single, data_utils.get_simple_difference(sequences[0], lag)
+    )
+    np.testing.assert_allclose(
+        batched, data_utils.get_simple_difference(batch, lag)
+    )
+
+
+@pytest.mark.parametrize('window', [0, 2, 5])
+def test_build_context_windows(window):
+    """Test that in-graph context windows match the numpy ones."""
+    sequences = get_sequences(3)
+    single = run_graph(
+        tf_utils.build_context_windows, sequences[0], window=window
+    )
+    np.testing.assert_array_equal(
+        single, data_utils.build_context_windows(sequences[0], window)
+    )
+    batch, _ = data_utils.sequences_to_batch(sequences)
+    batched = run_graph(
+        tf_utils.build_context_windows, batch, window=window
+    )
+    for i, sequence in enumerate(sequences):
+        np.testing.assert_array_equal(
+            batched[i, :len(sequence)],
+            data_utils.build_context_windows(sequence, window)
+        )
+
+
+def test_replicate_last_frames():
+    """Test that padded frames are replaced with the last actual ones."""
+    sequences = get_sequences(3)
+    batch, batch_sizes = data_utils.sequences_to_batch(sequences)
+    replicated = run_graph(
+        tf_utils.replicate_last_frames, batch, batch_sizes.astype(np.int32)
+    )
+    for i, sequence in enumerate(sequences):
+        length = len(sequence)
+        np.testing.assert_array_equal(replicated[i, :length], sequence)
+        np.testing.assert_array_equal(
+            replicated[i, length:],
+            np.repeat(sequence[-1:], len(batch[i]) - length, axis=0)
+        )
+
+
+def build_network(**kwargs):
+    """Build a small MLP building its input and targets in-graph."""
+    return MultilayerPerceptron(
+        input_shape=(None, None, 3), n_targets=3,
+        layers_config=[('dense_layer', 8)], context_window=2,
+        static_targets=True, **kwargs
+    )
+
+
+@pytest.mark.parametrize('binary_tracks', [None, [2]])
+def test_network_input_stage(binary_tracks):
+    """Test that in-graph windows and targets match the numpy ones."""
+    inputs = get_sequences(3, seed=0)
+    targets = [np.abs(array) for array in get_sequences(3, seed=1)]
+    if binary_tracks:
+        for array in targets:
+            array[:, 2] = array[:, 2] > .5
+    with tf.Graph().as_default():
+        model = build_network(binary_tracks=binary_tracks)
+        feed_dict = model.get_feed_dict(inputs, targets)
+        windows, full_targets = model.session.run(
+            [model.holders['input'], model.holders['targets']], feed_dict
+        )
+    for i, (input_data, static) in enumerate(zip(inputs, targets)):
+        length = len(input_data)
+        np.testing.assert_allclose(
+            windows[i, :length],
+            data_utils.build_context_windows(input_data, 2), rtol=1e-6
+        )
+        continuous = static[:, :2] if binary_tracks else static
+        dynamic = data_utils.add_dynamic_features(continuous)
+        expected = np.concatenate(
+            [static, dynamic[:, continuous.shape[1]:]], axis=1
+        )
+        np.testing.assert_allclose(
+            full_targets[i, :length], expected, rtol=1e-5, atol=1e-6
+        )
+
+
+def test_network_training_with_input_stage():
+    """Test training and using a network building its input in-graph."""
+    inputs = get_sequences(3, seed=0)
+    targets = get_sequences(3, seed=1)
+    with tf.Graph().as_default():
+        model = build_network()
+        scores = [model.score(inputs, targets)]
+        for _ in range(20):
+            model.run_training_function(inputs, targets)
+        scores.append(model.score(inputs, targets))
+        prediction = model.predict(inputs)
+    assert np.all(np.isfinite(scores))
+    assert np.mean(scores[1]) < np.mean(scores[0])
+    assert [array.shape for array in prediction] == [
+        (len(array), 9) for array in inputs
+    ]
+
+
+def test_refine_signal():
+    """Test that refined readouts are scaled and given dynamic features."""
+    signal = np.random.RandomState(0).normal(size=(2, 17, 3))
+    norm_params = np.array([1., .5, 2.])
+    refined = run_graph(
+        lambda tensor: refine_signal(tensor, norm_params, add_dynamic=True)[0],
+        signal
+    )
+    assert refined.shape == (2, 17, 9)
+    for i, sequence in enumerate(signal):
+        np.testing.assert_allclose(
+            refined[i],
+            data_utils.add_dynamic_features(sequence * norm_params),
+            atol=1e-12
+        )
+    static = run_graph(lambda tensor: refine_signal(tensor)[0], signal[0])
+    np.testing.assert_array_equal(static, signal[0])
+
+
+def build_loader(n_utterances=5):
+    """Return random utterances' names and a function loading their data."""
+    rng = np.random.RandomState(0)
+    data = {
+        'utt_%s' % i: (rng.normal(size=(size, 3)), rng.normal(size=(size, 2)))
+        for i, size in enumerate(range(10, 10 + 3 * n_utterances, 3))
+    }
+    return sorted(data), data.__getitem__
+
+
+def iterate_dataset(dataset):
+    """Yield the batches of a tensorflow Dataset, as numpy arrays."""
+    batch = dataset.make_one_shot_iterator().get_next()
+    with tf.Session() as session:
+        while True:
+            try:
+                yield session.run(batch)
+            except tf.errors.OutOfRangeError:
+                break
+
+
+def check_sequences_batch(batch, expected, context_window):
+    """Check that a batch of padded sequences matches the loaded data."""
+    inputs, targets, batch_sizes = batch
+    np.testing.assert_array_equal(
+        batch_sizes, [len(data[0]) for data in expected]
+    )
+    width = 3 * (2 * context_window + 1)
+    assert inputs.shape == (len(expected), max(batch_sizes), width)
+    assert targets.shape == (len(expected), max(batch_sizes), 2)
+    for i, (input_data, target_data) in enumerate(expected):
+        windows = data_utils.build_context_windows(input_data, context_window)
+        np.testing.assert_allclose(
+            inputs[i, :batch_sizes[i]], windows, rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            targets[i, :batch_sizes[i]], target_data, rtol=1e-6
+        )
+        assert not inputs[i, batch_sizes[i]:].any()
+
+
+@pytest.mark.parametrize('context_window', [0, 2])
+def test_build_utterances_dataset_sequences(context_window):
+    """Test that batches of padded sequences match the loaded data."""
+    utterances, load_utterance = build_loader()
+    with tf.Graph().as_default():
+        dataset = tf_utils.build_utterances_dataset(
+            load_utterance, utterances, 2, sequences=True,
+            context_window=context_window, shuffle=False
+        )
+        batches = list(iterate_dataset(dataset))
+    assert [len(batch[2]) for batch in batches] == [2, 2, 1]
+    for i, batch in enumerate(batches):
+        expected = [
+            load_utterance(name) for name in utterances[2 * i:2 * i + 2]
+        ]
+        check_sequences_batch(batch, expected, context_window)
+
+
+def test_build_utterances_dataset_frames():
+    """Test that batches of frames cover all the loaded data."""
+    utterances, load_utterance = build_loader()
+    with tf.Graph().as_default():
+        dataset = tf_utils.build_utterances_dataset(
+            load_utterance, utterances, 32, seed=0
+        )
+        batches = list(iterate_dataset(dataset))
+    inputs = np.concatenate([batch[0] for batch in batches])
+    expected = np.concatenate([load_utterance(name)[0] for name in utterances])
+    assert [len(batch[0]) for batch in batches] == [32, 32, 16]
+    np.testing.assert_allclose(
+        np.sort(inputs, axis=0), np.sort(expected, axis=0), rtol=1e-6
+    )
+
+
+def test_network_dataset():
+    """Test training and scoring a network from a dataset, until its end."""
+    utterances, load_utterance = build_loader()
+    inputs, targets = zip(*(load_utterance(name) for name in utterances))
+    with tf.Graph().as_default():
+        model = MultilayerPerceptron(
+            (None, None, 3), 2, [('dense_layer', 8)], use_dynamic=False,
+            use_dataset=True
+        )
+        dataset = tf_utils.build_utterances_dataset(
+            load_utterance, utterances, 5, sequences=True, shuffle=False
+        )
+        model.set_dataset(dataset)
+        score = model.score()
+        np.testing.assert_allclose(
+            score, model.score(list(inputs), list(targets)), rtol=1e-5
+        )
+        with pytest.raises(tf.errors.OutOfRangeError):
+            model.score()
+        # Check that setting the dataset again restarts iterating over it.
+        model.set_dataset(dataset)
+        weights = model.session.run(model.get_weights('readout_layer'))
+        model.run_training_function()
+        assert not np.array_equal(
+            weights, model.session.run(model.get_weights('readout_layer'))
+        )
+        with pytest.raises(tf.errors.OutOfRangeError):
+            model.run_training_function()
+
+
+def test_network_dataset_requires_opt_in():
+    """Test that datasets are only set on networks opting into them."""
+    utterances, load_utterance = build_loader()
+    with tf.Graph().as_default():
+        model = MultilayerPerceptron((None, 3), 2, [('dense_layer', 8)])
+        dataset = tf_utils.build_utterances_dataset(
+            load_utterance, utterances, 16
+        )
+        with pytest.raises(RuntimeError):
+            model.set_dataset(dataset)
+
+
+def test_tmdn_dataset_rmse():
+    """Test that a TMDN's rmse loss requires fed data."""
+    utterances, load_utterance = build_loader()
+    with tf.Graph().as_default():
+        model = TrajectoryMDN(
+            (None, 3), 3, 2, [('dense_layer', 8)], use_dataset=True
+        )
+        dataset = tf_utils.build_utterances_dataset(
+            lambda name: (load_utterance(name)[0], np.ones((10, 3))),
+            utterances[:1], 10, shuffle=False
+        )
+        model.set_dataset(dataset)
+        with pytest.raises(ValueError, match='requires data to be fed'):
+            model.score(loss='rmse')
+        with pytest.raises(ValueError, match='requires data to be fed'):
+            model.run_training_function(loss='rmse')
+        assert np.isfinite(model.score(loss='likelihood'))
@@ -0,0 +1,120 @@
+# coding: utf-8
+#
+# Copyright 2018 Paul Andrey
+#
+# This file is part of ac2art.
+#
+# ac2art is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ac2art is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ac2art.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the acoustic waveform data tools."""
+
+import librosa
+import numpy as np
+import pytest
+import scipy.io.wavfile
+import scipy.linalg
+
+from ac2art.internal.data_loaders import SphereFile, Wav
+from ac2art.internal.data_loaders._wav import (
+    levinson_durbin, polynoms_to_roots
+)
+
+
+def test_levinson_durbin():
+    """Test that LPC coefficients solve the frames' Toeplitz systems."""
+    frames = np.random.RandomState(0).normal(size=(8, 400))
+    autocorrelations = librosa.autocorrelate(frames, max_size=13)
+    lpc = levinson_durbin(autocorrelations)
+    assert lpc.shape == (8, 12)
+    for coefficients, autocorr in zip(lpc, autocorrelations):
+        expected = scipy.linalg.solve_toeplitz(autocorr[:-1], autocorr[1:])
+        np.testing.assert_allclose(coefficients, expected, rtol=1e-8)
+
+
+def test_levinson_durbin_silent_frames():
+    """Test that silent frames are assigned null LPC coefficients."""
+    autocorrelations = np.zeros((3, 6))
+    np.testing.assert_array_equal(
+        levinson_durbin(autocorrelations), np.zeros((3, 5))
+    )
+
+
+def test_get_lpc_shape():
+    """Test that LPC features have one line per frame."""
+    signal = np.random.RandomState(0).normal(size=16000).astype(np.float32)
+    wav = Wav.from_array(signal, 16000)
+    lpc = wav.get_lpc(12, static_only=True)
+    assert lpc.shape == (len(wav.frames), 12)
+
+
+def test_polynoms_to_roots():
+    """Test that polynomials' roots match those computed by numpy."""
+    polynoms = np.random.RandomState(0).normal(size=(10, 7))
+    roots = polynoms_to_roots(polynoms)
+    assert roots.shape == (10, 6)
+    for polynom, poly_roots in zip(polynoms, roots):
+        np.testing.assert_allclose(
+            np.sort_complex(poly_roots), np.sort_complex(np.roots(polynom)),
+            rtol=1e-7, atol=1e-10
+        )
+
+
+def test_polynoms_to_roots_invalid():
+    """Test that polynomials with a null leading term get NaN roots."""
+    polynoms = np.array([[1., -3., 2.], [0., 1., 1.], [np.nan, 1., 1.]])
+    roots = polynoms_to_roots(polynoms)
+    np.testing.assert_allclose(np.sort_complex(roots[0]), [1, 2])
+    assert np.isnan(roots[1:]).all()
+
+
+def write_sphere(path, samples, sampling_rate, byte_format):
+    """Write integer samples to a PCM NIST SPHERE file."""
+    fields = [
+        'sample_rate -i %s' % sampling_rate,
+        'channel_count -i %s' % samples.shape[1],
+        'sample_count -i %s' % len(samples),
+        'sample_n_bytes -i %s' % samples.dtype.itemsize,
+        'sample_byte_format -s2 %s' % byte_format,
+        'sample_coding -s3 pcm',
+        'end_head'
+    ]
+    header = 'NIST_1A\n   1024\n' + '\n'.join(fields) + '\n'
+    with open(path, 'wb') as file:
+        file.write(header.encode('ascii').ljust(1024, b' '))
+        file.write(samples.tobytes())
+
+
+@pytest.mark.parametrize('byte_format', ['01', '10'])
+def test_sphere_round_trip(tmp_path, byte_format):
+    """Test that SPHERE files' samples are read back and converted."""
+    dtype = np.dtype(('<' if byte_format == '01' else '>') + 'i2')
+    rng = np.random.RandomState(0)
+    samples = rng.randint(-2 ** 15, 2 ** 15, size=(1600, 2)).astype(dtype)
+    path = str(tmp_path / 'audio.sph')
+    write_sphere(path, samples, 16000, byte_format)
+    sphere = SphereFile(path)
+    assert sphere.sampling_rate == 16000
+    np.testing.assert_array_equal(sphere.data, samples)
+    np.testing.assert_allclose(
+        sphere.get_signal(), samples.mean(axis=1) / 2 ** 15, rtol=1e-6
+    )
+    # Check that the samples are written to .wav without alteration.
+    wav_path = str(tmp_path / 'audio.wav')
+    sphere.write_wav(wav_path)
+    rate, data = scipy.io.wavfile.read(wav_path)
+    assert rate == 16000
+    np.testing.assert_array_equal(data, samples)
+    # Check that the Wav class decodes the SPHERE file.
+    wav = Wav(path)
+    np.testing.assert_array_equal(wav.signal, sphere.get_signal())